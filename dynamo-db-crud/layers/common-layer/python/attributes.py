@@ -0,0 +1,92 @@
+import os
+import zlib
+
+# String attributes at least this many UTF-8 bytes long are stored
+# zlib-compressed as Binary (0 disables compression)
+ATTRIBUTE_COMPRESSION_MIN_BYTES = int(
+    os.environ.get("ATTRIBUTE_COMPRESSION_MIN_BYTES", "1024")
+)
+ATTRIBUTE_COMPRESSION_LEVEL = int(os.environ.get("ATTRIBUTE_COMPRESSION_LEVEL", "6"))
+
+# Prefix marking a compressed string so other Binary values pass through
+COMPRESSED_PREFIX = b"zc1:"
+
+# Key, index and bookkeeping attributes are always stored as-is
+UNCOMPRESSED_ATTRIBUTES = frozenset(
+    ["id", "name", "created_at", "updated_at", "version", "created_month"]
+)
+
+
+def may_be_compressed(key):
+    """Whether values of attribute `key` can be stored compressed"""
+    return bool(ATTRIBUTE_COMPRESSION_MIN_BYTES) and key not in UNCOMPRESSED_ATTRIBUTES
+
+
+def encode_value(key, value, min_bytes=None):
+    """
+    Value to store for attribute `key`.
+
+    Long strings are returned as compressed bytes when that is smaller;
+    everything else is returned unchanged.
+    """
+    min_bytes = ATTRIBUTE_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    if (
+        not min_bytes
+        or not isinstance(value, str)
+        or len(value) * 4 < min_bytes  # cannot reach min_bytes in UTF-8
+        or key in UNCOMPRESSED_ATTRIBUTES
+    ):
+        return value
+
+    data = value.encode("utf-8")
+    if len(data) < min_bytes:
+        return value
+    compressed = COMPRESSED_PREFIX + zlib.compress(data, ATTRIBUTE_COMPRESSION_LEVEL)
+    return compressed if len(compressed) < len(data) else value
+
+
+def decode_value(value):
+    """Stored value back to its original form (compressed strings are inflated)"""
+    # The resource API returns Binary wrappers; the raw bytes are in .value
+    data = getattr(value, "value", value)
+    if isinstance(data, (bytes, bytearray)) and data.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(data[len(COMPRESSED_PREFIX):]).decode("utf-8")
+    return value
+
+
+def encode_item(item, min_bytes=None):
+    """Copy of an item with its long string attributes compressed"""
+    return {key: encode_value(key, value, min_bytes) for key, value in item.items()}
+
+
+def decode_item(item):
+    """Copy of a stored item with compressed attributes inflated (None passes)"""
+    if item is None:
+        return None
+    return {key: decode_value(value) for key, value in item.items()}
+
+
+def decode_items(items):
+    """decode_item for a list of items"""
+    return [decode_item(item) for item in items]
+
+
+def stored_size(item):
+    """
+    Approximate DynamoDB item size in bytes (attribute names plus values),
+    as used for capacity units and the 400 KB item limit
+    """
+    size = 0
+    for key, value in item.items():
+        size += len(key.encode("utf-8"))
+        data = getattr(value, "value", value)
+        if isinstance(data, str):
+            size += len(data.encode("utf-8"))
+        elif isinstance(data, (bytes, bytearray)):
+            size += len(data)
+        elif isinstance(data, bool) or data is None:
+            size += 1
+        else:
+            # Numbers and nested values: close enough for capacity estimates
+            size += len(str(data)) + 1
+    return size
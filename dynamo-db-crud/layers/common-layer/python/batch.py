@@ -0,0 +1,166 @@
+import os
+import random
+import time
+from botocore.exceptions import ClientError
+
+from fanout import fan_out
+
+# DynamoDB BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_LIMIT = 25
+
+# DynamoDB BatchGetItem accepts at most 100 keys per call
+BATCH_GET_LIMIT = 100
+
+# Retry settings for UnprocessedItems
+BATCH_MAX_RETRIES = int(os.environ.get("BATCH_MAX_RETRIES", "8"))
+BATCH_BACKOFF_BASE = float(os.environ.get("BATCH_BACKOFF_BASE", "0.05"))
+BATCH_BACKOFF_CAP = float(os.environ.get("BATCH_BACKOFF_CAP", "2.0"))
+
+# Number of BatchGetItem chunks fetched concurrently
+BATCH_GET_WORKERS = int(os.environ.get("BATCH_GET_WORKERS", "4"))
+
+
+def chunked(items, size):
+    """Yield successive chunks of at most `size` elements"""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Exponential backoff with full jitter for the given retry attempt"""
+    base = BATCH_BACKOFF_BASE if base is None else base
+    cap = BATCH_BACKOFF_CAP if cap is None else cap
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def _batch_write_chunk(table, chunk, max_retries, sleep):
+    """Put one chunk with BatchWriteItem, re-driving UnprocessedItems"""
+    client = table.meta.client
+    results = {}
+    pending = [{"PutRequest": {"Item": item}} for item in chunk]
+    attempt = 0
+
+    while pending:
+        try:
+            response = client.batch_write_item(RequestItems={table.name: pending})
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            print(f"BatchWriteItem failed: {error_code}")
+            for request in pending:
+                results[request["PutRequest"]["Item"]["id"]] = error_code
+            break
+
+        unprocessed = response.get("UnprocessedItems", {}).get(table.name, [])
+        unprocessed_ids = {r["PutRequest"]["Item"]["id"] for r in unprocessed}
+        for request in pending:
+            item_id = request["PutRequest"]["Item"]["id"]
+            if item_id not in unprocessed_ids:
+                results[item_id] = None
+
+        if not unprocessed:
+            break
+
+        if attempt >= max_retries:
+            print(f"Giving up on {len(unprocessed)} unprocessed items")
+            for item_id in unprocessed_ids:
+                results[item_id] = "UnprocessedItems"
+            break
+
+        sleep(backoff_delay(attempt))
+        attempt += 1
+        pending = unprocessed
+
+    return results
+
+
+def batch_write_items(
+    table, items, max_retries=None, sleep=time.sleep, concurrency=None
+):
+    """
+    Put items with BatchWriteItem in 25-item chunks.
+
+    Chunks are written concurrently (see fanout.fan_out). UnprocessedItems
+    are re-driven with jittered exponential backoff until `max_retries` is
+    exhausted. Returns a dict mapping each item id to None on success or
+    an error code string on failure.
+    """
+    max_retries = BATCH_MAX_RETRIES if max_retries is None else max_retries
+    results = {}
+
+    for chunk_results in fan_out(
+        _batch_write_chunk,
+        [
+            (table, chunk, max_retries, sleep)
+            for chunk in chunked(items, BATCH_WRITE_LIMIT)
+        ],
+        concurrency,
+    ):
+        if isinstance(chunk_results, Exception):
+            raise chunk_results
+        results.update(chunk_results)
+
+    return results
+
+
+def _batch_get_chunk(table, ids, max_retries, sleep, get_kwargs):
+    """Fetch one chunk of ids with BatchGetItem, re-driving UnprocessedKeys"""
+    client = table.meta.client
+    request = dict(get_kwargs, Keys=[{"id": item_id} for item_id in ids])
+    found = {}
+    unprocessed = []
+    attempt = 0
+
+    while request:
+        response = client.batch_get_item(RequestItems={table.name: request})
+        for item in response.get("Responses", {}).get(table.name, []):
+            found[item["id"]] = item
+
+        request = response.get("UnprocessedKeys", {}).get(table.name)
+        if not request:
+            break
+
+        if attempt >= max_retries:
+            print(f"Giving up on {len(request['Keys'])} unprocessed keys")
+            unprocessed = [key["id"] for key in request["Keys"]]
+            break
+
+        sleep(backoff_delay(attempt))
+        attempt += 1
+
+    return found, unprocessed
+
+
+def batch_get_items(
+    table, ids, max_workers=None, max_retries=None, sleep=time.sleep, **get_kwargs
+):
+    """
+    Get items by id with BatchGetItem in 100-key chunks.
+
+    Chunks are fetched concurrently (see fanout.fan_out). Extra keyword
+    arguments (e.g. ProjectionExpression) are added to every request.
+    Returns a tuple of a dict mapping each found id to its item (ids that
+    do not exist are absent) and a list of ids still unprocessed after
+    all retries.
+    """
+    max_workers = BATCH_GET_WORKERS if max_workers is None else max_workers
+    max_retries = BATCH_MAX_RETRIES if max_retries is None else max_retries
+    # BatchGetItem rejects duplicate keys in a single request
+    unique_ids = list(dict.fromkeys(ids))
+    chunks = list(chunked(unique_ids, BATCH_GET_LIMIT))
+    found = {}
+    unprocessed = []
+
+    results = fan_out(
+        _batch_get_chunk,
+        [(table, chunk, max_retries, sleep, get_kwargs) for chunk in chunks],
+        max_workers,
+    )
+
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+        chunk_found, chunk_unprocessed = result
+        found.update(chunk_found)
+        unprocessed.extend(chunk_unprocessed)
+
+    return found, unprocessed
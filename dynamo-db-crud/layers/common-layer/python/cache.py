@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Cache settings (a size or TTL of 0 disables the cache)
+ITEM_CACHE_SIZE = int(os.environ.get("ITEM_CACHE_SIZE", "1000"))
+ITEM_CACHE_TTL = float(os.environ.get("ITEM_CACHE_TTL", "30"))
+ITEM_CACHE_NEGATIVE_TTL = float(os.environ.get("ITEM_CACHE_NEGATIVE_TTL", "5"))
+
+# Percentage (0-100) of cached reads that log the cache counters
+ITEM_CACHE_STATS_SAMPLE_RATE = float(os.environ.get("ITEM_CACHE_STATS_SAMPLE_RATE", "1"))
+
+
+class ItemCache:
+    """
+    In-process LRU cache with per-entry TTL for warm Lambda containers.
+
+    Missing items are cached too (negative cache) with their own TTL.
+    Each entry keeps the item's `updated_at` so callers can tell how
+    fresh a cached value is.
+    """
+
+    def __init__(self, max_size, ttl, negative_ttl, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, key):
+        """Return (hit, item); item is None for a cached miss"""
+        if not self.enabled:
+            return False, None
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry["expires_at"] <= self.clock():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return False, None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry["item"]
+
+    def put(self, key, item):
+        """Cache an item, or a miss when item is None"""
+        if not self.enabled:
+            return
+
+        ttl = self.ttl if item is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = {
+                "item": item,
+                "updated_at": item.get("updated_at") if item else None,
+                "expires_at": self.clock() + ttl,
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop a cached entry"""
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def stats(self):
+        """Current counters for logging"""
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_item_cache = ItemCache(ITEM_CACHE_SIZE, ITEM_CACHE_TTL, ITEM_CACHE_NEGATIVE_TTL)
+
+
+def get_item_cache():
+    """Get the container-wide item cache"""
+    return _item_cache
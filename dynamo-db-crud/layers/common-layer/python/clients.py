@@ -0,0 +1,57 @@
+import os
+
+# Connection settings for every DynamoDB client, overridable per environment
+DYNAMODB_MAX_POOL_CONNECTIONS = int(
+    os.environ.get("DYNAMODB_MAX_POOL_CONNECTIONS", "16")
+)
+DYNAMODB_RETRY_MODE = os.environ.get("DYNAMODB_RETRY_MODE", "standard")
+DYNAMODB_MAX_ATTEMPTS = int(os.environ.get("DYNAMODB_MAX_ATTEMPTS", "5"))
+DYNAMODB_CONNECT_TIMEOUT = float(os.environ.get("DYNAMODB_CONNECT_TIMEOUT", "2"))
+DYNAMODB_READ_TIMEOUT = float(os.environ.get("DYNAMODB_READ_TIMEOUT", "5"))
+DYNAMODB_TCP_KEEPALIVE = (
+    os.environ.get("DYNAMODB_TCP_KEEPALIVE", "true").lower() == "true"
+)
+
+
+def build_config(**overrides):
+    """
+    Build the botocore Config used for DynamoDB clients
+
+    Keyword arguments override the environment-derived settings.
+    """
+    from botocore.config import Config
+
+    settings = {
+        "max_pool_connections": DYNAMODB_MAX_POOL_CONNECTIONS,
+        "retries": {
+            "mode": DYNAMODB_RETRY_MODE,
+            "total_max_attempts": DYNAMODB_MAX_ATTEMPTS,
+        },
+        "connect_timeout": DYNAMODB_CONNECT_TIMEOUT,
+        "read_timeout": DYNAMODB_READ_TIMEOUT,
+        "tcp_keepalive": DYNAMODB_TCP_KEEPALIVE,
+    }
+    settings.update(overrides)
+    return Config(**settings)
+
+
+def _client_kwargs(endpoint_url=None, config=None, **kwargs):
+    """Keyword arguments shared by resources and clients"""
+    kwargs["config"] = config or build_config()
+    if endpoint_url:
+        kwargs["endpoint_url"] = endpoint_url
+    return kwargs
+
+
+def create_dynamodb_resource(endpoint_url=None, config=None, **kwargs):
+    """Create a DynamoDB service resource with the shared configuration"""
+    import boto3
+
+    return boto3.resource("dynamodb", **_client_kwargs(endpoint_url, config, **kwargs))
+
+
+def create_dynamodb_client(endpoint_url=None, config=None, **kwargs):
+    """Create a low-level DynamoDB client with the shared configuration"""
+    import boto3
+
+    return boto3.client("dynamodb", **_client_kwargs(endpoint_url, config, **kwargs))
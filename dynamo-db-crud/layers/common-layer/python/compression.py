@@ -0,0 +1,78 @@
+import base64
+import gzip
+import os
+
+# brotli is optional; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "4"))
+
+
+def supported_encodings():
+    """Encodings this runtime can produce, in order of preference"""
+    return ["br", "gzip"] if brotli else ["gzip"]
+
+
+def choose_encoding(accept_encoding):
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token.strip().lower()] = quality
+
+    best = None
+    best_quality = 0.0
+    for encoding in supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding):
+    """Compress bytes with the given encoding"""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response, accept_encoding, min_bytes=None):
+    """
+    Compress a proxy response body in place when the client accepts it.
+
+    Small bodies are left as-is. Compressed bodies are base64-encoded with
+    isBase64Encoded set, as required by API Gateway for binary payloads.
+    """
+    min_bytes = COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    headers = response["headers"]
+    headers["Vary"] = "Accept-Encoding"
+
+    body = response.get("body")
+    if not body or len(body) < min_bytes:
+        return response
+
+    encoding = choose_encoding(accept_encoding)
+    if not encoding:
+        return response
+
+    compressed = compress(body.encode("utf-8"), encoding)
+    response["body"] = base64.b64encode(compressed).decode("ascii")
+    response["isBase64Encoded"] = True
+    headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,95 @@
+import os
+import random
+
+from batch import batch_get_items
+
+# The item count is split over COUNTER_SHARDS counter items, each updated
+# with an atomic ADD on a random shard so concurrent writes do not contend
+# on one hot key. Reading the count sums every shard.
+COUNTER_SHARDS = int(os.environ.get("COUNTER_SHARDS", "10"))
+COUNTER_NAME = "items"
+COUNT_ATTR = "item_count"
+
+# TransactWriteItems accepts at most 100 actions
+MAX_COUNTER_SHARDS = 100
+
+
+def get_counter_table_name():
+    """Get the counter table name from the environment"""
+    table_name = os.environ.get("COUNTER_TABLE_NAME")
+    if not table_name:
+        raise ValueError("COUNTER_TABLE_NAME environment variable not set.")
+    return table_name
+
+
+def shard_key(shard):
+    """Partition key of a counter shard"""
+    return f"{COUNTER_NAME}#{shard}"
+
+
+def counter_update(delta, shard=None):
+    """
+    TransactWriteItems action adding `delta` to a counter shard
+
+    A random shard is used unless `shard` is given. Values are in DynamoDB
+    JSON form for the low-level client.
+    """
+    if shard is None:
+        shard = random.randrange(COUNTER_SHARDS)
+    return {
+        "Update": {
+            "TableName": get_counter_table_name(),
+            "Key": {"id": {"S": shard_key(shard)}},
+            "UpdateExpression": "ADD #count :delta",
+            "ExpressionAttributeNames": {"#count": COUNT_ATTR},
+            "ExpressionAttributeValues": {":delta": {"N": str(delta)}},
+        }
+    }
+
+
+def add_to_counter(client, delta):
+    """Add `delta` to a random shard outside of a transaction"""
+    client.update_item(**counter_update(delta)["Update"])
+
+
+def read_count(dynamodb, shards=None):
+    """
+    Sum the counter shards
+
+    Returns a tuple of the count and the list of shard keys that could not
+    be read (the count is incomplete when it is not empty).
+    """
+    shards = COUNTER_SHARDS if shards is None else shards
+    table = dynamodb.Table(get_counter_table_name())
+    found, unprocessed = batch_get_items(
+        table, [shard_key(shard) for shard in range(shards)], max_workers=1
+    )
+    count = sum(int(item.get(COUNT_ATTR, 0)) for item in found.values())
+    return count, unprocessed
+
+
+def reset_counter(client, total, shards=None):
+    """
+    Overwrite every shard in one transaction so that they sum to `total`
+
+    `shards` may be larger than COUNTER_SHARDS to clear shards left over
+    from a higher shard count.
+    """
+    shards = COUNTER_SHARDS if shards is None else shards
+    if not 1 <= shards <= MAX_COUNTER_SHARDS:
+        raise ValueError(f"shards must be between 1 and {MAX_COUNTER_SHARDS}")
+    table_name = get_counter_table_name()
+    client.transact_write_items(
+        TransactItems=[
+            {
+                "Put": {
+                    "TableName": table_name,
+                    "Item": {
+                        "id": {"S": shard_key(shard)},
+                        COUNT_ATTR: {"N": str(total if shard == 0 else 0)},
+                    },
+                }
+            }
+            for shard in range(shards)
+        ]
+    )
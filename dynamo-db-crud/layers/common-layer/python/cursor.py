@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import hmac
+import os
+from decimal import Decimal
+
+from serialization import dumps, loads
+
+# Cursor format version, stored as the first byte of every token
+CURSOR_VERSION = b"1"
+# Truncated HMAC-SHA256 length in bytes
+CURSOR_MAC_BYTES = 8
+
+
+def _secret():
+    """Signing key for cursors from CURSOR_SECRET"""
+    secret = os.environ.get("CURSOR_SECRET")
+    if not secret:
+        # Not a ValueError: a missing key is a deployment error, not a bad
+        # cursor, and must not fall back to a guessable key
+        raise RuntimeError("CURSOR_SECRET environment variable not set.")
+    return secret.encode("utf-8")
+
+
+def _mac(payload, context):
+    digest = hmac.new(
+        _secret(), context.encode("utf-8") + b"\0" + payload, hashlib.sha256
+    ).digest()
+    return digest[:CURSOR_MAC_BYTES]
+
+
+def encode_cursor(data, context=""):
+    """
+    Encode pagination state as an opaque, URL-safe token.
+
+    The token is signed together with `context` (e.g. the active filters),
+    so it is only accepted for the same request shape.
+    """
+    payload = dumps(data).encode("utf-8")
+    token = CURSOR_VERSION + _mac(payload, context) + payload
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token, context=""):
+    """Decode a token from encode_cursor; raises ValueError if invalid"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError):
+        raise ValueError("Malformed cursor")
+
+    version = raw[:1]
+    mac = raw[1 : 1 + CURSOR_MAC_BYTES]
+    payload = raw[1 + CURSOR_MAC_BYTES :]
+    if version != CURSOR_VERSION or not hmac.compare_digest(
+        mac, _mac(payload, context)
+    ):
+        raise ValueError("Invalid cursor")
+    return loads(payload)
+
+
+def is_key(value):
+    """Whether a decoded value is a DynamoDB key (attribute name -> string/number)"""
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(
+            isinstance(name, str)
+            and isinstance(attr, (str, int, Decimal))
+            and not isinstance(attr, bool)
+            for name, attr in value.items()
+        )
+    )
@@ -0,0 +1,45 @@
+import gzip
+
+from attributes import decode_item
+from scan import iter_scan_pages
+from serialization import dumps
+
+
+def iter_items(table, **scan_kwargs):
+    """Yield items one by one while fetching a single scan page at a time"""
+    for items, _ in iter_scan_pages(table, **scan_kwargs):
+        for item in items:
+            yield decode_item(item)
+
+
+def iter_ndjson_lines(items):
+    """Serialize each item to one NDJSON line (bytes)"""
+    for item in items:
+        yield (dumps(item) + "\n").encode("utf-8")
+
+
+def write_lines(lines, fileobj, compress=False):
+    """Write lines to a binary file object, optionally gzip-compressed"""
+    count = 0
+    stream = gzip.GzipFile(fileobj=fileobj, mode="wb") if compress else fileobj
+    try:
+        for line in lines:
+            stream.write(line)
+            count += 1
+    finally:
+        if compress:
+            stream.close()
+    return count
+
+
+def export_ndjson(table, fileobj, compress=False, **scan_kwargs):
+    """
+    Stream the whole table to `fileobj` as NDJSON.
+
+    Items flow through a generator pipeline (scan page -> item -> line),
+    so memory use stays bounded by one scan page regardless of table size.
+    Returns the number of exported items.
+    """
+    return write_lines(
+        iter_ndjson_lines(iter_items(table, **scan_kwargs)), fileobj, compress
+    )
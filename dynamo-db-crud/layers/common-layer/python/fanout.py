@@ -0,0 +1,76 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from clients import DYNAMODB_MAX_POOL_CONNECTIONS
+
+# Maximum number of DynamoDB requests a fan-out keeps in flight. Requests
+# beyond the client's connection pool would only wait for a connection,
+# so the pool size is the default.
+FANOUT_CONCURRENCY = int(
+    os.environ.get("FANOUT_CONCURRENCY", str(DYNAMODB_MAX_POOL_CONNECTIONS))
+)
+
+# Worker threads for blocking boto3 calls, shared by warm invocations
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Get the fan-out thread pool (created on first use)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, FANOUT_CONCURRENCY), thread_name_prefix="fanout"
+            )
+    return _executor
+
+
+async def fan_out_async(func, args_list, concurrency=None):
+    """
+    Call func(*args) for every tuple in `args_list` from the event loop.
+
+    The blocking boto3 calls are offloaded to a shared thread pool and at
+    most `concurrency` (capped at FANOUT_CONCURRENCY) are in flight at
+    once. Returns a list in input order holding each call's result, or
+    the exception it raised.
+    """
+    concurrency = FANOUT_CONCURRENCY if concurrency is None else concurrency
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    executor = _get_executor()
+
+    async def run(args):
+        async with semaphore:
+            try:
+                # Run in a copy of the caller's context so the call is
+                # measured as part of the current invocation (see metrics.py)
+                return await loop.run_in_executor(
+                    executor, contextvars.copy_context().run, func, *args
+                )
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*(run(args) for args in args_list))
+
+
+def fan_out(func, args_list, concurrency=None):
+    """
+    Synchronous wrapper of fan_out_async for lambda handlers.
+
+    Must not be called from a running event loop. A single call, or a
+    concurrency of 1, runs inline without an event loop.
+    """
+    args_list = list(args_list)
+    if len(args_list) <= 1 or concurrency == 1:
+        results = []
+        for args in args_list:
+            try:
+                results.append(func(*args))
+            except Exception as e:
+                results.append(e)
+        return results
+    return asyncio.run(fan_out_async(func, args_list, concurrency))
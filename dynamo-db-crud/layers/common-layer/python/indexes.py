@@ -0,0 +1,21 @@
+import os
+
+# Global secondary indexes of the items table (see template.yaml)
+NAME_INDEX = os.environ.get("NAME_INDEX", "NameIndex")
+CREATED_INDEX = os.environ.get("CREATED_INDEX", "CreatedAtIndex")
+
+# Partition key of CreatedAtIndex: created_at bucketed by month ("YYYY-MM")
+CREATED_BUCKET_ATTR = "created_month"
+
+
+def created_bucket(timestamp):
+    """Bucket (partition key value) of an ISO 8601 timestamp"""
+    return timestamp[:7]
+
+
+def previous_bucket(bucket):
+    """The bucket before `bucket` ("2024-01" -> "2023-12")"""
+    year, month = int(bucket[:4]), int(bucket[5:7])
+    if month == 1:
+        return f"{year - 1:04d}-12"
+    return f"{year:04d}-{month - 1:02d}"
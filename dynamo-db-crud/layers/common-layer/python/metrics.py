@@ -0,0 +1,198 @@
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# CloudWatch Embedded Metric Format settings
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "DynamoDbCrud")
+
+# Request ReturnConsumedCapacity=TOTAL on every DynamoDB call that supports it
+CONSUMED_CAPACITY_ENABLED = (
+    os.environ.get("CONSUMED_CAPACITY_ENABLED", "true").lower() == "true"
+)
+
+# Percentage (0-100) of invocations run under cProfile
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", "25"))
+
+
+class Invocation:
+    """Timings and consumed capacity of one handler invocation"""
+
+    def __init__(self):
+        # Stage name -> total milliseconds
+        self.timings = {}
+        # Capacity units consumed (None until reported)
+        self.units = None
+        self.lock = threading.Lock()
+
+
+# Invocation being measured in the current context. Handlers may run
+# concurrently in one process (threaded load tests), so the state is per
+# context; fan-out workers run in a copy of their caller's context and add
+# to the same Invocation (see fanout.py and scan.py).
+_invocation = contextvars.ContextVar("metrics_invocation", default=None)
+# Used by calls made outside an instrumented handler (scripts, tests)
+_untracked = Invocation()
+
+
+def current_invocation():
+    """Invocation of the current context"""
+    return _invocation.get() or _untracked
+
+
+def record(name, elapsed_ms):
+    """Add a duration to the current invocation's timings"""
+    invocation = current_invocation()
+    with invocation.lock:
+        invocation.timings[name] = invocation.timings.get(name, 0.0) + elapsed_ms
+
+
+@contextmanager
+def timed(name):
+    """Time the enclosed block as stage `name`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000)
+
+
+def record_capacity(consumed):
+    """Add ConsumedCapacity from a DynamoDB response (dict or list)"""
+    if not consumed:
+        return
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    units = sum(float(c.get("CapacityUnits", 0)) for c in consumed)
+    invocation = current_invocation()
+    with invocation.lock:
+        invocation.units = (invocation.units or 0.0) + units
+
+
+def consumed_capacity():
+    """Capacity units consumed so far by the current invocation"""
+    return current_invocation().units
+
+
+def _request_capacity(params, model, **kwargs):
+    if CONSUMED_CAPACITY_ENABLED and "ReturnConsumedCapacity" in model.input_shape.members:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+
+def _before_call(model, context, **kwargs):
+    context["metrics_start"] = time.perf_counter()
+
+
+def _after_call(model, context, parsed=None, **kwargs):
+    start = context.get("metrics_start")
+    if start is not None:
+        record(f"DynamoDB.{model.name}", (time.perf_counter() - start) * 1000)
+    record_capacity((parsed or {}).get("ConsumedCapacity"))
+
+
+def instrument_client(client):
+    """Time every API call made through a botocore client and track capacity"""
+    client.meta.events.register("before-parameter-build.dynamodb", _request_capacity)
+    client.meta.events.register("before-call.dynamodb", _before_call)
+    client.meta.events.register("after-call.dynamodb", _after_call)
+    return client
+
+
+def emit(function_name, operation, status_code, extra=None):
+    """Print one EMF log line with the current invocation's timings"""
+    invocation = current_invocation()
+    with invocation.lock:
+        timings = dict(invocation.timings)
+    values = {name: round(ms, 3) for name, ms in timings.items()}
+    values.update(extra or {})
+
+    print(
+        json.dumps(
+            {
+                "_aws": {
+                    "Timestamp": int(time.time() * 1000),
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": METRICS_NAMESPACE,
+                            "Dimensions": [["function", "operation", "status_code"]],
+                            "Metrics": [
+                                {"Name": name, "Unit": "Milliseconds"}
+                                for name in timings
+                            ]
+                            + [{"Name": name, "Unit": "Count"} for name in extra or {}],
+                        }
+                    ],
+                },
+                "function": function_name,
+                "operation": operation,
+                "status_code": str(status_code),
+                **values,
+            }
+        )
+    )
+
+
+def _print_profile(profiler):
+    import io
+    import pstats
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(
+        PROFILE_TOP_N
+    )
+    print(stream.getvalue())
+
+
+def instrument_handler(handler):
+    """
+    Decorate a lambda_handler to emit one EMF line per invocation.
+
+    The operation dimension is the HTTP method and API resource. Capacity
+    units consumed by the invocation are returned in the X-Consumed-Capacity
+    header and emitted as the ConsumedCapacity metric. A sample
+    of invocations (PROFILE_SAMPLE_RATE percent) is run under cProfile and
+    the hottest functions are logged.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        token = _invocation.set(Invocation())
+
+        profiler = None
+        if PROFILE_SAMPLE_RATE > 0 and random.uniform(0, 100) < PROFILE_SAMPLE_RATE:
+            import cProfile
+
+            profiler = cProfile.Profile()
+
+        start = time.perf_counter()
+        response = None
+        try:
+            if profiler:
+                response = profiler.runcall(handler, event, context)
+            else:
+                response = handler(event, context)
+            return response
+        finally:
+            record("Latency", (time.perf_counter() - start) * 1000)
+            units = consumed_capacity()
+            if units is not None and response:
+                response.setdefault("headers", {})["X-Consumed-Capacity"] = f"{units:g}"
+            if profiler:
+                _print_profile(profiler)
+            if METRICS_ENABLED:
+                function_name = getattr(context, "function_name", None) or os.environ.get(
+                    "AWS_LAMBDA_FUNCTION_NAME", handler.__module__
+                )
+                operation = f"{(event or {}).get('httpMethod')} {(event or {}).get('resource')}"
+                status_code = (response or {}).get("statusCode", 500)
+                extra = {"ConsumedCapacity": units} if units is not None else None
+                emit(function_name, operation, status_code, extra)
+            _invocation.reset(token)
+
+    return wrapper
@@ -0,0 +1,54 @@
+import importlib
+
+from utils import create_error_response
+
+# Handler module of each API route when every route is served by a single
+# function whose code root is src/ (RouterFunction in template.yaml)
+ROUTES = {
+    ("POST", "/items"): "create.app",
+    ("POST", "/items:batch"): "create.app",
+    ("GET", "/items"): "read.app",
+    ("GET", "/items/count"): "read.app",
+    ("GET", "/items/{id}"): "read.app",
+    ("PUT", "/items/{id}"): "update.app",
+    ("POST", "/items:batchUpdate"): "update.app",
+    ("DELETE", "/items/{id}"): "delete.app",
+    ("POST", "/items:batchDelete"): "delete.app",
+}
+
+# Imported handlers by module name; modules are imported on first use so a
+# cold start only pays for the route being called
+_handlers = {}
+
+
+def get_handler(module_name):
+    """Get the lambda_handler of a route module (imported on first use)"""
+    handler = _handlers.get(module_name)
+    if handler is None:
+        handler = importlib.import_module(module_name).lambda_handler
+        _handlers[module_name] = handler
+    return handler
+
+
+def lambda_handler(event, context):
+    """
+    Dispatch an API Gateway event to the handler of its route
+
+    The route handlers are already instrumented, so the router itself
+    emits no metrics.
+    """
+    method = event.get("httpMethod")
+    resource = event.get("resource")
+
+    module_name = ROUTES.get((method, resource))
+    if module_name is None:
+        allowed = sorted(m for m, r in ROUTES if r == resource)
+        if allowed:
+            response = create_error_response(
+                405, "Method Not Allowed", f"Method {method} is not allowed"
+            )
+            response["headers"]["Allow"] = ", ".join(allowed)
+            return response
+        return create_error_response(404, "Not Found", "Resource not found")
+
+    return get_handler(module_name)(event, context)
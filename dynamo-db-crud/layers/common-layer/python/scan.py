@@ -0,0 +1,129 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of scan segments processed concurrently
+SCAN_WORKERS = int(os.environ.get("SCAN_WORKERS", "8"))
+
+
+def iter_scan_pages(
+    table, segment=None, total_segments=None, start_key=None, max_pages=None, **scan_kwargs
+):
+    """
+    Yield (items, last_key) for each scan page.
+
+    When `segment` and `total_segments` are given only that segment of the
+    table is scanned. Iteration stops at the end of the table (last_key is
+    None) or after `max_pages` pages.
+    """
+    client = table.meta.client
+    kwargs = dict(scan_kwargs, TableName=table.name)
+    if total_segments is not None:
+        kwargs["Segment"] = segment
+        kwargs["TotalSegments"] = total_segments
+
+    pages = 0
+    while True:
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        response = client.scan(**kwargs)
+        start_key = response.get("LastEvaluatedKey")
+        pages += 1
+        yield response["Items"], start_key
+
+        if not start_key or (max_pages and pages >= max_pages):
+            return
+
+
+def scan_segment(table, segment, total_segments, start_key=None, max_pages=None, **scan_kwargs):
+    """Scan one segment and return (items, last_key)"""
+    items = []
+    last_key = None
+    for page, last_key in iter_scan_pages(
+        table, segment, total_segments, start_key, max_pages, **scan_kwargs
+    ):
+        items.extend(page)
+    return items, last_key
+
+
+def count_segment(table, segment, total_segments, **scan_kwargs):
+    """Count the items of one segment with Select=COUNT"""
+    client = table.meta.client
+    kwargs = dict(
+        scan_kwargs,
+        TableName=table.name,
+        Select="COUNT",
+        Segment=segment,
+        TotalSegments=total_segments,
+    )
+
+    count = 0
+    while True:
+        response = client.scan(**kwargs)
+        count += response["Count"]
+        if not response.get("LastEvaluatedKey"):
+            return count
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def parallel_count(table, total_segments, workers=None, **scan_kwargs):
+    """Count every item of the table with a parallel Select=COUNT scan"""
+    workers = SCAN_WORKERS if workers is None else workers
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, total_segments))) as executor:
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                count_segment,
+                table,
+                segment,
+                total_segments,
+                **scan_kwargs,
+            )
+            for segment in range(total_segments)
+        ]
+    return sum(future.result() for future in futures)
+
+
+def parallel_scan(
+    table, total_segments, workers=None, cursors=None, max_pages=None, **scan_kwargs
+):
+    """
+    Scan the table with Segment/TotalSegments from a thread pool.
+
+    `cursors` maps segment number to the key to resume from; when given,
+    only those segments are scanned. Returns (items, cursors) where the
+    returned cursors hold the resume key of every unfinished segment.
+    """
+    workers = SCAN_WORKERS if workers is None else workers
+    if cursors is None:
+        cursors = {segment: None for segment in range(total_segments)}
+
+    segments = sorted(cursors)
+    if not segments:
+        return [], {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(segments)))) as executor:
+        futures = {
+            # Workers share the caller's metrics invocation (see metrics.py)
+            segment: executor.submit(
+                contextvars.copy_context().run,
+                scan_segment,
+                table,
+                segment,
+                total_segments,
+                cursors[segment],
+                max_pages,
+                **scan_kwargs,
+            )
+            for segment in segments
+        }
+
+    items = []
+    next_cursors = {}
+    for segment in segments:
+        segment_items, last_key = futures[segment].result()
+        items.extend(segment_items)
+        if last_key:
+            next_cursors[segment] = last_key
+
+    return items, next_cursors
@@ -0,0 +1,166 @@
+import os
+import re
+from decimal import Decimal
+
+# Maximum number of attributes a request may write to one item
+MAX_ITEM_ATTRIBUTES = int(os.environ.get("MAX_ITEM_ATTRIBUTES", "100"))
+
+# DynamoDB rejects documents nested deeper than 32 levels
+MAX_NESTING_DEPTH = 32
+
+# Declarative description of the fields a client may write. Fields not
+# listed are accepted when their name matches `additional_fields`.
+ITEM_SCHEMA = {
+    "fields": {
+        # Partition key of NameIndex: a non-empty string of at most 2048
+        # bytes (UTF-8), the DynamoDB limit for partition key values
+        "name": {"type": "string", "required": True, "min_length": 1, "max_bytes": 2048},
+        "description": {"type": "string"},
+    },
+    # Set by the service; ignored when sent by clients
+    "read_only": ["id", "created_at", "updated_at", "version", "created_month"],
+    "additional_fields": {
+        "name_pattern": r"[A-Za-z_][A-Za-z0-9_\-]{0,63}",
+        "type": "any",
+    },
+    "max_attributes": MAX_ITEM_ATTRIBUTES,
+}
+
+# JSON types as parsed by serialization.loads (floats arrive as Decimal)
+_TYPES = {
+    "string": (str,),
+    "number": (int, Decimal),
+    "boolean": (bool,),
+    "list": (list,),
+    "map": (dict,),
+    "null": (type(None),),
+    "any": None,
+}
+
+
+def _depth(value, limit):
+    """Nesting depth of a list/map value, stopping once past `limit`"""
+    if isinstance(value, dict):
+        children = value.values()
+    elif isinstance(value, list):
+        children = value
+    else:
+        return 0
+    deepest = 0
+    for child in children:
+        deepest = max(deepest, _depth(child, limit))
+        if deepest > limit:
+            break
+    return deepest + 1
+
+
+class ItemSchema:
+    """
+    Validator compiled from a declarative schema (see ITEM_SCHEMA).
+
+    Compiling resolves types, patterns and limits once per container so
+    validating a request body is a single pass over its keys.
+    """
+
+    def __init__(self, spec):
+        self.fields = {}
+        for name, field in spec["fields"].items():
+            self.fields[name] = (
+                _TYPES[field["type"]],
+                field["type"],
+                field.get("min_length"),
+                field.get("max_length"),
+                field.get("max_bytes"),
+            )
+        self.required = [n for n, f in spec["fields"].items() if f.get("required")]
+        self.read_only = frozenset(spec["read_only"])
+        additional = spec.get("additional_fields")
+        self.name_pattern = (
+            re.compile(additional["name_pattern"]) if additional else None
+        )
+        self.additional_types = _TYPES[additional["type"]] if additional else None
+        self.max_attributes = spec["max_attributes"]
+
+    def _check_value(
+        self, key, value, types, type_name, min_length, max_length, max_bytes
+    ):
+        # bool is an int subclass; it is only a number when declared as one
+        if types is not None and (
+            not isinstance(value, types)
+            or (isinstance(value, bool) and type_name != "boolean")
+        ):
+            return f"Field '{key}' must be a {type_name}"
+        if min_length is not None and len(value) < min_length:
+            if min_length == 1:
+                return f"Field '{key}' must not be empty"
+            return f"Field '{key}' must be at least {min_length} characters"
+        if max_length is not None and len(value) > max_length:
+            return f"Field '{key}' cannot exceed {max_length} characters"
+        # UTF-8 takes at most 4 bytes per character, so short strings are
+        # not encoded
+        if (
+            max_bytes is not None
+            and len(value) > max_bytes // 4
+            and len(value.encode("utf-8", "surrogatepass")) > max_bytes
+        ):
+            return f"Field '{key}' cannot exceed {max_bytes} bytes"
+        if isinstance(value, (dict, list)):
+            if _depth(value, MAX_NESTING_DEPTH) > MAX_NESTING_DEPTH:
+                return f"Field '{key}' is nested too deeply"
+        return None
+
+    def validate(self, body, partial=False):
+        """
+        Validate a create (or, with partial=True, update) request body.
+
+        Returns (fields, error): the writable fields with read-only ones
+        dropped, or None and an error message.
+        """
+        if not isinstance(body, dict):
+            return None, "Request body must be a JSON object"
+        # Rejected before looking at any key, however many were sent
+        if len(body) > self.max_attributes + len(self.read_only):
+            return None, f"Items cannot have more than {self.max_attributes} attributes"
+
+        fields = {}
+        for key, value in body.items():
+            if key in self.read_only:
+                continue
+            spec = self.fields.get(key)
+            if spec is None:
+                if self.name_pattern is None or not self.name_pattern.fullmatch(key):
+                    return None, f"Invalid attribute name: {key[:64]!r}"
+                spec = (self.additional_types, "any", None, None, None)
+            error = self._check_value(key, value, *spec)
+            if error:
+                return None, error
+            fields[key] = value
+
+        if len(fields) > self.max_attributes:
+            return None, f"Items cannot have more than {self.max_attributes} attributes"
+        if not partial:
+            for name in self.required:
+                if name not in fields:
+                    return None, f"Field '{name}' is required"
+        return fields, None
+
+
+_item_schema = ItemSchema(ITEM_SCHEMA)
+
+# (name placeholder, value placeholder, "name = value") per attribute
+# position, built once so update expressions need no formatting
+_placeholders = [
+    (f"#a{i}", f":v{i}", f"#a{i} = :v{i}") for i in range(MAX_ITEM_ATTRIBUTES)
+]
+
+
+def placeholders(index):
+    """Expression placeholders for the attribute at `index` of a request"""
+    if index < len(_placeholders):
+        return _placeholders[index]
+    return f"#a{index}", f":v{index}", f"#a{index} = :v{index}"
+
+
+def get_item_schema():
+    """Get the item schema (compiled once per container)"""
+    return _item_schema
@@ -0,0 +1,77 @@
+import base64
+import json
+from decimal import Decimal
+
+# orjson is installed into the layer by `sam build` (python/requirements.txt);
+# the stdlib encoder is used when it is not importable (e.g. local scripts)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_default(value):
+    """Convert DynamoDB types that JSON does not support natively"""
+    if isinstance(value, Decimal):
+        # Keep numbers as numbers instead of strings
+        if value == value.to_integral_value():
+            return int(value)
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        # String and number sets are sorted for a stable body (and ETag)
+        try:
+            return sorted(value)
+        except TypeError:
+            return list(value)
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+
+    # Imported lazily to keep boto3 out of the cold-start import path
+    from boto3.dynamodb.types import Binary
+
+    if isinstance(value, Binary):
+        return base64.b64encode(value.value).decode("ascii")
+    return str(value)
+
+
+# Encoder built once per container with compact separators and no cycle check
+_encoder = json.JSONEncoder(
+    default=json_default,
+    separators=(",", ":"),
+    ensure_ascii=False,
+    check_circular=False,
+)
+
+
+def _dumps_stdlib(data):
+    return _encoder.encode(data)
+
+
+def _dumps_orjson(data):
+    try:
+        return orjson.dumps(
+            data, default=json_default, option=orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    except TypeError:
+        # orjson only encodes 64-bit integers; DynamoDB numbers have up to
+        # 38 digits
+        return _dumps_stdlib(data)
+
+
+def dumps(data):
+    """Serialize data to a JSON string"""
+    return _dumps_orjson(data) if orjson else _dumps_stdlib(data)
+
+
+def loads(data):
+    """
+    Parse a JSON request body.
+
+    Floats are parsed as Decimal because boto3 rejects float attributes.
+    """
+    return json.loads(data, parse_float=Decimal)
+
+
+def backend():
+    """Name of the serializer in use"""
+    return "orjson" if orjson else "stdlib"
@@ -0,0 +1,141 @@
+import math
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Requests per second (and burst) admitted by one function instance
+# before DynamoDB is called (a rate of 0 disables the limit)
+RATE_LIMIT_RPS = float(os.environ.get("RATE_LIMIT_RPS", "0"))
+RATE_LIMIT_BURST = float(os.environ.get("RATE_LIMIT_BURST", str(RATE_LIMIT_RPS)))
+
+# The same per API key, within one function instance
+API_KEY_RATE_LIMIT_RPS = float(os.environ.get("API_KEY_RATE_LIMIT_RPS", "0"))
+API_KEY_RATE_LIMIT_BURST = float(
+    os.environ.get("API_KEY_RATE_LIMIT_BURST", str(API_KEY_RATE_LIMIT_RPS))
+)
+MAX_API_KEY_BUCKETS = 1000
+
+# Retry-After grows with the number of throttles seen in the last window
+RETRY_AFTER_BASE_SECONDS = float(os.environ.get("RETRY_AFTER_BASE_SECONDS", "1"))
+RETRY_AFTER_MAX_SECONDS = float(os.environ.get("RETRY_AFTER_MAX_SECONDS", "30"))
+THROTTLE_WINDOW_SECONDS = 60
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second up to `burst`"""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+
+    def acquire(self, tokens=1):
+        """Take tokens; returns 0 on success, else the seconds until available"""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Per-instance token bucket plus one bucket per API key.
+
+    Key buckets are kept in LRU order and bounded by MAX_API_KEY_BUCKETS.
+    """
+
+    def __init__(self, rate, burst, key_rate, key_burst, clock=time.monotonic):
+        self.clock = clock
+        self.bucket = TokenBucket(rate, burst, clock) if rate > 0 else None
+        self.key_rate = key_rate
+        self.key_burst = key_burst
+        self.key_buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def acquire(self, api_key=None):
+        """Admit one request; returns 0, or the seconds to wait when shed"""
+        with self.lock:
+            key_bucket = None
+            if api_key and self.key_rate > 0:
+                key_bucket = self.key_buckets.get(api_key)
+                if key_bucket is None:
+                    key_bucket = TokenBucket(self.key_rate, self.key_burst, self.clock)
+                    self.key_buckets[api_key] = key_bucket
+                    while len(self.key_buckets) > MAX_API_KEY_BUCKETS:
+                        self.key_buckets.popitem(last=False)
+                self.key_buckets.move_to_end(api_key)
+
+            # A key over its own limit must not use up the shared bucket
+            if key_bucket is not None:
+                wait = key_bucket.acquire()
+                if wait:
+                    return wait
+            if self.bucket is not None:
+                wait = self.bucket.acquire()
+                if wait:
+                    return wait
+            return 0.0
+
+
+class ThrottleTracker:
+    """Recent throttle timestamps, used to size Retry-After"""
+
+    def __init__(self, window=THROTTLE_WINDOW_SECONDS, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.events = deque()
+        self.lock = threading.Lock()
+
+    def _prune(self, now):
+        while self.events and self.events[0] <= now - self.window:
+            self.events.popleft()
+
+    def record(self, count=1):
+        """Count throttled requests"""
+        with self.lock:
+            now = self.clock()
+            self._prune(now)
+            self.events.extend([now] * count)
+
+    def recent(self):
+        """Number of throttles within the window"""
+        with self.lock:
+            self._prune(self.clock())
+            return len(self.events)
+
+    def retry_after(self, wait=0.0):
+        """
+        Whole seconds a client should wait before retrying.
+
+        The base delay grows with log2 of the recent throttle count, is at
+        least `wait`, is capped at RETRY_AFTER_MAX_SECONDS, and gets up to
+        50% jitter so that throttled clients do not retry in lockstep.
+        """
+        seconds = RETRY_AFTER_BASE_SECONDS * (1 + math.log2(1 + self.recent()))
+        seconds = min(RETRY_AFTER_MAX_SECONDS, max(seconds, wait))
+        seconds *= random.uniform(1, 1.5)
+        return max(1, math.ceil(min(seconds, RETRY_AFTER_MAX_SECONDS)))
+
+
+_limiter = RateLimiter(
+    RATE_LIMIT_RPS, RATE_LIMIT_BURST, API_KEY_RATE_LIMIT_RPS, API_KEY_RATE_LIMIT_BURST
+)
+_tracker = ThrottleTracker()
+
+
+def get_rate_limiter():
+    """Get the container-wide rate limiter"""
+    return _limiter
+
+
+def get_throttle_tracker():
+    """Get the container-wide throttle tracker"""
+    return _tracker
+
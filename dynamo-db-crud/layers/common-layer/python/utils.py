@@ -1,38 +1,126 @@
+import base64
+import hashlib
 import json
-import boto3
 import os
+import re
 
-# Initialize DynamoDB resource
-dynamodb_endpoint = os.environ.get("DYNAMODB_ENDPOINT_URL")
-table_name = os.environ.get("TABLE_NAME")
+from attributes import ATTRIBUTE_COMPRESSION_MIN_BYTES, may_be_compressed
+from clients import create_dynamodb_client, create_dynamodb_resource
+from compression import compress_response
+from metrics import instrument_client, timed
+from serialization import dumps, loads
+from throttle import get_rate_limiter, get_throttle_tracker
 
-print(f"DynamoDB Endpoint URL: {dynamodb_endpoint}")
-print(f"Table Name: {table_name}")
+# DynamoDB resource, table and client are created on first use so that
+# cold starts (and requests rejected before touching the database) do not
+# pay for them
+_dynamodb = None
+_table = None
+_client = None
 
-# テーブル名が設定されていることは必須
-if not table_name:
-    raise ValueError("TABLE_NAME environment variable not set.")
+# Request body limits: one item stays under DynamoDB's 400 KB item size,
+# batches under Lambda's 6 MB synchronous payload
+MAX_BODY_BYTES = int(os.environ.get("MAX_BODY_BYTES", str(350 * 1024)))
+MAX_BATCH_BODY_BYTES = int(os.environ.get("MAX_BATCH_BODY_BYTES", str(6 * 1024 * 1024)))
 
-# endpoint_url が設定されている場合（ローカルテストなど）はそのURLを使用
-if dynamodb_endpoint:
-    print(f"Connecting to DynamoDB at custom endpoint: {dynamodb_endpoint}")
-    dynamodb = boto3.resource("dynamodb", endpoint_url=dynamodb_endpoint)
-else:
-    print("Connecting to AWS DynamoDB (default endpoint).")
-    dynamodb = boto3.resource("dynamodb")
+# Responses that tell the client to back off and retry
+RETRYABLE_STATUS_CODES = (429, 503)
 
-table = dynamodb.Table(table_name)
-print(f"Successfully connected to table: {table_name}")
+# DynamoDB error codes reported as 429
+THROTTLE_ERROR_CODES = frozenset(
+    [
+        "ProvisionedThroughputExceededException",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+    ]
+)
+
+# Transaction cancellation reasons reported as 429
+THROTTLE_REASONS = frozenset(
+    ["ThrottlingError", "ProvisionedThroughputExceeded", "RequestLimitExceeded"]
+)
+
+
+def get_table_name():
+    """Get the table name from the environment"""
+    table_name = os.environ.get("TABLE_NAME")
+    # テーブル名が設定されていることは必須
+    if not table_name:
+        raise ValueError("TABLE_NAME environment variable not set.")
+    return table_name
+
+
+def _endpoint_url():
+    """Custom endpoint URL, if any"""
+    dynamodb_endpoint = os.environ.get("DYNAMODB_ENDPOINT_URL")
+    # endpoint_url が設定されている場合（ローカルテストなど）はそのURLを使用
+    if dynamodb_endpoint:
+        print(f"Connecting to DynamoDB at custom endpoint: {dynamodb_endpoint}")
+    else:
+        print("Connecting to AWS DynamoDB (default endpoint).")
+    return dynamodb_endpoint
+
+
+def get_dynamodb():
+    """Get the DynamoDB service resource (created on first use)"""
+    global _dynamodb
+    if _dynamodb is None:
+        _dynamodb = create_dynamodb_resource(_endpoint_url())
+        instrument_client(_dynamodb.meta.client)
+    return _dynamodb
 
 
 def get_table():
-    """Get DynamoDB table instance"""
-    return table
+    """Get DynamoDB table instance (created on first use)"""
+    global _table
+    if _table is None:
+        table_name = get_table_name()
+        _table = get_dynamodb().Table(table_name)
+        print(f"Successfully connected to table: {table_name}")
+    return _table
 
 
-def create_success_response(status_code, data):
-    """Create a successful HTTP response"""
-    return {
+def serialize_item(item):
+    """Convert an item to DynamoDB JSON for the low-level client"""
+    from boto3.dynamodb.types import TypeSerializer
+
+    serializer = TypeSerializer()
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+
+def get_client():
+    """
+    Get a low-level DynamoDB client (created on first use)
+
+    The client skips the resource model and type transformation, so it is
+    cheaper to create; values must be passed in DynamoDB JSON form.
+    """
+    global _client
+    if _client is None:
+        _client = instrument_client(create_dynamodb_client(_endpoint_url()))
+    return _client
+
+
+def _serialize(data):
+    """Serialize a response body, timing the step"""
+    with timed("Serialize"):
+        return dumps(data)
+
+
+def _compress(response, event):
+    """Compress a response for the request's Accept-Encoding, timing the step"""
+    with timed("Compress"):
+        return compress_response(response, get_header(event, "Accept-Encoding"))
+
+
+def create_success_response(status_code, data, event=None):
+    """
+    Create a successful HTTP response
+
+    When the request event is given, the body is compressed according to
+    its Accept-Encoding header.
+    """
+    response = {
         "statusCode": status_code,
         "headers": {
             "Content-Type": "application/json",
@@ -40,22 +128,69 @@ def create_success_response(status_code, data):
             "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
             "Access-Control-Allow-Headers": (
                 "Content-Type,X-Amz-Date,Authorization,X-Api-Key,"
-                "X-Amz-Security-Token"
+                "X-Amz-Security-Token,If-Match,If-None-Match"
             ),
+            # Response headers browsers may read besides the CORS-safelisted ones
+            "Access-Control-Expose-Headers": "ETag,Retry-After,X-Consumed-Capacity",
         },
-        "body": json.dumps(data, default=str),
+        "body": _serialize(data),
     }
+    if event is not None:
+        return _compress(response, event)
+    return response
+
+
+def item_etag(item):
+    """Strong ETag for a full item, derived from its version or updated_at"""
+    if item.get("version") is not None:
+        return f'"{item["version"]}"'
+    return body_etag(f"{item.get('id')}:{item.get('updated_at')}")
+
 
+# Hash ETags as produced by body_etag
+_HASH_ETAG = re.compile(r"[0-9a-f]{32}")
 
-def create_error_response(status_code, error_type, message):
-    """Create an error HTTP response"""
+
+def body_etag(body):
+    """Strong ETag derived from a hash of the serialized body"""
+    return f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def conditional_response(event, response, etag=None):
+    """
+    Attach an ETag to a success response and honour If-None-Match.
+
+    When no ETag is given one is computed from the response body. Returns
+    a bodiless 304 Not Modified when the client already has this version,
+    otherwise the response compressed for the client's Accept-Encoding.
+    """
+    etag = etag or body_etag(response["body"])
+    response["headers"]["ETag"] = etag
+
+    if_none_match = get_header(event, "If-None-Match")
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison is used for If-None-Match
+        candidates = [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+        if "*" in candidates or etag in candidates:
+            return {
+                "statusCode": 304,
+                "headers": response["headers"],
+                "body": "",
+            }
+
+    return _compress(response, event)
+
+
+def create_error_response(status_code, error_type, message, retry_after=None):
+    """Create an error HTTP response (with Retry-After when given)"""
     error_response = {
         "error": error_type,
         "message": message,
         "status_code": status_code,
     }
 
-    return {
+    response = {
         "statusCode": status_code,
         "headers": {
             "Content-Type": "application/json",
@@ -63,43 +198,311 @@ def create_error_response(status_code, error_type, message):
             "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
             "Access-Control-Allow-Headers": (
                 "Content-Type,X-Amz-Date,Authorization,X-Api-Key,"
-                "X-Amz-Security-Token"
+                "X-Amz-Security-Token,If-Match,If-None-Match"
             ),
+            # Response headers browsers may read besides the CORS-safelisted ones
+            "Access-Control-Expose-Headers": "ETag,Retry-After,X-Consumed-Capacity",
         },
-        "body": json.dumps(error_response),
+        "body": _serialize(error_response),
     }
+    if retry_after is not None:
+        response["headers"]["Retry-After"] = str(retry_after)
+    return response
+
+
+# Maximum number of attributes accepted by the fields= query parameter
+MAX_PROJECTION_FIELDS = 20
+
+
+def parse_projection(query_params):
+    """
+    Build ProjectionExpression kwargs from the `fields` query parameter.
+
+    Returns (kwargs, error_response). `id` is always projected so results
+    can still be matched to their keys.
+    """
+    fields_param = (query_params or {}).get("fields")
+    if not fields_param:
+        return {}, None
+
+    fields = [f.strip() for f in fields_param.split(",") if f.strip()]
+    fields = list(dict.fromkeys(["id"] + fields))
+
+    if len(fields) > MAX_PROJECTION_FIELDS:
+        return None, create_error_response(
+            400,
+            "Bad Request",
+            f"Cannot request more than {MAX_PROJECTION_FIELDS} fields",
+        )
+
+    names = {f"#f{i}": field for i, field in enumerate(fields)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }, None
+
+
+# Maximum number of attribute filters accepted by a listing request
+MAX_FILTERS = 10
+
+
+def parse_filters(query_params):
+    """
+    Build FilterExpression kwargs from listing query parameters.
+
+    - `where.<attr>=value`: attribute equals value
+    - `prefix.<attr>=value`: attribute begins with value
+    - `created_from` / `created_to`: inclusive range on created_at
+
+    Filters that could not match values stored compressed (see
+    attributes.py) are rejected rather than silently missing items.
+
+    Returns (kwargs, context, error_response); context is a canonical
+    string of the filters used to bind pagination cursors to them.
+    """
+    conditions = []
+    names = {}
+    values = {}
+
+    def add(template, attr, value):
+        index = len(values)
+        names[f"#k{index}"] = attr
+        values[f":v{index}"] = value
+        conditions.append(template.format(name=f"#k{index}", value=f":v{index}"))
+
+    for key, value in sorted((query_params or {}).items()):
+        if key.startswith("where.") and key[6:]:
+            # Only strings of ATTRIBUTE_COMPRESSION_MIN_BYTES or more are
+            # compressed, so shorter values still compare exactly
+            if (
+                may_be_compressed(key[6:])
+                and len(value.encode("utf-8")) >= ATTRIBUTE_COMPRESSION_MIN_BYTES
+            ):
+                return None, None, create_error_response(
+                    400,
+                    "Bad Request",
+                    f"Filter values for '{key[6:]}' must be shorter than "
+                    f"{ATTRIBUTE_COMPRESSION_MIN_BYTES} bytes",
+                )
+            add("{name} = {value}", key[6:], value)
+        elif key.startswith("prefix.") and key[7:]:
+            # Long values are stored compressed and would never match
+            if may_be_compressed(key[7:]):
+                return None, None, create_error_response(
+                    400,
+                    "Bad Request",
+                    f"Prefix filters are not supported on '{key[7:]}' "
+                    "(long values are stored compressed)",
+                )
+            add("begins_with({name}, {value})", key[7:], value)
+        elif key == "created_from":
+            add("{name} >= {value}", "created_at", value)
+        elif key == "created_to":
+            add("{name} <= {value}", "created_at", value)
+
+    if len(conditions) > MAX_FILTERS:
+        return None, None, create_error_response(
+            400, "Bad Request", f"Cannot use more than {MAX_FILTERS} filters"
+        )
+    if not conditions:
+        return {}, "", None
+
+    context = "&".join(
+        f"{k}={v}"
+        for k, v in sorted((query_params or {}).items())
+        if k.startswith(("where.", "prefix.")) or k in ("created_from", "created_to")
+    )
+    return {
+        "FilterExpression": " AND ".join(conditions),
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }, context, None
+
+
+def get_header(event, name):
+    """Get a request header value (case-insensitive)"""
+    name = name.lower()
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def get_api_key(event):
+    """API key of a request (API Gateway identity, else the X-Api-Key header)"""
+    identity = (event.get("requestContext") or {}).get("identity") or {}
+    return identity.get("apiKey") or get_header(event, "X-Api-Key")
+
+
+def record_throttles(count=1, wait=0.0):
+    """Count throttled requests and return the Retry-After seconds to send"""
+    tracker = get_throttle_tracker()
+    tracker.record(count)
+    return tracker.retry_after(wait)
+
+
+def check_rate_limit(event):
+    """
+    Admit a request through the instance and API key token buckets.
+
+    Returns a 429 error response with Retry-After when the request is shed
+    (before any DynamoDB call), else None.
+    """
+    wait = get_rate_limiter().acquire(get_api_key(event))
+    if not wait:
+        return None
+    return create_error_response(
+        429,
+        "Too Many Requests",
+        "Request rate limit exceeded",
+        retry_after=record_throttles(wait=wait),
+    )
+
+
+def parse_if_match(event):
+    """
+    Parse the If-Match header into an expected item version.
+
+    Returns (version, error_response); version is None when the header
+    is absent or `*` (any existing item, which every write already
+    requires). Quoted and weak values (e.g. W/"3") are accepted. The hash
+    ETag of an item written before versioning (see item_etag) is returned
+    as its quoted string, to be checked with resolve_legacy_etag.
+    """
+    value = get_header(event, "If-Match")
+    if value is None:
+        return None, None
+
+    value = value.strip()
+    if value == "*":
+        return None, None
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    # Checked first: versions never have 32 digits, hashes may be all digits
+    if _HASH_ETAG.fullmatch(value):
+        return f'"{value}"', None
+    try:
+        return int(value), None
+    except ValueError:
+        pass
+    return None, create_error_response(
+        400, "Bad Request", "If-Match must be an item version number or ETag"
+    )
+
+
+def resolve_legacy_etag(item_id, etag):
+    """
+    Check an If-Match hash ETag against the stored item.
+
+    Items written before versioning have no `version`; their ETag hashes
+    id and updated_at and cannot be turned into a write condition. The
+    item is read and compared instead, and the write is then conditioned
+    on the updated_at that matched. Returns (updated_at, error_response).
+    """
+    item = get_table().get_item(
+        Key={"id": item_id},
+        ConsistentRead=True,
+        ProjectionExpression="#id, #version, #updated_at",
+        ExpressionAttributeNames={
+            "#id": "id",
+            "#version": "version",
+            "#updated_at": "updated_at",
+        },
+    ).get("Item")
+    if item is None:
+        return None, create_error_response(404, "Not Found", "Item not found")
+    if item_etag(item) != etag:
+        return None, create_error_response(
+            412, "Precondition Failed", "Item version does not match"
+        )
+    return item.get("updated_at"), None
+
+
+def describe_dynamodb_error(e):
+    """Map a DynamoDB ClientError to (status_code, error_type, message)"""
+    error_code = e.response["Error"]["Code"]
+    if error_code == "ConditionalCheckFailedException":
+        # With ReturnValuesOnConditionCheckFailure=ALL_OLD the existing item
+        # is returned, so a failed check on an existing item is a version
+        # mismatch rather than a missing item
+        if e.response.get("Item"):
+            return 412, "Precondition Failed", "Item version does not match"
+        return 404, "Not Found", "Item not found"
+    elif error_code == "TransactionCanceledException":
+        # Reasons are listed per transaction action; a failed condition on
+        # the item write is reported like a single-item conditional failure
+        reasons = e.response.get("CancellationReasons", [])
+        codes = [reason.get("Code") for reason in reasons]
+        for reason in reasons:
+            if reason.get("Code") == "ConditionalCheckFailed":
+                if reason.get("Item"):
+                    return 412, "Precondition Failed", "Item version does not match"
+                return 404, "Not Found", "Item not found"
+        if "TransactionConflict" in codes:
+            return 409, "Conflict", "Item is being modified by another request"
+        if THROTTLE_REASONS.intersection(codes):
+            return 429, "Too Many Requests", "Request rate limit exceeded"
+        return 500, "Internal Server Error", f"Database error: {error_code}"
+    elif error_code in THROTTLE_ERROR_CODES:
+        return 429, "Too Many Requests", "Request rate limit exceeded"
+    elif error_code == "ServiceUnavailable":
+        return 503, "Service Unavailable", "Service temporarily unavailable"
+    else:
+        return 500, "Internal Server Error", f"Database error: {error_code}"
 
 
 def handle_dynamodb_error(e):
     """Handle common DynamoDB errors"""
     # デバッグログを追加
     print(f"DynamoDB ClientError: {e.response}")
-    error_code = e.response["Error"]["Code"]
-    if error_code == "ProvisionedThroughputExceededException":
-        return create_error_response(
-            429, "Too Many Requests", "Request rate limit exceeded"
-        )
-    elif error_code == "ServiceUnavailable":
-        return create_error_response(
-            503, "Service Unavailable", "Service temporarily unavailable"
-        )
-    else:
-        return create_error_response(
-            500, "Internal Server Error", f"Database error: {error_code}"
-        )
+    status_code, error_type, message = describe_dynamodb_error(e)
+    retry_after = None
+    if status_code in RETRYABLE_STATUS_CODES:
+        retry_after = record_throttles()
+    return create_error_response(status_code, error_type, message, retry_after)
+
+
+def body_too_large(raw_body, max_bytes):
+    """Whether a request body is larger than max_bytes in UTF-8"""
+    if isinstance(raw_body, (bytes, bytearray)):
+        return len(raw_body) > max_bytes
+    # A character is 1 to 4 bytes; only encode when the length is ambiguous
+    if len(raw_body) > max_bytes:
+        return True
+    if len(raw_body) * 4 <= max_bytes:
+        return False
+    return len(raw_body.encode("utf-8")) > max_bytes
+
 
+def parse_json_body(event, max_bytes=None):
+    """
+    Parse and validate JSON body from event
 
-def parse_json_body(event):
-    """Parse and validate JSON body from event"""
+    Bodies over `max_bytes` (default MAX_BODY_BYTES) are rejected with 413
+    before they are parsed.
+    """
     if not event.get("body"):
         return None, create_error_response(
             400, "Bad Request", "Request body is required"
         )
 
+    max_bytes = MAX_BODY_BYTES if max_bytes is None else max_bytes
     try:
-        body = json.loads(event["body"])
+        raw_body = event["body"]
+        # Binary media types make API Gateway base64-encode request bodies
+        if event.get("isBase64Encoded"):
+            raw_body = base64.b64decode(raw_body)
+        if body_too_large(raw_body, max_bytes):
+            return None, create_error_response(
+                413,
+                "Payload Too Large",
+                f"Request body cannot exceed {max_bytes} bytes",
+            )
+        with timed("Parse"):
+            body = loads(raw_body)
         return body, None
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, ValueError):
         return None, create_error_response(
             400, "Bad Request", "Invalid JSON in request body"
         )
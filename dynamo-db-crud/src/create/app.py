@@ -4,19 +4,45 @@ from botocore.exceptions import ClientError
 
 # Import from Lambda Layer
 from utils import (
+    get_client,
     get_table,
+    get_table_name,
+    serialize_item,
     create_success_response,
     create_error_response,
+    check_rate_limit,
     handle_dynamodb_error,
+    record_throttles,
+    THROTTLE_ERROR_CODES,
     parse_json_body,
+    item_etag,
+    MAX_BATCH_BODY_BYTES,
+    MAX_BODY_BYTES,
 )
+from attributes import encode_item, stored_size
+from batch import batch_write_items
+from counters import add_to_counter, counter_update
+from indexes import CREATED_BUCKET_ATTR, created_bucket
+from metrics import instrument_handler
+from schema import get_item_schema
 
+# Maximum number of items accepted by a single batch create request
+MAX_BATCH_ITEMS = 1000
 
+
+@instrument_handler
 def lambda_handler(event, context):
     """
     Lambda function handler for creating items in DynamoDB
     """
     try:
+        # Shed load before any DynamoDB call
+        error_response = check_rate_limit(event)
+        if error_response:
+            return error_response
+
+        if (event.get("resource") or event.get("path", "")).endswith(":batch"):
+            return create_items_batch(event)
         return create_item(event)
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
@@ -25,41 +51,64 @@ def lambda_handler(event, context):
         )
 
 
+def build_item(body):
+    """Build a new item from a request body with generated id and timestamps"""
+    # Generate unique ID
+    item_id = str(uuid.uuid4())
+    now = datetime.utcnow().isoformat()
+
+    # Create item with timestamp
+    item = {
+        "id": item_id,
+        "name": body["name"],
+        "description": body.get("description", ""),
+        "created_at": now,
+        "updated_at": now,
+        "version": 1,
+        # Partition key of the time-ordered index
+        CREATED_BUCKET_ATTR: created_bucket(now),
+    }
+
+    # Add any additional fields from request
+    for key, value in body.items():
+        if key not in ["id", "created_at", "updated_at", "version", CREATED_BUCKET_ATTR]:
+            item[key] = value
+
+    return item
+
+
 def create_item(event):
     """Create a new item"""
     try:
-        table = get_table()
-
         # Parse request body
         body, error_response = parse_json_body(event)
         if error_response:
             return error_response
 
-        # Validate required fields
-        if not body.get("name"):
-            return create_error_response(400, "Bad Request", "Field 'name' is required")
+        # Validate types and attribute names before any DynamoDB call
+        fields, error = get_item_schema().validate(body)
+        if error:
+            return create_error_response(400, "Bad Request", error)
 
-        # Generate unique ID
-        item_id = str(uuid.uuid4())
+        item = build_item(fields)
 
-        # Create item with timestamp
-        item = {
-            "id": item_id,
-            "name": body["name"],
-            "description": body.get("description", ""),
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
-        }
-
-        # Add any additional fields from request
-        for key, value in body.items():
-            if key not in ["id", "created_at", "updated_at"]:
-                item[key] = value
-
-        # Put item in DynamoDB
-        table.put_item(Item=item)
+        # Put item in DynamoDB (long strings compressed) and count it in the
+        # same transaction
+        get_client().transact_write_items(
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": get_table_name(),
+                        "Item": serialize_item(encode_item(item)),
+                    }
+                },
+                counter_update(1),
+            ]
+        )
 
-        return create_success_response(201, item)
+        success_response = create_success_response(201, item, event)
+        success_response["headers"]["ETag"] = item_etag(item)
+        return success_response
 
     except ClientError as e:
         return handle_dynamodb_error(e)
@@ -68,3 +117,94 @@ def create_item(event):
         return create_error_response(
             500, "Internal Server Error", "Failed to create item"
         )
+
+
+def create_items_batch(event):
+    """Create multiple items with BatchWriteItem"""
+    try:
+        # Parse request body
+        body, error_response = parse_json_body(event, MAX_BATCH_BODY_BYTES)
+        if error_response:
+            return error_response
+
+        if not isinstance(body, list) or not body:
+            return create_error_response(
+                400, "Bad Request", "Request body must be a non-empty array of items"
+            )
+        if len(body) > MAX_BATCH_ITEMS:
+            return create_error_response(
+                400, "Bad Request", f"Batch cannot exceed {MAX_BATCH_ITEMS} items"
+            )
+
+        # Validate each entry and build the items to write
+        results = []
+        items = []
+        schema = get_item_schema()
+        for index, entry in enumerate(body):
+            fields, error = schema.validate(entry)
+            if not error and stored_size(fields) > MAX_BODY_BYTES:
+                error = f"Item cannot exceed {MAX_BODY_BYTES} bytes"
+            if error:
+                results.append({"index": index, "status": "failed", "error": error})
+                continue
+            item = build_item(fields)
+            items.append(item)
+            results.append({"index": index, "id": item["id"]})
+
+        write_results = (
+            batch_write_items(get_table(), [encode_item(item) for item in items])
+            if items
+            else {}
+        )
+
+        for result in results:
+            if "id" not in result:
+                continue
+            error = write_results.get(result["id"], "NotWritten")
+            if error is None:
+                result["status"] = "created"
+            else:
+                result["status"] = "failed"
+                result["error"] = error
+
+        failed = sum(1 for result in results if result["status"] == "failed")
+
+        # BatchWriteItem cannot join a transaction, so written items are
+        # counted afterwards; a failure here leaves drift for reconciliation
+        created = len(results) - failed
+        if created:
+            try:
+                add_to_counter(get_client(), created)
+            except ClientError as e:
+                print(f"Failed to update item counter by {created}: {str(e)}")
+
+        status_code = 201 if failed == 0 else 207
+
+        response = create_success_response(
+            status_code,
+            {
+                "results": results,
+                "succeeded": created,
+                "failed": failed,
+            },
+            event,
+        )
+
+        # Items left unprocessed or throttled can be retried; tell the client when
+        throttled = sum(
+            1
+            for result in results
+            if result.get("error") == "UnprocessedItems"
+            or result.get("error") in THROTTLE_ERROR_CODES
+        )
+        if throttled:
+            response["headers"]["Retry-After"] = str(record_throttles(throttled))
+        return response
+
+    except ClientError as e:
+        return handle_dynamodb_error(e)
+    except Exception as e:
+        print(f"Error creating items: {str(e)}")
+        return create_error_response(
+            500, "Internal Server Error", "Failed to create items"
+        )
@@ -2,23 +2,48 @@ from botocore.exceptions import ClientError
 
 # Import from Lambda Layer
 from utils import (
-    get_table,
+    get_client,
+    get_table_name,
     create_success_response,
     create_error_response,
+    check_rate_limit,
     handle_dynamodb_error,
+    describe_dynamodb_error,
+    record_throttles,
+    RETRYABLE_STATUS_CODES,
+    MAX_BATCH_BODY_BYTES,
+    parse_if_match,
+    resolve_legacy_etag,
+    parse_json_body,
 )
+from cache import get_item_cache
+from counters import add_to_counter, counter_update
+from fanout import fan_out
+from metrics import instrument_handler
 
+# Maximum number of items accepted by a single batch delete request
+MAX_BATCH_ITEMS = 500
 
+
+@instrument_handler
 def lambda_handler(event, context):
     """
     Lambda function handler for deleting items from DynamoDB
     """
     try:
+        # Shed load before any DynamoDB call
+        error_response = check_rate_limit(event)
+        if error_response:
+            return error_response
+
+        if (event.get("resource") or event.get("path", "")).endswith(":batchDelete"):
+            return delete_items_batch(event)
+
         # Get path parameters
         path_parameters = event.get("pathParameters") or {}
         item_id = path_parameters.get("id")
 
-        return delete_item(item_id)
+        return delete_item(event, item_id)
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
         return create_error_response(
@@ -26,24 +51,103 @@ def lambda_handler(event, context):
         )
 
 
-def delete_item(item_id):
-    """Delete an item by ID"""
+def delete_conditions(expected_version=None, expected_updated_at=None):
+    """
+    Condition arguments shared by single and batch deletes
+
+    `expected_updated_at` pins an item without `version` (see
+    utils.resolve_legacy_etag).
+    """
+    # Delete only if the item exists (and matches the expected version); the
+    # old item comes back on failure to tell 412 from 404
+    condition_kwargs = {
+        "ConditionExpression": "attribute_exists(id)",
+        "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+    }
+    if expected_version is not None:
+        condition_kwargs["ConditionExpression"] += " AND #version = :expected_version"
+        condition_kwargs["ExpressionAttributeNames"] = {"#version": "version"}
+        condition_kwargs["ExpressionAttributeValues"] = {
+            ":expected_version": {"N": str(expected_version)}
+        }
+    elif expected_updated_at is not None:
+        condition_kwargs["ConditionExpression"] += (
+            " AND attribute_not_exists(#version) AND #updated_at = :expected_updated_at"
+        )
+        condition_kwargs["ExpressionAttributeNames"] = {
+            "#version": "version",
+            "#updated_at": "updated_at",
+        }
+        condition_kwargs["ExpressionAttributeValues"] = {
+            ":expected_updated_at": {"S": expected_updated_at}
+        }
+    return condition_kwargs
+
+
+def delete_with_counter(item_id, expected_version=None, expected_updated_at=None):
+    """Delete one item and decrement the counter (raises ClientError)"""
+    # Delete item and decrement the counter in one transaction with the
+    # low-level client (no resource model to load)
     try:
-        table = get_table()
+        get_client().transact_write_items(
+            TransactItems=[
+                {
+                    "Delete": {
+                        "TableName": get_table_name(),
+                        "Key": {"id": {"S": item_id}},
+                        **delete_conditions(expected_version, expected_updated_at),
+                    }
+                },
+                counter_update(-1),
+            ]
+        )
+    finally:
+        # Reads may be served from this container's cache (FunctionMode=single)
+        get_item_cache().invalidate(item_id)
 
+
+def delete_without_counter(item_id, expected_version=None):
+    """
+    Delete one item with a plain conditional DeleteItem (raises ClientError)
+
+    Used by batch deletes, which decrement the counter once for all deleted
+    items: hundreds of concurrent transactions on the same few counter
+    shards would cancel each other with TransactionConflict.
+    """
+    try:
+        get_client().delete_item(
+            TableName=get_table_name(),
+            Key={"id": {"S": item_id}},
+            **delete_conditions(expected_version),
+        )
+    finally:
+        get_item_cache().invalidate(item_id)
+
+
+def delete_item(event, item_id):
+    """Delete an item by ID"""
+    try:
         if not item_id:
             return create_error_response(400, "Bad Request", "Item ID is required")
 
-        # Check if item exists before deleting
-        existing_response = table.get_item(Key={"id": item_id})
-        if "Item" not in existing_response:
-            return create_error_response(404, "Not Found", "Item not found")
+        expected_version, error_response = parse_if_match(event)
+        if error_response:
+            return error_response
 
-        # Delete item
-        table.delete_item(Key={"id": item_id})
+        # An ETag of an item without `version` is checked against the item
+        expected_updated_at = None
+        if isinstance(expected_version, str):
+            expected_updated_at, error_response = resolve_legacy_etag(
+                item_id, expected_version
+            )
+            if error_response:
+                return error_response
+            expected_version = None
+
+        delete_with_counter(item_id, expected_version, expected_updated_at)
 
         return create_success_response(
-            200, {"message": "Item deleted successfully", "id": item_id}
+            200, {"message": "Item deleted successfully", "id": item_id}, event
         )
 
     except ClientError as e:
@@ -53,3 +157,100 @@ def delete_item(item_id):
         return create_error_response(
             500, "Internal Server Error", "Failed to delete item"
         )
+
+
+def delete_items_batch(event):
+    """
+    Delete multiple items with one conditional DeleteItem per item
+
+    Entries are item ids or objects with `id` and optionally the expected
+    `version` (like If-Match). The deletes are independent and run
+    concurrently (see fanout.fan_out); the counter is decremented once
+    afterwards by the number of deleted items.
+    """
+    try:
+        # Parse request body
+        body, error_response = parse_json_body(event, MAX_BATCH_BODY_BYTES)
+        if error_response:
+            return error_response
+
+        if not isinstance(body, list) or not body:
+            return create_error_response(
+                400, "Bad Request", "Request body must be a non-empty array of ids"
+            )
+        if len(body) > MAX_BATCH_ITEMS:
+            return create_error_response(
+                400, "Bad Request", f"Batch cannot exceed {MAX_BATCH_ITEMS} items"
+            )
+
+        # Validate each entry
+        results = []
+        pending = []
+        calls = []
+        for index, entry in enumerate(body):
+            if isinstance(entry, str):
+                entry = {"id": entry}
+            error = None
+            if not isinstance(entry, dict) or not entry.get("id"):
+                error = "Field 'id' is required"
+            elif entry.get("version") is not None and (
+                not isinstance(entry["version"], int) or isinstance(entry["version"], bool)
+            ):
+                error = "Field 'version' must be an integer"
+            if error:
+                results.append(
+                    {"index": index, "status": "failed", "status_code": 400, "error": error}
+                )
+                continue
+            result = {"index": index, "id": entry["id"]}
+            results.append(result)
+            pending.append(result)
+            calls.append((str(entry["id"]), entry.get("version")))
+
+        for result, outcome in zip(pending, fan_out(delete_without_counter, calls)):
+            if isinstance(outcome, ClientError):
+                status_code, _, message = describe_dynamodb_error(outcome)
+                result.update(status="failed", status_code=status_code, error=message)
+            elif isinstance(outcome, Exception):
+                print(f"Error deleting item {result['id']}: {str(outcome)}")
+                result.update(
+                    status="failed", status_code=500, error="Failed to delete item"
+                )
+            else:
+                result["status"] = "deleted"
+
+        failed = sum(1 for result in results if result["status"] == "failed")
+        deleted = len(results) - failed
+        if deleted:
+            try:
+                add_to_counter(get_client(), -deleted)
+            except ClientError as e:
+                print(f"Failed to update item counter by {-deleted}: {str(e)}")
+
+        status_code = 200 if failed == 0 else 207
+
+        response = create_success_response(
+            status_code,
+            {
+                "results": results,
+                "succeeded": deleted,
+                "failed": failed,
+            },
+            event,
+        )
+
+        # Throttled entries can be retried; tell the client when
+        throttled = sum(
+            1
+            for result in results
+            if result.get("status_code") in RETRYABLE_STATUS_CODES
+        )
+        if throttled:
+            response["headers"]["Retry-After"] = str(record_throttles(throttled))
+        return response
+
+    except Exception as e:
+        print(f"Error deleting items: {str(e)}")
+        return create_error_response(
+            500, "Internal Server Error", "Failed to delete items"
+        )
@@ -1,26 +1,84 @@
 import json
+import os
+import random
+import re
+import time
+from datetime import datetime
 from botocore.exceptions import ClientError
 
 # Import from Lambda Layer
 from utils import (
+    get_dynamodb,
     get_table,
     create_success_response,
     create_error_response,
+    check_rate_limit,
+    record_throttles,
     handle_dynamodb_error,
+    parse_projection,
+    parse_filters,
+    conditional_response,
+    item_etag,
 )
+from attributes import decode_item, decode_items
+from batch import batch_get_items
+from cache import ITEM_CACHE_STATS_SAMPLE_RATE, get_item_cache
+from counters import read_count
+from cursor import decode_cursor, encode_cursor, is_key
+from indexes import (
+    CREATED_BUCKET_ATTR,
+    CREATED_INDEX,
+    NAME_INDEX,
+    created_bucket,
+    previous_bucket,
+)
+from metrics import instrument_handler
+from scan import parallel_scan
+
+# Maximum number of ids accepted by a single multi-get request
+MAX_GET_IDS = 500
+
+# Maximum number of segments for a parallel scan request
+MAX_SCAN_SEGMENTS = 16
+
+# Limits for filling a filtered listing page from several scan pages
+LIST_TIME_BUDGET_MS = int(os.environ.get("LIST_TIME_BUDGET_MS", "1000"))
+LIST_MAX_PAGES = int(os.environ.get("LIST_MAX_PAGES", "20"))
 
+# Months walked back by a newest-first query without created_from
+QUERY_MAX_BUCKETS = int(os.environ.get("QUERY_MAX_BUCKETS", "24"))
 
+# created_from / created_to must start with a "YYYY-MM" month
+TIMESTAMP_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])")
+
+
+@instrument_handler
 def lambda_handler(event, context):
     """
     Lambda function handler for reading items from DynamoDB
     """
     try:
+        # Shed load before any DynamoDB call
+        error_response = check_rate_limit(event)
+        if error_response:
+            return error_response
+
         # Get path parameters
         path_parameters = event.get("pathParameters") or {}
         item_id = path_parameters.get("id")
 
-        if item_id:
-            return get_item(item_id)
+        query_params = event.get("queryStringParameters") or {}
+
+        if event.get("resource") == "/items/count":
+            return get_item_count(event)
+        elif item_id:
+            return get_item(event, item_id)
+        elif query_params.get("ids"):
+            return get_items_by_ids(event)
+        elif query_params.get("segments"):
+            return get_all_items_parallel(event)
+        elif query_params.get("name") or query_params.get("order") == "newest":
+            return query_items(event)
         else:
             return get_all_items(event)
     except Exception as e:
@@ -31,10 +89,8 @@ def lambda_handler(event, context):
 
 
 def get_all_items(event):
-    """Get all items with optional pagination"""
+    """Get all items with optional filters and pagination"""
     try:
-        table = get_table()
-
         # Get query parameters
         query_params = event.get("queryStringParameters") or {}
         limit = int(query_params.get("limit", 50))
@@ -43,31 +99,80 @@ def get_all_items(event):
         if limit > 100:
             return create_error_response(400, "Bad Request", "Limit cannot exceed 100")
 
-        scan_kwargs = {"Limit": limit}
+        projection, error_response = parse_projection(query_params)
+        if error_response:
+            return error_response
+
+        filters, filter_context, error_response = parse_filters(query_params)
+        if error_response:
+            return error_response
+
+        scan_kwargs = {**projection, **filters}
+        scan_kwargs["ExpressionAttributeNames"] = {
+            **projection.get("ExpressionAttributeNames", {}),
+            **filters.get("ExpressionAttributeNames", {}),
+        }
+        if not scan_kwargs["ExpressionAttributeNames"]:
+            del scan_kwargs["ExpressionAttributeNames"]
 
         # Handle pagination
-        if query_params.get("last_key"):
+        last_key = None
+        if query_params.get("cursor"):
+            try:
+                last_key = decode_cursor(query_params["cursor"], filter_context)
+            except ValueError:
+                return create_error_response(400, "Bad Request", "Invalid cursor")
+            if not is_key(last_key):
+                return create_error_response(400, "Bad Request", "Invalid cursor")
+        elif query_params.get("last_key"):
+            # Raw keys from older clients
             try:
                 last_key = json.loads(query_params["last_key"])
-                scan_kwargs["ExclusiveStartKey"] = last_key
             except json.JSONDecodeError:
                 return create_error_response(
                     400, "Bad Request", "Invalid last_key format"
                 )
+            if not is_key(last_key):
+                return create_error_response(
+                    400, "Bad Request", "Invalid last_key format"
+                )
+
+        # Scan until the page is full, the table ends or the time budget runs
+        # out; a filtered scan can return far fewer items than it evaluates
+        items = []
+        pages = 0
+        deadline = time.monotonic() + LIST_TIME_BUDGET_MS / 1000
+        while True:
+            if last_key:
+                scan_kwargs["ExclusiveStartKey"] = last_key
+            # Never evaluate more than the remaining page size so the cursor
+            # does not skip items
+            scan_kwargs["Limit"] = limit - len(items)
+            response = get_table().scan(**scan_kwargs)
+            items.extend(decode_items(response["Items"]))
+            last_key = response.get("LastEvaluatedKey")
+            pages += 1
 
-        # Scan table
-        response = table.scan(**scan_kwargs)
+            if (
+                not last_key
+                or len(items) >= limit
+                or pages >= LIST_MAX_PAGES
+                or time.monotonic() >= deadline
+            ):
+                break
 
-        result = {"items": response["Items"], "count": len(response["Items"])}
+        result = {"items": items, "count": len(items)}
 
         # Add pagination info if there are more items
-        if "LastEvaluatedKey" in response:
-            result["last_key"] = response["LastEvaluatedKey"]
+        if last_key:
+            result["cursor"] = encode_cursor(last_key, filter_context)
+            # Deprecated: kept for clients that still page with last_key
+            result["last_key"] = last_key
             result["has_more"] = True
         else:
             result["has_more"] = False
 
-        return create_success_response(200, result)
+        return conditional_response(event, create_success_response(200, result))
 
     except ClientError as e:
         return handle_dynamodb_error(e)
@@ -78,21 +183,349 @@ def get_all_items(event):
         )
 
 
-def get_item(item_id):
-    """Get a single item by ID"""
+def query_items(event):
+    """
+    Query items through a global secondary index, newest first
+
+    `name` queries NameIndex; `order=newest` walks the monthly partitions of
+    CreatedAtIndex backwards. Both accept `created_from` / `created_to`.
+    """
+    try:
+        # Get query parameters
+        query_params = event.get("queryStringParameters") or {}
+        limit = int(query_params.get("limit", 50))
+
+        # Validate limit
+        if limit > 100:
+            return create_error_response(400, "Bad Request", "Limit cannot exceed 100")
+
+        created_from = query_params.get("created_from")
+        created_to = query_params.get("created_to")
+        for value in (created_from, created_to):
+            if value and not TIMESTAMP_PATTERN.match(value):
+                return create_error_response(
+                    400,
+                    "Bad Request",
+                    "created_from and created_to must be ISO 8601 timestamps",
+                )
+
+        projection, error_response = parse_projection(query_params)
+        if error_response:
+            return error_response
+
+        name = query_params.get("name")
+        cursor_context = f"query:{name or ''}:{created_from or ''}:{created_to or ''}"
+
+        # Key condition on the index sort key
+        names = {"#created_at": "created_at"} if created_from or created_to else {}
+        values = {}
+        if created_from and created_to:
+            range_condition = " AND #created_at BETWEEN :created_from AND :created_to"
+            values.update({":created_from": created_from, ":created_to": created_to})
+        elif created_from:
+            range_condition = " AND #created_at >= :created_from"
+            values[":created_from"] = created_from
+        elif created_to:
+            range_condition = " AND #created_at <= :created_to"
+            values[":created_to"] = created_to
+        else:
+            range_condition = ""
+
+        if name:
+            index_name, partition_attr = NAME_INDEX, "name"
+            bucket = floor = None
+        else:
+            index_name, partition_attr = CREATED_INDEX, CREATED_BUCKET_ATTR
+            bucket = created_bucket(created_to or datetime.utcnow().isoformat())
+            if created_from:
+                floor = created_bucket(created_from)
+            else:
+                floor = bucket
+                for _ in range(QUERY_MAX_BUCKETS - 1):
+                    floor = previous_bucket(floor)
+
+        # Handle pagination; the cursor holds the current month and its
+        # resume key
+        last_key = None
+        if query_params.get("cursor"):
+            try:
+                state = decode_cursor(query_params["cursor"], cursor_context)
+                bucket, floor, last_key = state["b"], state["f"], state["k"]
+            except (ValueError, KeyError, TypeError):
+                return create_error_response(400, "Bad Request", "Invalid cursor")
+            # Months are only tracked for order=newest (None for name queries);
+            # the key is None when the cursor starts at the top of a month
+            bucket_type = type(None) if name else str
+            if (
+                not isinstance(bucket, bucket_type)
+                or not isinstance(floor, bucket_type)
+                or (last_key is not None and not is_key(last_key))
+            ):
+                return create_error_response(400, "Bad Request", "Invalid cursor")
+
+        query_kwargs = {
+            "IndexName": index_name,
+            "KeyConditionExpression": f"#pk = :pk{range_condition}",
+            "ExpressionAttributeNames": {
+                "#pk": partition_attr,
+                **names,
+                **projection.get("ExpressionAttributeNames", {}),
+            },
+            "ScanIndexForward": False,
+        }
+        if projection:
+            query_kwargs["ProjectionExpression"] = projection["ProjectionExpression"]
+
+        # Query until the page is full, the last partition ends or the
+        # time budget runs out
+        items = []
+        pages = 0
+        done = False
+        deadline = time.monotonic() + LIST_TIME_BUDGET_MS / 1000
+        while True:
+            query_kwargs["ExpressionAttributeValues"] = {
+                ":pk": name or bucket,
+                **values,
+            }
+            if last_key:
+                query_kwargs["ExclusiveStartKey"] = last_key
+            else:
+                query_kwargs.pop("ExclusiveStartKey", None)
+            query_kwargs["Limit"] = limit - len(items)
+            response = get_table().query(**query_kwargs)
+            items.extend(decode_items(response["Items"]))
+            last_key = response.get("LastEvaluatedKey")
+            pages += 1
+
+            if not last_key:
+                # This partition is exhausted; move on to the previous month
+                if name or bucket <= floor:
+                    done = True
+                    break
+                bucket = previous_bucket(bucket)
+
+            if (
+                len(items) >= limit
+                or pages >= LIST_MAX_PAGES
+                or time.monotonic() >= deadline
+            ):
+                break
+
+        result = {"items": items, "count": len(items), "has_more": not done}
+        if not done:
+            result["cursor"] = encode_cursor(
+                {"b": bucket, "f": floor, "k": last_key}, cursor_context
+            )
+
+        return conditional_response(event, create_success_response(200, result))
+
+    except ClientError as e:
+        return handle_dynamodb_error(e)
+    except Exception as e:
+        print(f"Error querying items: {str(e)}")
+        return create_error_response(
+            500, "Internal Server Error", "Failed to retrieve items"
+        )
+
+
+def get_all_items_parallel(event):
+    """Get all items with a parallel segmented scan and per-segment cursors"""
+    try:
+        # Get query parameters
+        query_params = event.get("queryStringParameters") or {}
+        try:
+            total_segments = int(query_params["segments"])
+            workers = int(query_params.get("workers", total_segments))
+            limit = int(query_params.get("limit", 50))
+        except ValueError:
+            return create_error_response(
+                400, "Bad Request", "segments, workers and limit must be integers"
+            )
+
+        # Validate parameters
+        if not 1 <= total_segments <= MAX_SCAN_SEGMENTS:
+            return create_error_response(
+                400,
+                "Bad Request",
+                f"segments must be between 1 and {MAX_SCAN_SEGMENTS}",
+            )
+        if limit > 100:
+            return create_error_response(400, "Bad Request", "Limit cannot exceed 100")
+
+        # Handle resume of a partial scan; the cursor holds the resume key
+        # of every unfinished segment
+        cursors = None
+        cursor_context = f"segments={total_segments}"
+        if query_params.get("cursor"):
+            try:
+                cursors = {
+                    int(segment): key
+                    for segment, key in decode_cursor(
+                        query_params["cursor"], cursor_context
+                    ).items()
+                }
+            except (ValueError, AttributeError):
+                return create_error_response(400, "Bad Request", "Invalid cursor")
+            if not all(is_key(key) for key in cursors.values()):
+                return create_error_response(400, "Bad Request", "Invalid cursor")
+            if any(not 0 <= segment < total_segments for segment in cursors):
+                return create_error_response(
+                    400, "Bad Request", "Cursor segment out of range"
+                )
+
+        projection, error_response = parse_projection(query_params)
+        if error_response:
+            return error_response
+
+        # Scan one page of every segment
+        items, next_cursors = parallel_scan(
+            get_table(),
+            total_segments,
+            workers=workers,
+            cursors=cursors,
+            max_pages=1,
+            Limit=limit,
+            **projection,
+        )
+
+        items = decode_items(items)
+        result = {
+            "items": items,
+            "count": len(items),
+            "segments": total_segments,
+            "has_more": bool(next_cursors),
+        }
+        if next_cursors:
+            result["cursor"] = encode_cursor(
+                {str(segment): key for segment, key in next_cursors.items()},
+                cursor_context,
+            )
+
+        return conditional_response(event, create_success_response(200, result))
+
+    except ClientError as e:
+        return handle_dynamodb_error(e)
+    except Exception as e:
+        print(f"Error scanning items: {str(e)}")
+        return create_error_response(
+            500, "Internal Server Error", "Failed to retrieve items"
+        )
+
+
+def get_item_count(event):
+    """Get the number of items from the sharded counter"""
+    try:
+        count, unprocessed = read_count(get_dynamodb())
+        if unprocessed:
+            return create_error_response(
+                503,
+                "Service Unavailable",
+                "Item count temporarily unavailable",
+                retry_after=record_throttles(),
+            )
+
+        return conditional_response(
+            event, create_success_response(200, {"count": count})
+        )
+
+    except ClientError as e:
+        return handle_dynamodb_error(e)
+    except Exception as e:
+        print(f"Error counting items: {str(e)}")
+        return create_error_response(
+            500, "Internal Server Error", "Failed to count items"
+        )
+
+
+def get_items_by_ids(event):
+    """Get multiple items by ID, preserving the requested order"""
     try:
-        table = get_table()
+        query_params = event.get("queryStringParameters") or {}
+        ids = [i.strip() for i in query_params["ids"].split(",") if i.strip()]
+        ids = list(dict.fromkeys(ids))
+
+        if not ids:
+            return create_error_response(400, "Bad Request", "Item IDs are required")
+        if len(ids) > MAX_GET_IDS:
+            return create_error_response(
+                400, "Bad Request", f"Cannot request more than {MAX_GET_IDS} ids"
+            )
+
+        projection, error_response = parse_projection(query_params)
+        if error_response:
+            return error_response
 
+        found, unprocessed = batch_get_items(get_table(), ids, **projection)
+
+        items = [decode_item(found[item_id]) for item_id in ids if item_id in found]
+        missing = [
+            item_id
+            for item_id in ids
+            if item_id not in found and item_id not in unprocessed
+        ]
+
+        result = {"items": items, "count": len(items), "missing": missing}
+        if unprocessed:
+            result["unprocessed"] = unprocessed
+
+        return conditional_response(event, create_success_response(200, result))
+
+    except ClientError as e:
+        return handle_dynamodb_error(e)
+    except Exception as e:
+        print(f"Error getting items by ids: {str(e)}")
+        return create_error_response(
+            500, "Internal Server Error", "Failed to retrieve items"
+        )
+
+
+def get_item(event, item_id):
+    """Get a single item by ID"""
+    try:
         if not item_id:
             return create_error_response(400, "Bad Request", "Item ID is required")
 
-        # Get item from DynamoDB
-        response = table.get_item(Key={"id": item_id})
+        query_params = event.get("queryStringParameters") or {}
+        projection, error_response = parse_projection(query_params)
+        if error_response:
+            return error_response
+
+        cache = get_item_cache()
+        consistent = query_params.get("consistent", "").lower() == "true"
+
+        # Serve from the warm-container cache unless a consistent read is requested
+        hit = False
+        if not consistent:
+            hit, item = cache.get(item_id)
+
+        if not hit:
+            # Projected misses read only the requested attributes and are
+            # not cached, so fields= keeps reducing read capacity
+            response = get_table().get_item(
+                Key={"id": item_id}, ConsistentRead=consistent, **projection
+            )
+            item = decode_item(response.get("Item"))
+            if not projection:
+                cache.put(item_id, item)
 
-        if "Item" not in response:
+        if (
+            cache.enabled
+            and ITEM_CACHE_STATS_SAMPLE_RATE > 0
+            and random.uniform(0, 100) < ITEM_CACHE_STATS_SAMPLE_RATE
+        ):
+            print(f"Item cache stats: {cache.stats()}")
+
+        if item is None:
             return create_error_response(404, "Not Found", "Item not found")
 
-        return create_success_response(200, response["Item"])
+        # Projected representations are tagged by a hash of their body
+        etag = None if projection else item_etag(item)
+
+        if projection and hit:
+            fields = projection["ExpressionAttributeNames"].values()
+            item = {field: item[field] for field in fields if field in item}
+
+        return conditional_response(event, create_success_response(200, item), etag)
 
     except ClientError as e:
         return handle_dynamodb_error(e)
@@ -6,16 +6,42 @@ from utils import (
     get_table,
     create_success_response,
     create_error_response,
+    check_rate_limit,
     handle_dynamodb_error,
+    describe_dynamodb_error,
+    record_throttles,
+    RETRYABLE_STATUS_CODES,
     parse_json_body,
+    parse_if_match,
+    resolve_legacy_etag,
+    item_etag,
+    MAX_BATCH_BODY_BYTES,
+    MAX_BODY_BYTES,
 )
+from attributes import decode_item, encode_value, stored_size
+from cache import get_item_cache
+from fanout import fan_out
+from metrics import instrument_handler
+from schema import get_item_schema, placeholders
 
+# Maximum number of items accepted by a single batch update request
+MAX_BATCH_ITEMS = 500
 
+
+@instrument_handler
 def lambda_handler(event, context):
     """
     Lambda function handler for updating items in DynamoDB
     """
     try:
+        # Shed load before any DynamoDB call
+        error_response = check_rate_limit(event)
+        if error_response:
+            return error_response
+
+        if (event.get("resource") or event.get("path", "")).endswith(":batchUpdate"):
+            return update_items_batch(event)
+
         # Get path parameters
         path_parameters = event.get("pathParameters") or {}
         item_id = path_parameters.get("id")
@@ -28,11 +54,69 @@ def lambda_handler(event, context):
         )
 
 
+def build_update_expression(fields, expected_version=None, expected_updated_at=None):
+    """
+    Build the UpdateItem expressions for validated fields (see schema.py)
+
+    Attribute names and values get positional placeholders (#a0, :v0, ...)
+    so any valid attribute name is safe in the expression.
+    `expected_updated_at` pins an item without `version` (see
+    utils.resolve_legacy_etag).
+    """
+    assignments = ["#updated_at = :updated_at"]
+    expression_values = {":updated_at": datetime.utcnow().isoformat()}
+    expression_names = {"#updated_at": "updated_at"}
+
+    for index, (key, value) in enumerate(fields.items()):
+        name, value_name, assignment = placeholders(index)
+        assignments.append(assignment)
+        expression_values[value_name] = encode_value(key, value)
+        expression_names[name] = key
+
+    # Increment the item version on every write
+    update_expression = "SET " + ", ".join(assignments)
+    update_expression += " ADD #version :version_increment"
+    expression_values[":version_increment"] = 1
+    expression_names["#version"] = "version"
+
+    # Update only if the item exists (and matches If-Match when given)
+    condition_expression = "attribute_exists(id)"
+    if expected_version is not None:
+        condition_expression += " AND #version = :expected_version"
+        expression_values[":expected_version"] = expected_version
+    elif expected_updated_at is not None:
+        condition_expression += (
+            " AND attribute_not_exists(#version) AND #updated_at = :expected_updated_at"
+        )
+        expression_values[":expected_updated_at"] = expected_updated_at
+
+    return {
+        "UpdateExpression": update_expression,
+        "ConditionExpression": condition_expression,
+        "ExpressionAttributeValues": expression_values,
+        "ExpressionAttributeNames": expression_names,
+    }
+
+
+def apply_update(item_id, fields, expected_version=None, expected_updated_at=None):
+    """Update one item and return its new attributes (raises ClientError)"""
+    try:
+        response = get_table().update_item(
+            Key={"id": item_id},
+            ReturnValues="ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            **build_update_expression(fields, expected_version, expected_updated_at),
+        )
+    finally:
+        # The router serves reads from the same container (FunctionMode=single);
+        # a failed condition also means the cached copy may be out of date
+        get_item_cache().invalidate(item_id)
+    return decode_item(response["Attributes"])
+
+
 def update_item(event, item_id):
     """Update an existing item"""
     try:
-        table = get_table()
-
         if not item_id:
             return create_error_response(400, "Bad Request", "Item ID is required")
 
@@ -41,35 +125,30 @@ def update_item(event, item_id):
         if error_response:
             return error_response
 
-        # Check if item exists
-        existing_response = table.get_item(Key={"id": item_id})
-        if "Item" not in existing_response:
-            return create_error_response(404, "Not Found", "Item not found")
-
-        # Build update expression
-        update_expression = "SET #updated_at = :updated_at"
-        expression_values = {":updated_at": datetime.utcnow().isoformat()}
-        expression_names = {"#updated_at": "updated_at"}
-
-        # Add fields to update (excluding id, created_at)
-        for key, value in body.items():
-            if key not in ["id", "created_at"]:
-                expression_key = f"#{key}"
-                expression_value_key = f":{key}"
-                update_expression += f", {expression_key} = {expression_value_key}"
-                expression_values[expression_value_key] = value
-                expression_names[expression_key] = key
+        expected_version, error_response = parse_if_match(event)
+        if error_response:
+            return error_response
 
-        # Update item
-        response = table.update_item(
-            Key={"id": item_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values,
-            ExpressionAttributeNames=expression_names,
-            ReturnValues="ALL_NEW",
-        )
+        # Validate types and attribute names before any DynamoDB call
+        fields, error = get_item_schema().validate(body, partial=True)
+        if error:
+            return create_error_response(400, "Bad Request", error)
 
-        return create_success_response(200, response["Attributes"])
+        # An ETag of an item without `version` is checked against the item
+        expected_updated_at = None
+        if isinstance(expected_version, str):
+            expected_updated_at, error_response = resolve_legacy_etag(
+                item_id, expected_version
+            )
+            if error_response:
+                return error_response
+            expected_version = None
+
+        # Update item
+        item = apply_update(item_id, fields, expected_version, expected_updated_at)
+        success_response = create_success_response(200, item, event)
+        success_response["headers"]["ETag"] = item_etag(item)
+        return success_response
 
     except ClientError as e:
         return handle_dynamodb_error(e)
@@ -78,3 +157,95 @@ def update_item(event, item_id):
         return create_error_response(
             500, "Internal Server Error", "Failed to update item"
         )
+
+
+def update_items_batch(event):
+    """
+    Update multiple items with one UpdateItem per item
+
+    Each entry holds the item `id`, the fields to set and optionally the
+    expected `version` (like If-Match). The writes are independent and run
+    concurrently (see fanout.fan_out).
+    """
+    try:
+        # Parse request body
+        body, error_response = parse_json_body(event, MAX_BATCH_BODY_BYTES)
+        if error_response:
+            return error_response
+
+        if not isinstance(body, list) or not body:
+            return create_error_response(
+                400, "Bad Request", "Request body must be a non-empty array of items"
+            )
+        if len(body) > MAX_BATCH_ITEMS:
+            return create_error_response(
+                400, "Bad Request", f"Batch cannot exceed {MAX_BATCH_ITEMS} items"
+            )
+
+        # Validate each entry
+        results = []
+        pending = []
+        calls = []
+        schema = get_item_schema()
+        for index, entry in enumerate(body):
+            error = fields = None
+            if not isinstance(entry, dict) or not entry.get("id"):
+                error = "Field 'id' is required"
+            elif entry.get("version") is not None and (
+                not isinstance(entry["version"], int) or isinstance(entry["version"], bool)
+            ):
+                error = "Field 'version' must be an integer"
+            else:
+                fields, error = schema.validate(entry, partial=True)
+                if not error and stored_size(fields) > MAX_BODY_BYTES:
+                    error = f"Item cannot exceed {MAX_BODY_BYTES} bytes"
+            if error:
+                results.append(
+                    {"index": index, "status": "failed", "status_code": 400, "error": error}
+                )
+                continue
+            result = {"index": index, "id": entry["id"]}
+            results.append(result)
+            pending.append(result)
+            calls.append((str(entry["id"]), fields, entry.get("version")))
+
+        for result, outcome in zip(pending, fan_out(apply_update, calls)):
+            if isinstance(outcome, ClientError):
+                status_code, _, message = describe_dynamodb_error(outcome)
+                result.update(status="failed", status_code=status_code, error=message)
+            elif isinstance(outcome, Exception):
+                print(f"Error updating item {result['id']}: {str(outcome)}")
+                result.update(
+                    status="failed", status_code=500, error="Failed to update item"
+                )
+            else:
+                result.update(status="updated", version=outcome["version"])
+
+        failed = sum(1 for result in results if result["status"] == "failed")
+        status_code = 200 if failed == 0 else 207
+
+        response = create_success_response(
+            status_code,
+            {
+                "results": results,
+                "succeeded": len(results) - failed,
+                "failed": failed,
+            },
+            event,
+        )
+
+        # Throttled entries can be retried; tell the client when
+        throttled = sum(
+            1
+            for result in results
+            if result.get("status_code") in RETRYABLE_STATUS_CODES
+        )
+        if throttled:
+            response["headers"]["Retry-After"] = str(record_throttles(throttled))
+        return response
+
+    except Exception as e:
+        print(f"Error updating items: {str(e)}")
+        return create_error_response(
+            500, "Internal Server Error", "Failed to update items"
+        )
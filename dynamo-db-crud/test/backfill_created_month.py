@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+CreatedAtIndex の追加前に作られたアイテムへ created_month を書き込むCLI
+（DynamoDB Local・ステージング・本番向け）
+
+created_month がなく created_at があるアイテムを並列スキャンで探し、
+created_at から求めた月を条件付きの UpdateItem で書き込みます
+created_month は ETag・version・updated_at に含まれないため、クライアントの
+If-Match は無効になりません
+途中で止めても、再実行すると残りのアイテムだけが更新されます
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_common import setup_local_env
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="created_month のバックフィル")
+    parser.add_argument("--segments", type=int, default=8, help="スキャンのセグメント数")
+    parser.add_argument("--table", help="テーブル名（既定は TABLE_NAME）")
+    parser.add_argument(
+        "--endpoint-url",
+        help="DynamoDBのエンドポイント（既定はDynamoDB Local、'' でAWSの既定エンドポイント）",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="対象の件数の表示のみ")
+    return parser.parse_args(argv)
+
+
+def configure(args):
+    """Layerを読み込む前に環境変数を設定"""
+    if args.table:
+        os.environ["TABLE_NAME"] = args.table
+    if args.endpoint_url is not None:
+        os.environ["DYNAMODB_ENDPOINT_URL"] = args.endpoint_url
+    os.environ.setdefault("DYNAMODB_MAX_POOL_CONNECTIONS", str(args.segments))
+    os.environ.setdefault("METRICS_ENABLED", "false")
+    setup_local_env()
+    if os.environ.get("DYNAMODB_ENDPOINT_URL") == "":
+        del os.environ["DYNAMODB_ENDPOINT_URL"]
+
+
+def backfill_segment(table, segment, total_segments, dry_run=False):
+    """1セグメント分のアイテムに created_month を書き込み、(更新, スキップ) 件数を返す"""
+    from botocore.exceptions import ClientError
+    from indexes import CREATED_BUCKET_ATTR, created_bucket
+    from scan import iter_scan_pages
+
+    updated = skipped = 0
+    pages = iter_scan_pages(
+        table,
+        segment,
+        total_segments,
+        FilterExpression="attribute_not_exists(#m) AND attribute_exists(created_at)",
+        ProjectionExpression="id, created_at",
+        ExpressionAttributeNames={"#m": CREATED_BUCKET_ATTR},
+    )
+    for items, _ in pages:
+        for item in items:
+            if dry_run:
+                updated += 1
+                continue
+            try:
+                table.update_item(
+                    Key={"id": item["id"]},
+                    UpdateExpression="SET #m = :m",
+                    # 削除済み・並行して書き込まれたアイテムは触らない
+                    ConditionExpression="attribute_exists(id) AND attribute_not_exists(#m)",
+                    ExpressionAttributeNames={"#m": CREATED_BUCKET_ATTR},
+                    ExpressionAttributeValues={":m": created_bucket(item["created_at"])},
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                skipped += 1
+    return updated, skipped
+
+
+def main():
+    args = parse_args()
+    configure(args)
+
+    from utils import get_table
+
+    table = get_table()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        results = list(
+            executor.map(
+                lambda segment: backfill_segment(
+                    table, segment, args.segments, args.dry_run
+                ),
+                range(args.segments),
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    updated = sum(u for u, _ in results)
+    skipped = sum(s for _, s in results)
+    label = "対象" if args.dry_run else "更新"
+    print(f"{label}: {updated} 件, スキップ: {skipped} 件 ({elapsed:.2f} 秒)")
+
+
+if __name__ == "__main__":
+    main()
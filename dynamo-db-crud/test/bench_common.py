@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local向けベンチマーク用の共通ヘルパー
+Lambda関数のハンドラーを直接読み込んで呼び出します
+"""
+import importlib.util
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAYER_DIR = os.path.join(BASE_DIR, "layers", "common-layer", "python")
+SRC_DIR = os.path.join(BASE_DIR, "src")
+
+DYNAMODB_LOCAL_ENDPOINT = "http://localhost:8000"
+TABLE_NAME = "local-items-dev"
+COUNTER_TABLE_NAME = "local-counters-dev"
+CURSOR_SECRET = "local-cursor-secret-dev"
+
+
+def setup_local_env():
+    """DynamoDB Local用の環境変数とLayerのパスを設定"""
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "dummy")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "dummy")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("TABLE_NAME", TABLE_NAME)
+    os.environ.setdefault("COUNTER_TABLE_NAME", COUNTER_TABLE_NAME)
+    os.environ.setdefault("CURSOR_SECRET", CURSOR_SECRET)
+    os.environ.setdefault("DYNAMODB_ENDPOINT_URL", DYNAMODB_LOCAL_ENDPOINT)
+    if LAYER_DIR not in sys.path:
+        sys.path.insert(0, LAYER_DIR)
+
+
+def get_local_table():
+    """DynamoDB LocalのTableリソースを作成"""
+    setup_local_env()
+    from clients import create_dynamodb_resource
+
+    dynamodb = create_dynamodb_resource(
+        endpoint_url=os.environ["DYNAMODB_ENDPOINT_URL"],
+        region_name=os.environ["AWS_DEFAULT_REGION"],
+    )
+    return dynamodb.Table(os.environ["TABLE_NAME"])
+
+
+def load_handler(name):
+    """src/<name>/app.py をモジュールとして読み込む"""
+    setup_local_env()
+    path = os.path.join(SRC_DIR, name, "app.py")
+    spec = importlib.util.spec_from_file_location(f"{name}_app", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_event(method, path, body=None, path_parameters=None, query=None,
+               resource=None, headers=None):
+    """API Gatewayのプロキシイベントを生成"""
+    return {
+        "httpMethod": method,
+        "path": path,
+        "resource": resource or path,
+        "headers": {"Content-Type": "application/json", **(headers or {})},
+        "body": json.dumps(body) if body is not None else None,
+        "queryStringParameters": query,
+        "pathParameters": path_parameters,
+        "requestContext": {"httpMethod": method, "path": path},
+    }
+
+
+def print_result(label, count, elapsed):
+    """件数と経過時間からスループットを表示"""
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"{label:<30} {count:>8} 件 {elapsed:>8.2f} 秒 {rate:>10.1f} 件/秒")
+    return rate
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+属性圧縮のマイクロベンチマーク
+description のサイズごとに attributes.encode_item / decode_item のCPU時間と
+保存サイズ・書き込み/読み込みキャパシティユニットの見積もりを、圧縮なしと比較します
+
+--db を指定するとDynamoDB Localに実際に書き込み、ConsumedCapacity も表示します
+（それ以外はDynamoDB Local不要）
+"""
+import argparse
+import math
+import random
+import string
+import time
+import uuid
+from datetime import datetime
+
+from bench_common import get_local_table, setup_local_env
+
+setup_local_env()
+
+from attributes import decode_item, encode_item, stored_size  # noqa: E402
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog item price stock order customer "
+    "shipping delivery warehouse review rating color size weight material "
+    "available discount season limited edition product description"
+).split()
+
+
+def build_text(size, kind, rng):
+    """size バイト程度の本文（words: 自然文に近い / random: 圧縮しにくい）"""
+    if kind == "random":
+        return "".join(rng.choices(string.ascii_letters + string.digits, k=size))
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[:size]
+
+
+def build_item(size, kind, rng):
+    now = datetime.utcnow().isoformat()
+    return {
+        "id": str(uuid.uuid4()),
+        "name": "Compression Benchmark",
+        "description": build_text(size, kind, rng),
+        "created_at": now,
+        "updated_at": now,
+        "created_month": now[:7],
+        "version": 1,
+    }
+
+
+def per_call_us(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def consumed(table, item):
+    """(PutItemのWCU, 強い整合性のGetItemのRCU)"""
+    put = table.put_item(Item=item, ReturnConsumedCapacity="TOTAL")
+    get = table.get_item(
+        Key={"id": item["id"]}, ConsistentRead=True, ReturnConsumedCapacity="TOTAL"
+    )
+    table.delete_item(Key={"id": item["id"]})
+    return (
+        put["ConsumedCapacity"]["CapacityUnits"],
+        get["ConsumedCapacity"]["CapacityUnits"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="属性圧縮マイクロベンチマーク")
+    parser.add_argument("--sizes", default="1,4,16,64,256", help="description のサイズ（KB）")
+    parser.add_argument("--text", choices=["words", "random"], default="words")
+    parser.add_argument("--repeat", type=int, default=200, help="繰り返し回数")
+    parser.add_argument("--db", action="store_true", help="DynamoDB Localで消費キャパシティを計測")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    table = get_local_table() if args.db else None
+
+    print(f"属性圧縮ベンチマーク (text={args.text})")
+    print("=" * 86)
+    print(
+        f"{'KB':>4} {'raw B':>9} {'stored B':>9} {'saved':>7} {'WCU':>9} {'RCU':>9} "
+        f"{'encode µs':>10} {'decode µs':>10}"
+    )
+    for kb in [int(s) for s in args.sizes.split(",")]:
+        item = build_item(kb * 1024, args.text, rng)
+        encoded = encode_item(item)
+        raw_size = stored_size(item)
+        size = stored_size(encoded)
+        encode_us = per_call_us(lambda: encode_item(item), args.repeat)
+        decode_us = per_call_us(lambda: decode_item(encoded), args.repeat)
+        assert decode_item(encoded) == item
+
+        # 見積もり: 書き込みは1KB、強い整合性の読み込みは4KB単位
+        wcu = f"{math.ceil(raw_size / 1024)}->{math.ceil(size / 1024)}"
+        rcu = f"{math.ceil(raw_size / 4096)}->{math.ceil(size / 4096)}"
+        print(
+            f"{kb:>4} {raw_size:>9} {size:>9} {1 - size / raw_size:>7.1%} {wcu:>9} "
+            f"{rcu:>9} {encode_us:>10.1f} {decode_us:>10.1f}"
+        )
+        if table is not None and raw_size < 400 * 1024:
+            raw_wcu, raw_rcu = consumed(table, item)
+            enc_wcu, enc_rcu = consumed(table, encoded)
+            print(
+                f"{'':>4} DynamoDB Local ConsumedCapacity: "
+                f"put {raw_wcu:g}->{enc_wcu:g}  get {raw_rcu:g}->{enc_rcu:g}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用のバッチ作成ベンチマーク
+1件ずつのput_item (POST /items) と BatchWriteItem (POST /items:batch) の
+スループット（件/秒）を比較します
+"""
+import argparse
+import json
+import time
+
+from bench_common import load_handler, make_event, print_result
+
+
+def bench_single(create_app, count):
+    """1リクエスト1件の作成を計測"""
+    start = time.perf_counter()
+    for i in range(count):
+        event = make_event("POST", "/items", body={"name": f"single-{i}"})
+        response = create_app.lambda_handler(event, None)
+        if response["statusCode"] != 201:
+            print(f"作成失敗: {response['body']}")
+    return time.perf_counter() - start
+
+
+def bench_batch(create_app, count, batch_size):
+    """POST /items:batch による一括作成を計測"""
+    start = time.perf_counter()
+    failed = 0
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        body = [{"name": f"batch-{offset + i}"} for i in range(size)]
+        event = make_event("POST", "/items:batch", body=body)
+        response = create_app.lambda_handler(event, None)
+        failed += json.loads(response["body"]).get("failed", 0)
+    if failed:
+        print(f"失敗件数: {failed}")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="バッチ作成ベンチマーク")
+    parser.add_argument("--count", type=int, default=2000, help="作成件数")
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="1リクエストあたりの件数"
+    )
+    args = parser.parse_args()
+
+    create_app = load_handler("create")
+
+    print("DynamoDB Local バッチ作成ベンチマーク")
+    print("=" * 50)
+    single_rate = print_result(
+        "put_item (1件/リクエスト)", args.count, bench_single(create_app, args.count)
+    )
+    batch_rate = print_result(
+        f"batch ({args.batch_size}件/リクエスト)",
+        args.count,
+        bench_batch(create_app, args.count, args.batch_size),
+    )
+    if single_rate:
+        print(f"速度比: {batch_rate / single_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+コールドスタートのベンチマーク
+各 src/*/app.py を新しいPythonプロセスで読み込み、
+モジュールのimport時間と最初の呼び出し時間を計測します
+
+--mode validation: DBにアクセスしない400系リクエスト（DynamoDB Local不要）
+--mode db:         DynamoDB Localにアクセスするリクエスト
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from bench_common import LAYER_DIR, SRC_DIR, make_event, setup_local_env
+
+FUNCTIONS = ["create", "read", "update", "delete"]
+
+# 新しいプロセスで実行する計測コード
+CHILD_CODE = """
+import json, sys, time
+start = time.perf_counter()
+sys.path[:0] = [{layer!r}, {src!r}]
+import app
+imported = time.perf_counter()
+response = app.lambda_handler(json.loads({event!r}), None)
+invoked = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "first_invoke_ms": (invoked - imported) * 1000,
+    "status_code": response["statusCode"],
+}}))
+"""
+
+
+def build_event(name, mode):
+    """関数ごとの計測用イベント"""
+    missing_id = "cold-start-missing-id"
+    if mode == "validation":
+        return {
+            "create": make_event("POST", "/items"),
+            "read": make_event("GET", "/items", query={"limit": "1000"}),
+            "update": make_event("PUT", "/items", body={"name": "x"}),
+            "delete": make_event("DELETE", "/items"),
+        }[name]
+    return {
+        "create": make_event("POST", "/items", body={"name": "cold-start"}),
+        "read": make_event("GET", "/items", query={"limit": "1"}),
+        "update": make_event(
+            "PUT",
+            f"/items/{missing_id}",
+            body={"name": "x"},
+            path_parameters={"id": missing_id},
+        ),
+        "delete": make_event(
+            "DELETE", f"/items/{missing_id}", path_parameters={"id": missing_id}
+        ),
+    }[name]
+
+
+def run_once(name, mode):
+    """新しいプロセスで1回計測"""
+    code = CHILD_CODE.format(
+        layer=LAYER_DIR,
+        src=os.path.join(SRC_DIR, name),
+        event=json.dumps(build_event(name, mode)),
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+        check=True,
+    )
+    # ハンドラーのログ出力の後に計測結果が出力される
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="コールドスタートベンチマーク")
+    parser.add_argument("--mode", choices=["validation", "db"], default="validation")
+    parser.add_argument("--runs", type=int, default=10, help="関数ごとの計測回数")
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--baseline", help="比較対象の結果JSONファイル")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.2, help="許容する悪化率（0.2 = 20%%）"
+    )
+    args = parser.parse_args()
+
+    setup_local_env()
+
+    print(f"コールドスタート ベンチマーク (mode={args.mode}, runs={args.runs})")
+    print("=" * 60)
+    results = {}
+    for name in FUNCTIONS:
+        runs = [run_once(name, args.mode) for _ in range(args.runs)]
+        results[name] = {
+            "import_ms": statistics.median(r["import_ms"] for r in runs),
+            "first_invoke_ms": statistics.median(r["first_invoke_ms"] for r in runs),
+            "status_code": runs[-1]["status_code"],
+        }
+        r = results[name]
+        print(
+            f"{name:<8} import {r['import_ms']:>8.1f} ms  "
+            f"first invoke {r['first_invoke_ms']:>8.1f} ms  (status {r['status_code']})"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"mode": args.mode, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = []
+        for name, r in results.items():
+            for metric in ("import_ms", "first_invoke_ms"):
+                before = baseline.get(name, {}).get(metric)
+                if before and r[metric] > before * (1 + args.max_regression):
+                    regressions.append(f"{name}.{metric}: {before:.1f} -> {r[metric]:.1f} ms")
+        if regressions:
+            print("❌ コールドスタートの悪化を検出しました")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✅ ベースラインからの悪化はありません")
+
+
+if __name__ == "__main__":
+    main()
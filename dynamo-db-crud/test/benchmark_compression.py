@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+レスポンス圧縮のマイクロベンチマーク
+ペイロードサイズごとに gzip / brotli の圧縮CPU時間と削減バイト数を計測し、
+COMPRESSION_MIN_BYTES のしきい値調整に使います（DynamoDB Localは不要）
+"""
+import argparse
+import gzip
+import json
+import time
+import uuid
+from datetime import datetime
+
+from bench_common import setup_local_env
+
+setup_local_env()
+
+from compression import brotli  # noqa: E402
+
+
+def build_page(count):
+    """一覧ページ相当のJSONボディを生成"""
+    now = datetime.utcnow().isoformat()
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Item {i}",
+            "description": f"This is the description of item number {i}",
+            "category": ["books", "music", "games"][i % 3],
+            "price": i * 1.25,
+            "created_at": now,
+            "updated_at": now,
+            "version": 1,
+        }
+        for i in range(count)
+    ]
+    return json.dumps({"items": items, "count": count, "has_more": True}).encode()
+
+
+def codecs():
+    """計測対象の圧縮方式"""
+    result = {f"gzip-{level}": (lambda d, l=level: gzip.compress(d, l, mtime=0))
+              for level in (1, 5, 9)}
+    if brotli:
+        for quality in (1, 4, 8):
+            result[f"br-{quality}"] = lambda d, q=quality: brotli.compress(d, quality=q)
+    return result
+
+
+def bench(data, compress, repeat):
+    """(圧縮後バイト数, 1回あたりのマイクロ秒) を返す"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compress(data)
+    elapsed = time.perf_counter() - start
+    return len(compressed), elapsed / repeat * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="圧縮マイクロベンチマーク")
+    parser.add_argument(
+        "--sizes", default="1,5,10,50,100", help="1ページあたりのアイテム数"
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="繰り返し回数")
+    args = parser.parse_args()
+
+    print("レスポンス圧縮ベンチマーク")
+    if not brotli:
+        print("(brotliが未インストールのためgzipのみ計測)")
+    print("=" * 70)
+    print(f"{'items':>6} {'codec':>8} {'raw':>10} {'compressed':>12} {'saved':>8} {'CPU µs':>10}")
+    for count in [int(s) for s in args.sizes.split(",")]:
+        data = build_page(count)
+        for name, compress in codecs().items():
+            size, micros = bench(data, compress, args.repeat)
+            saved = 1 - size / len(data)
+            print(
+                f"{count:>6} {name:>8} {len(data):>10} {size:>12} "
+                f"{saved:>8.1%} {micros:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用のエクスポート メモリ使用量テスト
+大量件数（デフォルト100万件）のテーブルをNDJSONエクスポートし、
+ピークRSSの増加量がしきい値以下に収まることを確認します
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from bench_common import get_local_table, print_result, setup_local_env
+
+setup_local_env()
+
+from batch import batch_write_items  # noqa: E402
+from export import export_ndjson  # noqa: E402
+
+# 1回のBatchWriteItem呼び出し群にまとめる件数
+SEED_CHUNK = 1000
+
+
+def peak_rss_mb():
+    """このプロセスのピークRSS（MB）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linuxはキロバイト、macOSはバイト単位
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def seed_items(count):
+    """テスト用アイテムを投入（子プロセスで実行してピークRSSに影響させない）"""
+    table = get_local_table()
+    start = time.perf_counter()
+    for offset in range(0, count, SEED_CHUNK):
+        now = datetime.utcnow().isoformat()
+        items = [
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"export-{offset + i}",
+                "description": "x" * 100,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(min(SEED_CHUNK, count - offset))
+        ]
+        batch_write_items(table, items)
+    print_result("seed", count, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="エクスポートのピークRSSテスト")
+    parser.add_argument(
+        "--seed", type=int, default=0, help="事前に投入する件数（例: 1000000）"
+    )
+    parser.add_argument(
+        "--max-growth-mb", type=float, default=64.0, help="許容するRSS増加量（MB）"
+    )
+    parser.add_argument("--gzip", action="store_true", help="gzip圧縮して出力")
+    args = parser.parse_args()
+
+    print("DynamoDB Local エクスポート メモリテスト")
+    print("=" * 50)
+
+    if args.seed:
+        process = multiprocessing.Process(target=seed_items, args=(args.seed,))
+        process.start()
+        process.join()
+
+    table = get_local_table()
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    with open(os.devnull, "wb") as f:
+        count = export_ndjson(table, f, compress=args.gzip)
+    print_result("export", count, time.perf_counter() - start)
+
+    growth = peak_rss_mb() - baseline
+    print(f"ピークRSS: 開始時 {baseline:.1f} MB / 増加量 {growth:.1f} MB")
+
+    if growth <= args.max_growth_mb:
+        print("✅ メモリテスト成功")
+    else:
+        print(f"❌ メモリテスト失敗（しきい値 {args.max_growth_mb} MB）")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
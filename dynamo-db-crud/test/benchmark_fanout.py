@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用のファンアウトベンチマーク
+500件の GetItem / UpdateItem / 削除トランザクションを fanout.fan_out で
+並列度を変えて実行し、逐次実行（並列度1）とのレイテンシを比較します
+最後に POST /items:batchUpdate と /items:batchDelete をハンドラー経由で実行します
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+import uuid
+
+from bench_common import get_local_table, load_handler, make_event, setup_local_env
+
+parser = argparse.ArgumentParser(description="ファンアウトベンチマーク")
+parser.add_argument("--count", type=int, default=500, help="1回のファンアウトの件数")
+parser.add_argument(
+    "--concurrency", default="1,4,16,32", help="計測する並列度（カンマ区切り）"
+)
+args = parser.parse_args()
+levels = [int(c) for c in args.concurrency.split(",")]
+
+# スレッドプールと接続プールを最大の並列度に合わせる
+os.environ.setdefault("FANOUT_CONCURRENCY", str(max(levels)))
+os.environ.setdefault("DYNAMODB_MAX_POOL_CONNECTIONS", str(max(levels)))
+os.environ.setdefault("METRICS_ENABLED", "false")
+setup_local_env()
+
+from batch import batch_write_items  # noqa: E402
+from fanout import fan_out  # noqa: E402
+from utils import get_table  # noqa: E402
+
+
+def seed(count):
+    """計測用のアイテムを投入してIDを返す"""
+    items = [
+        {"id": str(uuid.uuid4()), "name": f"fanout-{i}", "version": 1}
+        for i in range(count)
+    ]
+    batch_write_items(get_local_table(), items)
+    return [item["id"] for item in items]
+
+
+def get_one(item_id):
+    return get_table().get_item(Key={"id": item_id}).get("Item")
+
+
+def timed_fan_out(func, calls, concurrency):
+    """ファンアウトを実行し、(ミリ秒, 失敗件数) を返す"""
+    start = time.perf_counter()
+    results = fan_out(func, calls, concurrency)
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, sum(1 for r in results if isinstance(r, Exception))
+
+
+def report(label, timings):
+    sequential = timings[levels[0]][0]
+    print(label)
+    for concurrency, (elapsed, failed) in timings.items():
+        print(
+            f"  並列度 {concurrency:>3}: {elapsed:>9.1f} ms  "
+            f"{sequential / elapsed:>5.1f} 倍  失敗 {failed}"
+        )
+
+
+def main():
+    update_app = load_handler("update")
+    delete_app = load_handler("delete")
+
+    print(f"DynamoDB Local ファンアウトベンチマーク ({args.count} 件)")
+    print("=" * 60)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ids = seed(args.count)
+        # 接続の確立を計測から除外
+        fan_out(get_one, [(item_id,) for item_id in ids[: max(levels)]], max(levels))
+
+        gets = {c: timed_fan_out(get_one, [(i,) for i in ids], c) for c in levels}
+        updates = {
+            c: timed_fan_out(
+                update_app.apply_update,
+                [(i, {"name": f"updated-{c}"}) for i in ids],
+                c,
+            )
+            for c in levels
+        }
+        deletes = {}
+        for c in levels:
+            targets = seed(args.count)
+            deletes[c] = timed_fan_out(
+                delete_app.delete_with_counter, [(i,) for i in targets], c
+            )
+
+    report("GetItem", gets)
+    report("UpdateItem", updates)
+    report("DeleteItem + カウンター (TransactWriteItems)", deletes)
+
+    # ハンドラー経由（既定の並列度 FANOUT_CONCURRENCY）
+    print("ハンドラー経由")
+    with contextlib.redirect_stdout(io.StringIO()):
+        body = [{"id": i, "name": "handler-update"} for i in ids]
+        start = time.perf_counter()
+        response = update_app.lambda_handler(
+            make_event("POST", "/items:batchUpdate", body=body), None
+        )
+        update_ms = (time.perf_counter() - start) * 1000
+        update_result = json.loads(response["body"])
+
+        start = time.perf_counter()
+        response = delete_app.lambda_handler(
+            make_event("POST", "/items:batchDelete", body=ids), None
+        )
+        delete_ms = (time.perf_counter() - start) * 1000
+        delete_result = json.loads(response["body"])
+    print(
+        f"  POST /items:batchUpdate: {update_ms:>9.1f} ms  "
+        f"成功 {update_result['succeeded']} / 失敗 {update_result['failed']}"
+    )
+    print(
+        f"  POST /items:batchDelete: {delete_ms:>9.1f} ms  "
+        f"成功 {delete_result['succeeded']} / 失敗 {delete_result['failed']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+ハンドラーのCPUオーバーヘッドを計測するマイクロベンチマーク（DynamoDB Local不要）
+botocore.stub.Stubber で DynamoDB の応答を差し替え、実際のハンドラーと
+ホットパス（JSONパース・更新式の構築・アイテム生成・レスポンスのシリアライズ）の
+1回あたりのCPU時間を計測します
+
+計測値は純粋なPythonのループ（calibration）に対する比でも保存されるため、
+マシンが異なっても --baseline で悪化を検出できます
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+
+from bench_common import load_handler, make_event, setup_local_env
+
+# ウォームコンテナのキャッシュではなく毎回DynamoDBを呼ぶ経路を計測
+os.environ.setdefault("ITEM_CACHE_SIZE", "0")
+setup_local_env()
+
+from botocore.stub import Stubber  # noqa: E402
+
+import utils  # noqa: E402
+from schema import get_item_schema  # noqa: E402
+
+ITEM_ID = "123e4567-e89b-12d3-a456-426614174000"
+FIELDS = {f"field_{i}": f"value {i}" * 4 for i in range(8)}
+BODY = {"name": "Benchmark Item", "description": "x" * 200, "count": 3, **FIELDS}
+
+
+class _Discard:
+    """ハンドラーのログ出力を捨てるstdout"""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def stored_item():
+    """DynamoDB JSON形式の保存済みアイテム"""
+    item = {
+        "id": {"S": ITEM_ID},
+        "created_at": {"S": "2024-01-01T00:00:00"},
+        "updated_at": {"S": "2024-01-01T00:00:00"},
+        "created_month": {"S": "2024-01"},
+        "version": {"N": "3"},
+        "name": {"S": BODY["name"]},
+        "description": {"S": BODY["description"]},
+        "count": {"N": "3"},
+    }
+    item.update({key: {"S": value} for key, value in FIELDS.items()})
+    return item
+
+
+def calibration():
+    """マシン速度の基準となる純粋なPythonの処理"""
+    total = 0
+    for i in range(2000):
+        total += i * i % 7
+    return total
+
+
+def build_benchmarks(apps):
+    """(名前, 呼び出し, 1回分のスタブを登録する関数) の一覧"""
+    low_level = utils.get_client()
+    resource_client = utils.get_dynamodb().meta.client
+    stubbers = {
+        "low_level": Stubber(low_level),
+        "resource": Stubber(resource_client),
+    }
+    for stubber in stubbers.values():
+        stubber.activate()
+
+    create_event = make_event("POST", "/items", body=BODY)
+    invalid_event = make_event("POST", "/items", body={**BODY, "bad name!": 1})
+    oversized_event = make_event(
+        "POST", "/items", body={**BODY, "description": "x" * (utils.MAX_BODY_BYTES + 1)}
+    )
+    read_event = make_event("GET", f"/items/{ITEM_ID}", path_parameters={"id": ITEM_ID})
+    update_event = make_event(
+        "PUT",
+        f"/items/{ITEM_ID}",
+        body=BODY,
+        path_parameters={"id": ITEM_ID},
+        headers={"If-Match": '"3"'},
+    )
+    delete_event = make_event(
+        "DELETE", f"/items/{ITEM_ID}", path_parameters={"id": ITEM_ID}
+    )
+    page = {
+        "items": [
+            {
+                "id": f"{ITEM_ID[:-3]}{i:03d}",
+                "version": Decimal(3),
+                "price": Decimal("12.5"),
+                **BODY,
+            }
+            for i in range(100)
+        ],
+        "count": 100,
+    }
+
+    def stub(name, operation, build_response):
+        # 応答はリソースの型変換で書き換えられるため毎回生成する
+        return lambda: stubbers[name].add_response(operation, build_response())
+
+    return [
+        ("calibration", calibration, None),
+        ("parse_json_body", lambda: utils.parse_json_body(create_event), None),
+        (
+            "build_update_expression",
+            lambda: apps["update"].build_update_expression(BODY, 3),
+            None,
+        ),
+        ("build_item", lambda: apps["create"].build_item(BODY), None),
+        ("schema.validate", lambda: get_item_schema().validate(BODY), None),
+        (
+            "serialize_page",
+            lambda: utils.create_success_response(200, page),
+            None,
+        ),
+        (
+            "handler.create",
+            lambda: apps["create"].lambda_handler(create_event, None),
+            stub("low_level", "transact_write_items", dict),
+        ),
+        # 不正なリクエストはDynamoDBを呼ばずに拒否される
+        (
+            "handler.create_invalid",
+            lambda: apps["create"].lambda_handler(invalid_event, None),
+            None,
+        ),
+        (
+            "handler.create_oversized",
+            lambda: apps["create"].lambda_handler(oversized_event, None),
+            None,
+        ),
+        (
+            "handler.read",
+            lambda: apps["read"].lambda_handler(read_event, None),
+            stub("resource", "get_item", lambda: {"Item": stored_item()}),
+        ),
+        (
+            "handler.update",
+            lambda: apps["update"].lambda_handler(update_event, None),
+            stub("resource", "update_item", lambda: {"Attributes": stored_item()}),
+        ),
+        (
+            "handler.delete",
+            lambda: apps["delete"].lambda_handler(delete_event, None),
+            stub("low_level", "transact_write_items", dict),
+        ),
+    ]
+
+
+def measure(func, add_stub, iterations):
+    """iterations回呼び出したときの1回あたりの時間（マイクロ秒）"""
+    if add_stub:
+        for _ in range(iterations):
+            add_stub()
+    # timeitと同様にGCを止めて計測
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1e6
+    finally:
+        gc.enable()
+
+
+def run_rounds(benchmarks, samples, repeats, iterations):
+    """一時的な負荷の影響が1項目に偏らないよう、項目を交互に計測"""
+    for _ in range(repeats):
+        for name, func, add_stub in benchmarks:
+            samples[name].append(measure(func, add_stub, iterations))
+
+
+def summarize(samples):
+    """最小値と calibration に対する比を計算"""
+    results = {name: {"us": min(values)} for name, values in samples.items()}
+    base = results["calibration"]["us"]
+    for r in results.values():
+        r["relative"] = r["us"] / base
+    return results
+
+
+def find_regressions(results, baseline, max_regression, small_us=0, small_max_regression=None):
+    """
+    {項目: (基準比の前, 後)} のうち許容率を超えて悪化したもの
+    small_us マイクロ秒未満の項目はタイマーやキャッシュの揺らぎが大きいため
+    small_max_regression で判定する
+    """
+    regressed = {}
+    for name, r in results.items():
+        before = baseline.get(name, {}).get("relative")
+        if name == "calibration" or not before:
+            continue
+        allowed = max_regression
+        if small_max_regression is not None and r["us"] < small_us:
+            allowed = max(max_regression, small_max_regression)
+        if r["relative"] > before * (1 + allowed):
+            regressed[name] = (before, r["relative"])
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ハンドラーのCPUオーバーヘッド計測")
+    parser.add_argument("--iterations", type=int, default=500, help="1回の計測の呼び出し回数")
+    parser.add_argument("--repeats", type=int, default=10, help="計測回数（最小値を採用）")
+    parser.add_argument("--only", help="計測する項目（カンマ区切り）")
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--baseline", help="比較対象の結果JSONファイル")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.3, help="許容する悪化率（0.3 = 30%%）"
+    )
+    parser.add_argument(
+        "--small-us", type=float, default=50, help="揺らぎの大きい短い項目とみなす時間（マイクロ秒）"
+    )
+    parser.add_argument(
+        "--small-max-regression",
+        type=float,
+        default=1.0,
+        help="--small-us 未満の項目に許容する悪化率（1.0 = 100%%）",
+    )
+    args = parser.parse_args()
+
+    apps = {name: load_handler(name) for name in ("create", "read", "update", "delete")}
+    only = set(args.only.split(",")) if args.only else None
+
+    with contextlib.redirect_stdout(_Discard()):
+        benchmarks = [
+            (name, func, add_stub)
+            for name, func, add_stub in build_benchmarks(apps)
+            if not only or name in only or name == "calibration"
+        ]
+        # 遅延初期化やimportを計測から除外
+        for name, func, add_stub in benchmarks:
+            if add_stub:
+                add_stub()
+            func()
+
+        samples = {name: [] for name, _, _ in benchmarks}
+        run_rounds(benchmarks, samples, args.repeats, args.iterations)
+        results = summarize(samples)
+
+        # 悪化した項目だけを再計測し、継続して遅い場合のみ失敗とする
+        regressions = []
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)["results"]
+            thresholds = (
+                args.max_regression,
+                args.small_us,
+                args.small_max_regression,
+            )
+            regressed = find_regressions(results, baseline, *thresholds)
+            if regressed:
+                retry = [b for b in benchmarks if b[0] in regressed or b[0] == "calibration"]
+                run_rounds(retry, samples, args.repeats, args.iterations)
+                results = summarize(samples)
+                regressions = [
+                    f"{name}: 基準比 {before:.2f} -> {after:.2f} ({after / before - 1:+.0%})"
+                    for name, (before, after) in find_regressions(
+                        results, baseline, *thresholds
+                    ).items()
+                ]
+
+    print("ハンドラー CPUオーバーヘッド ベンチマーク（Stubber使用）")
+    print("=" * 60)
+    print(f"{'項目':<26} {'us/回':>10} {'基準比':>10}")
+    for name, r in results.items():
+        print(f"{name:<26} {r['us']:>10.1f} {r['relative']:>10.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        if regressions:
+            print("❌ ホットパスの悪化を検出しました")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✅ ベースラインからの悪化はありません")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用のフィールド射影ベンチマーク
+大きなアイテムに対して fields= なし / ありで GET /items/{id} と GET /items を呼び出し、
+レスポンスサイズとレイテンシを比較します
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+from bench_common import get_local_table, load_handler, make_event, setup_local_env
+
+setup_local_env()
+
+from batch import batch_write_items  # noqa: E402
+
+FIELDS = "name,updated_at"
+
+
+def seed_large_items(count, size):
+    """大きなdescriptionを持つアイテムを投入"""
+    now = datetime.utcnow().isoformat()
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"large-{i}",
+            "description": "x" * size,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+    batch_write_items(get_local_table(), items)
+    return [item["id"] for item in items]
+
+
+def measure(read_app, events):
+    """イベントを順に実行し、(平均バイト数, p50ミリ秒) を返す"""
+    sizes = []
+    latencies = []
+    for event in events:
+        start = time.perf_counter()
+        response = read_app.lambda_handler(event, None)
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(response["body"]))
+    return statistics.mean(sizes), statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="フィールド射影ベンチマーク")
+    parser.add_argument("--count", type=int, default=100, help="アイテム数")
+    parser.add_argument(
+        "--size", type=int, default=50000, help="descriptionのバイト数"
+    )
+    args = parser.parse_args()
+
+    read_app = load_handler("read")
+    ids = seed_large_items(args.count, args.size)
+
+    print("DynamoDB Local フィールド射影ベンチマーク")
+    print("=" * 50)
+    cases = {
+        "GET /items/{id}": lambda query: [
+            make_event(
+                "GET", f"/items/{item_id}", path_parameters={"id": item_id}, query=query
+            )
+            for item_id in ids
+        ],
+        "GET /items?limit=100": lambda query: [
+            make_event("GET", "/items", query={"limit": "100", **(query or {})})
+        ]
+        * 10,
+    }
+    for label, build_events in cases.items():
+        full_size, full_latency = measure(read_app, build_events(None))
+        proj_size, proj_latency = measure(read_app, build_events({"fields": FIELDS}))
+        print(label)
+        print(f"  全属性:   {full_size:>12.0f} バイト  p50 {full_latency:>8.2f} ms")
+        print(f"  射影あり: {proj_size:>12.0f} バイト  p50 {proj_latency:>8.2f} ms")
+        print(f"  削減率:   {1 - proj_size / full_size:>12.1%}")
+
+
+if __name__ == "__main__":
+    main()
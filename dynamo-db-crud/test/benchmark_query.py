@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用のGSIクエリ対スキャンのベンチマーク
+大量のアイテム(既定 100,000 件)を投入し、同じ結果を
+フィルター付きスキャン(where.name / created_from・created_to)と
+GSIクエリ(name / order=newest)で取得したときの
+レイテンシ・リクエスト数・消費キャパシティを比較します
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from bench_common import get_local_table, load_handler, make_event, setup_local_env
+
+setup_local_env()
+
+from batch import batch_write_items  # noqa: E402
+from indexes import CREATED_BUCKET_ATTR, created_bucket  # noqa: E402
+
+SEED_CHUNK = 5000
+
+
+def seed_items(count, names, days):
+    """nameとcreated_atを分散させたアイテムを投入"""
+    table = get_local_table()
+    end = datetime.utcnow()
+    start = time.perf_counter()
+    for offset in range(0, count, SEED_CHUNK):
+        items = []
+        for i in range(offset, min(offset + SEED_CHUNK, count)):
+            created_at = (
+                end - timedelta(seconds=random.uniform(0, days * 86400))
+            ).isoformat()
+            items.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": f"name-{i % names}",
+                    "description": f"item {i}",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "version": 1,
+                    CREATED_BUCKET_ATTR: created_bucket(created_at),
+                }
+            )
+        batch_write_items(table, items)
+        print(f"  投入済み: {offset + len(items)} / {count}")
+    print(f"投入完了: {time.perf_counter() - start:.1f} 秒")
+
+
+def fetch_all(read_app, query, max_items=None):
+    """カーソルを辿って全ページ取得し、(件数, 秒, リクエスト数, 消費RCU) を返す"""
+    items = 0
+    requests = 0
+    capacity = 0.0
+    cursor = None
+    start = time.perf_counter()
+    while True:
+        params = dict(query)
+        if cursor:
+            params["cursor"] = cursor
+        response = read_app.lambda_handler(make_event("GET", "/items", query=params), None)
+        if response["statusCode"] != 200:
+            raise RuntimeError(response["body"])
+        body = json.loads(response["body"])
+        requests += 1
+        items += body["count"]
+        capacity += float(response["headers"].get("X-Consumed-Capacity", 0))
+        cursor = body.get("cursor")
+        if not cursor or (max_items and items >= max_items):
+            break
+    return items, time.perf_counter() - start, requests, capacity
+
+
+def report(label, result):
+    items, elapsed, requests, capacity = result
+    print(
+        f"  {label:<8} {items:>7} 件 {elapsed * 1000:>10.1f} ms "
+        f"{requests:>6} リクエスト {capacity:>10.1f} RCU"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GSIクエリ対スキャンのベンチマーク")
+    parser.add_argument("--count", type=int, default=100000, help="投入するアイテム数")
+    parser.add_argument("--names", type=int, default=1000, help="nameの種類数")
+    parser.add_argument("--days", type=int, default=365, help="created_atの分布日数")
+    parser.add_argument("--limit", type=int, default=50, help="1ページの件数")
+    parser.add_argument("--skip-seed", action="store_true", help="投入を省略")
+    args = parser.parse_args()
+
+    if not args.skip_seed:
+        seed_items(args.count, args.names, args.days)
+
+    read_app = load_handler("read")
+    limit = str(args.limit)
+
+    print("DynamoDB Local GSIクエリ対スキャン ベンチマーク")
+    print("=" * 60)
+
+    # 同じnameを持つアイテムを全件取得
+    print("name=name-0 の全件取得")
+    report("scan", fetch_all(read_app, {"where.name": "name-0", "limit": limit}))
+    report("query", fetch_all(read_app, {"name": "name-0", "limit": limit}))
+
+    # 直近7日間の最新 limit 件を取得
+    # スキャンは順序を保証しないため、期間内の全件を取得して並べ替える必要がある
+    created_to = datetime.utcnow().isoformat()
+    created_from = (datetime.utcnow() - timedelta(days=7)).isoformat()
+    print(f"直近7日間の最新 {limit} 件")
+    report(
+        "scan",
+        fetch_all(
+            read_app,
+            {"created_from": created_from, "created_to": created_to, "limit": "100"},
+        ),
+    )
+    report(
+        "query",
+        fetch_all(
+            read_app,
+            {
+                "order": "newest",
+                "created_from": created_from,
+                "created_to": created_to,
+                "limit": limit,
+            },
+            max_items=args.limit,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
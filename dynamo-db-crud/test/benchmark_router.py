@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+関数分割モードと単一関数（ルーター）モードの比較ベンチマーク
+
+1. 新しいPythonプロセスで各モードのコールドスタート時間を計測します
+   - split:  src/<name>/app.py のimportと最初の呼び出し
+   - single: router のimportと最初のルートの呼び出し、および
+             同じコンテナで初めて呼ばれる別ルートの遅延importの時間
+2. 同じプロセス内でルートごとのウォーム時のレイテンシを計測します
+3. 計測値を使い、Lambdaのコンテナプール（アイドル時間経過で回収）を
+   混在トラフィック（ポアソン到着）で模擬し、コールドスタート率と
+   p50/p95/p99レイテンシを比較します
+
+--mode validation はDBにアクセスしない400系リクエスト（DynamoDB Local不要）、
+--mode db はDynamoDB Localにアクセスするリクエストで計測します
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_common import LAYER_DIR, SRC_DIR, load_handler, setup_local_env
+from benchmark_cold_start import FUNCTIONS, build_event, run_once
+
+# ルーターが参照するAPI Gatewayのリソース
+RESOURCES = {
+    "create": "/items",
+    "read": "/items",
+    "update": "/items/{id}",
+    "delete": "/items/{id}",
+}
+DEFAULT_RATES = "create=0.05,read=1,update=0.02,delete=0.005"
+
+# ルーターを新しいプロセスで読み込み、指定順にルートを呼び出す計測コード
+ROUTER_CHILD_CODE = """
+import json, sys, time
+start = time.perf_counter()
+sys.path[:0] = [{layer!r}, {src!r}]
+import router
+timings = {{"import_ms": (time.perf_counter() - start) * 1000, "first_call_ms": []}}
+for event in json.loads({events!r}):
+    called = time.perf_counter()
+    router.lambda_handler(event, None)
+    timings["first_call_ms"].append((time.perf_counter() - called) * 1000)
+print(json.dumps(timings))
+"""
+
+
+def route_event(name, mode):
+    """ルーター用にリソースを設定したイベント"""
+    event = build_event(name, mode)
+    event["resource"] = RESOURCES[name]
+    return event
+
+
+def measure_router_cold(name, mode):
+    """name を最初のルートとしたルーターの (コールドスタートms, {他ルート: 初回ms})"""
+    order = [name] + [other for other in FUNCTIONS if other != name]
+    code = ROUTER_CHILD_CODE.format(
+        layer=LAYER_DIR,
+        src=SRC_DIR,
+        events=json.dumps([route_event(route, mode) for route in order]),
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    calls = timings["first_call_ms"]
+    return timings["import_ms"] + calls[0], dict(zip(order[1:], calls[1:]))
+
+
+def measure_cold_starts(mode, runs):
+    """両モードのコールドスタート時間（中央値）"""
+    split = {}
+    router = {}
+    lazy = {name: [] for name in FUNCTIONS}
+    for name in FUNCTIONS:
+        samples = [run_once(name, mode) for _ in range(runs)]
+        split[name] = statistics.median(
+            s["import_ms"] + s["first_invoke_ms"] for s in samples
+        )
+        router_samples = [measure_router_cold(name, mode) for _ in range(runs)]
+        router[name] = statistics.median(cold for cold, _ in router_samples)
+        for _, others in router_samples:
+            for other, ms in others.items():
+                lazy[other].append(ms)
+    return split, router, {name: statistics.median(v) for name, v in lazy.items()}
+
+
+def measure_warm(mode, runs):
+    """ルートごとのウォーム時のレイテンシ（ミリ秒のリスト）"""
+    sys.path.insert(0, SRC_DIR)
+    import router
+
+    apps = {name: load_handler(name) for name in FUNCTIONS}
+    warm = {"split": {}, "single": {}}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in FUNCTIONS:
+            for label, call, event in (
+                ("split", apps[name].lambda_handler, build_event(name, mode)),
+                ("single", router.lambda_handler, route_event(name, mode)),
+            ):
+                call(event, None)
+                samples = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    call(event, None)
+                    samples.append((time.perf_counter() - start) * 1000)
+                warm[label][name] = samples
+    return warm
+
+
+def parse_rates(text):
+    rates = {}
+    for part in text.split(","):
+        name, _, rate = part.partition("=")
+        if name not in FUNCTIONS:
+            raise argparse.ArgumentTypeError(f"不明なルートです: {name}")
+        rates[name] = float(rate)
+    return rates
+
+
+def simulate(mode, rates, duration, idle_timeout, cold_ms, lazy_ms, warm, seed):
+    """
+    コンテナプールを模擬し、(ルート別のコールドスタート数, 全レイテンシ) を返す
+
+    各関数はアイドル時間が idle_timeout（0.5〜1.5倍のばらつき）を超えたコンテナを回収し、
+    空きコンテナがなければ新しいコンテナ（コールドスタート）で処理します
+    """
+    rng = random.Random(seed)
+    total_rate = sum(rates.values())
+    routes = list(rates)
+    weights = [rates[r] for r in routes]
+
+    pools = {}  # 関数名 -> [{"busy_until", "expires", "loaded"}]
+    cold = {r: 0 for r in routes}
+    counts = {r: 0 for r in routes}
+    latencies = []
+
+    now = 0.0
+    while True:
+        now += rng.expovariate(total_rate)
+        if now >= duration:
+            break
+        route = rng.choices(routes, weights)[0]
+        function = route if mode == "split" else "router"
+        pool = [c for c in pools.get(function, []) if c["expires"] > now]
+
+        container = next((c for c in pool if c["busy_until"] <= now), None)
+        warm_latency = rng.choice(warm[mode][route])
+        if container is None:
+            latency = cold_ms[route]
+            container = {"loaded": {route}}
+            pool.append(container)
+            cold[route] += 1
+        elif route not in container["loaded"]:
+            # 同じコンテナで初めて呼ばれるルートはモジュールをimportする
+            latency = lazy_ms[route]
+            container["loaded"].add(route)
+        else:
+            latency = warm_latency
+
+        container["busy_until"] = now + latency / 1000
+        container["expires"] = container["busy_until"] + idle_timeout * rng.uniform(0.5, 1.5)
+        pools[function] = pool
+        counts[route] += 1
+        latencies.append((route, latency))
+
+    return cold, counts, latencies
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, int(round(p / 100 * len(values))) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="関数分割モードと単一関数モードの比較")
+    parser.add_argument("--mode", choices=["validation", "db"], default="validation")
+    parser.add_argument("--runs", type=int, default=5, help="コールドスタートの計測回数")
+    parser.add_argument("--warm-runs", type=int, default=200, help="ウォーム計測の回数")
+    parser.add_argument("--rates", type=parse_rates, default=DEFAULT_RATES, help="ルートごとの毎秒リクエスト数")
+    parser.add_argument("--hours", type=float, default=24, help="模擬する時間")
+    parser.add_argument("--idle-timeout", type=float, default=600, help="コンテナ回収までのアイドル秒数")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    args = parser.parse_args()
+
+    setup_local_env()
+    os.environ.setdefault("METRICS_ENABLED", "false")
+
+    print(f"関数分割 / 単一関数 比較ベンチマーク (mode={args.mode})")
+    print("=" * 60)
+    split_cold, router_cold, lazy = measure_cold_starts(args.mode, args.runs)
+    warm = measure_warm(args.mode, args.warm_runs)
+
+    print(f"{'ルート':<8} {'split cold':>11} {'single cold':>12} {'遅延import':>11} "
+          f"{'warm split':>11} {'warm single':>12}")
+    for name in FUNCTIONS:
+        print(
+            f"{name:<8} {split_cold[name]:>9.1f}ms {router_cold[name]:>10.1f}ms "
+            f"{lazy[name]:>9.1f}ms {statistics.median(warm['split'][name]):>9.2f}ms "
+            f"{statistics.median(warm['single'][name]):>10.2f}ms"
+        )
+
+    print()
+    print(
+        f"模擬: {args.hours:g} 時間, アイドル回収 {args.idle_timeout:g} 秒, "
+        f"トラフィック {args.rates}"
+    )
+    results = {}
+    for mode, cold_ms in (("split", split_cold), ("single", router_cold)):
+        cold, counts, latencies = simulate(
+            mode,
+            args.rates,
+            args.hours * 3600,
+            args.idle_timeout,
+            cold_ms,
+            lazy,
+            warm,
+            args.seed,
+        )
+        all_latencies = [latency for _, latency in latencies]
+        results[mode] = {
+            "requests": len(latencies),
+            "cold_starts": sum(cold.values()),
+            "cold_start_rate": sum(cold.values()) / max(1, len(latencies)),
+            "p50_ms": percentile(all_latencies, 50),
+            "p95_ms": percentile(all_latencies, 95),
+            "p99_ms": percentile(all_latencies, 99),
+            "routes": {
+                route: {
+                    "requests": counts[route],
+                    "cold_start_rate": cold[route] / max(1, counts[route]),
+                    "p99_ms": percentile(
+                        [l for r, l in latencies if r == route] or [0.0], 99
+                    ),
+                }
+                for route in args.rates
+            },
+        }
+        r = results[mode]
+        print(
+            f"{mode:<7} コールドスタート {r['cold_starts']:>6} / {r['requests']} "
+            f"({r['cold_start_rate']:.2%})  p50 {r['p50_ms']:.2f}ms  "
+            f"p95 {r['p95_ms']:.2f}ms  p99 {r['p99_ms']:.2f}ms"
+        )
+        for route, rr in r["routes"].items():
+            print(
+                f"    {route:<8} {rr['requests']:>7} 件  コールド {rr['cold_start_rate']:>7.2%}"
+                f"  p99 {rr['p99_ms']:>8.2f}ms"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "mode": args.mode,
+                    "config": {
+                        "rates": args.rates,
+                        "hours": args.hours,
+                        "idle_timeout": args.idle_timeout,
+                        "seed": args.seed,
+                    },
+                    "cold_start_ms": {"split": split_cold, "single": router_cold},
+                    "lazy_import_ms": lazy,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+JSONシリアライズのマイクロベンチマーク
+boto3が返す型（Decimal, set）を含む100件のページを
+従来の json.dumps(default=str) と共通レイヤーのシリアライザで比較します（DynamoDB Local不要）
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from bench_common import setup_local_env
+
+setup_local_env()
+
+import serialization  # noqa: E402
+
+
+def build_page(count):
+    """DynamoDBのscan結果相当のページを生成"""
+    now = datetime.utcnow().isoformat()
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Item {i}",
+            "description": "説明文 " * 10,
+            "price": Decimal(f"{i}.99"),
+            "quantity": Decimal(i),
+            "version": Decimal(1),
+            "tags": {"a", "b", "c"},
+            "scores": [Decimal(1), Decimal("2.5"), Decimal(3)],
+            "attributes": {"color": "red", "size": Decimal(42), "active": True},
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+    return {"items": items, "count": count, "has_more": True}
+
+
+def bench(dumps, data, repeat):
+    """1回あたりのマイクロ秒と出力サイズを返す"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = dumps(data)
+    return (time.perf_counter() - start) / repeat * 1_000_000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="シリアライズベンチマーク")
+    parser.add_argument("--items", type=int, default=100, help="1ページのアイテム数")
+    parser.add_argument("--repeat", type=int, default=500, help="繰り返し回数")
+    args = parser.parse_args()
+
+    data = build_page(args.items)
+    cases = {
+        "json.dumps(default=str)": lambda d: json.dumps(d, default=str),
+        "stdlib (tuned)": serialization._dumps_stdlib,
+    }
+    if serialization.orjson:
+        cases["orjson"] = serialization._dumps_orjson
+
+    print(f"シリアライズベンチマーク（{args.items}件/ページ）")
+    print("=" * 60)
+    baseline = None
+    for label, dumps in cases.items():
+        micros, size = bench(dumps, data, args.repeat)
+        baseline = baseline or micros
+        print(
+            f"{label:<26} {micros:>10.1f} µs {size:>9} バイト {baseline / micros:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+pytestのユニットテスト（test_*.py）の共通設定
+DynamoDBへの呼び出しは botocore の Stubber で置き換えます（DynamoDB Local不要）
+"""
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DynamoDB Localに接続するスクリプトのため収集しない
+collect_ignore = ["test_local.py"]
+
+# Layerを読み込む前に環境変数を設定（モジュール定数は読み込み時に決まる）
+os.environ.update(
+    {
+        "AWS_ACCESS_KEY_ID": "dummy",
+        "AWS_SECRET_ACCESS_KEY": "dummy",
+        "AWS_DEFAULT_REGION": "us-east-1",
+        "TABLE_NAME": "test-items",
+        "COUNTER_TABLE_NAME": "test-counters",
+        "CURSOR_SECRET": "unit-test-cursor-secret",
+        "METRICS_ENABLED": "false",
+        "CONSUMED_CAPACITY_ENABLED": "false",
+        # 並列の呼び出しを1件ずつにして Stubber の応答順を固定する
+        "FANOUT_CONCURRENCY": "1",
+    }
+)
+os.environ.pop("DYNAMODB_ENDPOINT_URL", None)
+
+sys.path[:0] = [
+    os.path.join(BASE_DIR, "layers", "common-layer", "python"),
+    os.path.join(BASE_DIR, "src"),
+]
+
+from botocore.stub import Stubber  # noqa: E402
+
+import utils  # noqa: E402
+
+
+@pytest.fixture
+def table_stub():
+    """Tableリソース（get_table / get_dynamodb）のクライアントのStubber"""
+    with Stubber(utils.get_table().meta.client) as stub:
+        yield stub
+        stub.assert_no_pending_responses()
+
+
+@pytest.fixture
+def client_stub():
+    """低レベルクライアント（get_client）のStubber"""
+    with Stubber(utils.get_client()) as stub:
+        yield stub
+        stub.assert_no_pending_responses()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用のNDJSONエクスポートスクリプト
+テーブル全体をスキャンし、1行1アイテムのNDJSONとして出力します
+"""
+import argparse
+import sys
+import time
+
+from bench_common import get_local_table, print_result, setup_local_env
+
+setup_local_env()
+
+from export import export_ndjson  # noqa: E402
+
+
+def export_table(output, compress=False, page_size=None):
+    """テーブルをエクスポートし、(件数, 経過時間) を返す"""
+    table = get_local_table()
+    scan_kwargs = {"Limit": page_size} if page_size else {}
+
+    start = time.perf_counter()
+    if output == "-":
+        count = export_ndjson(table, sys.stdout.buffer, compress, **scan_kwargs)
+    else:
+        with open(output, "wb") as f:
+            count = export_ndjson(table, f, compress, **scan_kwargs)
+    return count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NDJSONエクスポート")
+    parser.add_argument(
+        "--output", default="-", help="出力先ファイル（'-' は標準出力）"
+    )
+    parser.add_argument("--gzip", action="store_true", help="gzip圧縮して出力")
+    parser.add_argument("--page-size", type=int, default=0, help="1ページあたりの件数")
+    args = parser.parse_args()
+
+    count, elapsed = export_table(args.output, args.gzip, args.page_size or None)
+
+    # 標準出力にデータを書く場合は結果を標準エラーに表示
+    if args.output == "-":
+        print(f"{count} 件をエクスポートしました ({elapsed:.2f} 秒)", file=sys.stderr)
+    else:
+        print_result("export", count, elapsed)
+
+
+if __name__ == "__main__":
+    main()
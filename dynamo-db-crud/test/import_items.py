@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+NDJSON / CSV の一括インポートCLI（DynamoDB Local・ステージング向け）
+ファイルをストリーミングで読み込み、create_item と同じ規則（スキーマ検証・
+id・タイムスタンプ・長い文字列の圧縮）でアイテムを作り、BatchWriteItem で
+スレッドプール（--workers）から並列に書き込みます
+
+- UnprocessedItems はバックオフ付きで再送します（batch.batch_write_items）
+- --processes を指定すると行番号で分割した担当分を複数プロセスで処理します
+- 書き込み済みの位置をチェックポイントに保存し、中断後や書き込みに失敗した行が
+  あった場合は、再実行でその位置から再開します
+  idは (ファイルの絶対パス, 行番号) から決まるUUIDのため、再開時に重複して書き込まれた
+  行は上書きされるだけで件数は増えません（ファイルを移動すると別のファイルとして
+  扱われます）
+- 件数カウンターは更新しないため、完了後に reconcile_counters.py を実行してください
+"""
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from decimal import Decimal, InvalidOperation
+from multiprocessing import Pool
+
+from bench_common import load_handler, setup_local_env
+
+# idを決めるための名前空間（同じパスのファイル・行からは常に同じidになる）
+IMPORT_NAMESPACE = uuid.UUID("6f1c2b0e-8a4d-4e55-9a57-2d3f0c1b7e11")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="NDJSON / CSV の一括インポート")
+    parser.add_argument("files", nargs="+", help="入力ファイル（.ndjson / .jsonl / .csv、.gz可）")
+    parser.add_argument("--format", choices=["auto", "ndjson", "csv"], default="auto")
+    parser.add_argument("--number-columns", default="", help="CSVで数値として扱う列（カンマ区切り）")
+    parser.add_argument("--workers", type=int, default=16, help="プロセスごとの書き込みスレッド数")
+    parser.add_argument("--processes", type=int, default=1, help="プロセス数")
+    parser.add_argument("--chunk-size", type=int, default=100, help="1タスクで書き込む件数")
+    parser.add_argument("--max-retries", type=int, default=8, help="UnprocessedItems の再送回数")
+    parser.add_argument("--checkpoint-dir", default=".import-checkpoints", help="チェックポイントの保存先")
+    parser.add_argument("--restart", action="store_true", help="チェックポイントを無視して最初から")
+    parser.add_argument("--report-interval", type=float, default=5, help="進捗の表示間隔（秒）")
+    parser.add_argument(
+        "--rejects", help="検証に失敗した行を追記するNDJSONファイル（複数プロセスでは .<番号> 付き）"
+    )
+    parser.add_argument("--table", help="テーブル名（既定は TABLE_NAME）")
+    parser.add_argument(
+        "--endpoint-url",
+        help="DynamoDBのエンドポイント（既定はDynamoDB Local、'' でAWSの既定エンドポイント）",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="書き込まずに読み込みと変換のみ")
+    return parser.parse_args(argv)
+
+
+def configure(args):
+    """Layerを読み込む前に環境変数を設定"""
+    if args.table:
+        os.environ["TABLE_NAME"] = args.table
+    if args.endpoint_url is not None:
+        os.environ["DYNAMODB_ENDPOINT_URL"] = args.endpoint_url
+    # 接続プールを書き込みスレッド数に合わせる
+    os.environ.setdefault("DYNAMODB_MAX_POOL_CONNECTIONS", str(args.workers))
+    os.environ.setdefault("METRICS_ENABLED", "false")
+    setup_local_env()
+    if os.environ.get("DYNAMODB_ENDPOINT_URL") == "":
+        del os.environ["DYNAMODB_ENDPOINT_URL"]
+
+
+def detect_format(path, fmt):
+    if fmt != "auto":
+        return fmt
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.endswith(".csv") else "ndjson"
+
+
+def open_text(path):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def iter_rows(path, fmt, number_columns, partition=0, processes=1, start_row=0):
+    """
+    担当する行を (行番号, フィールド, エラー) で返す
+
+    行番号はヘッダーと空行を除いた0始まりの番号です。担当外と start_row より前の行は
+    解析しません
+    """
+    with open_text(path) as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row, record in enumerate(reader):
+                if row < start_row or row % processes != partition:
+                    continue
+                fields = {}
+                error = None
+                for key, value in record.items():
+                    if key is None:
+                        error = "Row has more columns than the header"
+                    elif value == "" and key != "name":
+                        continue
+                    elif key in number_columns:
+                        try:
+                            fields[key] = Decimal(value)
+                        except InvalidOperation:
+                            error = f"Column '{key}' must be a number"
+                    else:
+                        fields[key] = value
+                yield row, fields, error
+        else:
+            row = -1
+            for line in f:
+                if not line.strip():
+                    continue
+                row += 1
+                if row < start_row or row % processes != partition:
+                    continue
+                try:
+                    yield row, json.loads(line, parse_float=Decimal), None
+                except ValueError:
+                    yield row, None, "Invalid JSON"
+
+
+class Checkpoint:
+    """
+    書き込みが完了した位置の記録
+
+    チャンクは順不同で完了するため、先頭から途切れずに書き込みに成功した行の次の
+    行番号を next_row として保存し、件数もその範囲の分だけを加算します（再開時に
+    二重に数えないため）。書き込みに失敗した行を含むチャンクで next_row は止まり、
+    再実行時にそのチャンクから書き直します。failed はその実行で失敗した件数です
+    """
+
+    def __init__(self, path, restart=False):
+        self.path = path
+        self.state = {"next_row": 0, "written": 0, "failed": 0, "rejected": 0, "done": False}
+        if not restart and os.path.exists(path):
+            with open(path) as f:
+                self.state.update(json.load(f))
+        # 完了したチャンクの開始行 -> (次のチャンクの開始行, 書き込み, 失敗, 不正)
+        self.pending = {}
+        # この実行で完了したすべてのチャンクの件数（進捗表示と集計用）
+        self.run = {"written": 0, "failed": 0, "rejected": 0}
+
+    def complete(self, start, end, written, failed, rejected):
+        self.run["written"] += written
+        self.run["failed"] += failed
+        self.run["rejected"] += rejected
+        self.pending[start] = (end, written, failed, rejected)
+        while self.state["next_row"] in self.pending:
+            end, written, failed, rejected = self.pending[self.state["next_row"]]
+            if failed:
+                break
+            del self.pending[self.state["next_row"]]
+            self.state["next_row"] = end
+            self.state["written"] += written
+            self.state["rejected"] += rejected
+
+    def save(self, done=False):
+        self.state["failed"] = self.run["failed"]
+        # 失敗した行が残っている間は完了にしない（再実行で書き直す）
+        self.state["done"] = done and not self.run["failed"]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+
+def build_import_item(create_app, schema, fields, source, row):
+    """create_item と同じ規則でアイテムを作成（idは行から決定）"""
+    fields, error = schema.validate(fields)
+    if error:
+        return None, error
+    item = create_app.build_item(fields)
+    item["id"] = str(uuid.uuid5(IMPORT_NAMESPACE, f"{source}:{row}"))
+    return item, None
+
+
+def import_partition(task):
+    """1ファイルの担当分をインポートし、集計を返す"""
+    args, path, partition = task
+    configure(args)
+    from attributes import encode_item
+    from batch import batch_write_items
+    from schema import get_item_schema
+    from utils import get_table
+
+    create_app = load_handler("create")
+    schema = get_item_schema()
+    table = None if args.dry_run else get_table()
+    # 別のディレクトリにある同じ名前のファイルと区別するため絶対パスで識別する
+    source = os.path.abspath(path)
+    fmt = detect_format(path, args.format)
+    number_columns = {c for c in args.number_columns.split(",") if c}
+    label = f"{path} [{partition + 1}/{args.processes}]"
+
+    checkpoint = Checkpoint(
+        os.path.join(
+            args.checkpoint_dir,
+            f"{os.path.basename(path)}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]}"
+            f".{partition}-of-{args.processes}.json",
+        ),
+        args.restart,
+    )
+    if checkpoint.state["done"]:
+        print(f"{label}: 完了済みのためスキップ")
+        return {**checkpoint.run, "done": True}
+    start_row = checkpoint.state["next_row"]
+    if start_row:
+        print(f"{label}: {start_row} 行目から再開")
+
+    rejects = None
+    if args.rejects:
+        suffix = f".{partition}" if args.processes > 1 else ""
+        rejects = open(f"{args.rejects}{suffix}", "a")
+
+    def write_chunk(items):
+        if not items:
+            return 0, 0
+        if table is None:
+            return len(items), 0
+        results = batch_write_items(
+            table, items, max_retries=args.max_retries, concurrency=1
+        )
+        failed = sum(1 for error in results.values() if error is not None)
+        return len(items) - failed, failed
+
+    started = last_report = time.monotonic()
+    in_flight = {}
+    max_in_flight = args.workers * 2
+
+    def collect(block):
+        """完了したチャンクをチェックポイントに反映（block なら1つ完了するまで待つ）"""
+        if block:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        else:
+            done = [future for future in in_flight if future.done()]
+        for future in done:
+            start, end, rejected = in_flight.pop(future)
+            written, failed = future.result()
+            checkpoint.complete(start, end, written, failed, rejected)
+
+    def report(final=False):
+        elapsed = time.monotonic() - started
+        run = checkpoint.run
+        print(
+            f"{label}: 書き込み {run['written']} 件 "
+            f"失敗 {run['failed']} 件 不正 {run['rejected']} 件 "
+            f"({run['written'] / max(elapsed, 1e-9):,.0f} 件/秒){' 完了' if final else ''}",
+            flush=True,
+        )
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        chunk, rejected, chunk_start = [], 0, start_row
+        rows = iter_rows(path, fmt, number_columns, partition, args.processes, start_row)
+        for row, fields, error in rows:
+            item = None
+            if not error:
+                item, error = build_import_item(create_app, schema, fields, source, row)
+            if error:
+                rejected += 1
+                if rejects:
+                    rejects.write(
+                        json.dumps({"file": source, "row": row, "error": error}) + "\n"
+                    )
+            else:
+                chunk.append(encode_item(item))
+
+            if len(chunk) >= args.chunk_size:
+                future = executor.submit(write_chunk, chunk)
+                in_flight[future] = (chunk_start, row + 1, rejected)
+                chunk, rejected, chunk_start = [], 0, row + 1
+                collect(block=len(in_flight) >= max_in_flight)
+
+            now = time.monotonic()
+            if now - last_report >= args.report_interval:
+                report()
+                checkpoint.save()
+                last_report = now
+
+        future = executor.submit(write_chunk, chunk)
+        in_flight[future] = (chunk_start, sys.maxsize, rejected)
+        while in_flight:
+            collect(block=True)
+
+    if rejects:
+        rejects.close()
+    checkpoint.save(done=True)
+    report(final=True)
+    return {**checkpoint.run, "done": checkpoint.state["done"]}
+
+
+def main():
+    args = parse_args()
+    configure(args)
+    target = "（書き込みなし）" if args.dry_run else os.environ["TABLE_NAME"]
+    print(f"一括インポート: {len(args.files)} ファイル → {target}")
+    print(f"プロセス {args.processes} × スレッド {args.workers}, チャンク {args.chunk_size} 件")
+    print("=" * 60)
+
+    tasks = [
+        (args, path, partition)
+        for path in args.files
+        for partition in range(args.processes)
+    ]
+    start = time.perf_counter()
+    if args.processes > 1:
+        with Pool(args.processes) as pool:
+            results = pool.map(import_partition, tasks)
+    else:
+        results = [import_partition(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    written = sum(r["written"] for r in results)
+    failed = sum(r["failed"] for r in results)
+    rejected = sum(r["rejected"] for r in results)
+    print("=" * 60)
+    print(f"書き込み {written} 件 / 失敗 {failed} 件 / 不正 {rejected} 件 ({elapsed:.1f} 秒)")
+    if not args.dry_run:
+        print("件数カウンターは reconcile_counters.py で再計算してください")
+    if failed:
+        print("失敗した行は同じコマンドを再実行すると、最初の失敗位置から書き直されます")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用の負荷試験ハーネス
+create / read / list / update / delete の lambda_handler を
+API Gatewayイベントで直接呼び出し、指定した並列度と比率で負荷をかけます
+
+操作ごとのスループット・p50/p95/p99レイテンシ・ステータスコード・消費キャパシティを表示し、
+結果をJSONに保存します。--baseline で以前の結果と比較できます
+
+dynamodb_local/compose.yaml のDynamoDB Localと setup_local_table.py のテーブルを使用します
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bench_common import load_handler, make_event, setup_local_env
+
+DEFAULT_MIX = "create=1,read=5,list=1,update=2,delete=1"
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(text):
+    """"create=1,read=5" 形式の比率を解析"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"不明な操作です: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, p):
+    """最近傍順位法によるパーセンタイル"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class IdPool:
+    """読み取り・更新・削除の対象となる作成済みIDの集合"""
+
+    def __init__(self):
+        self._ids = []
+        self._lock = threading.Lock()
+
+    def add(self, item_id):
+        with self._lock:
+            self._ids.append(item_id)
+
+    def pick(self):
+        with self._lock:
+            return random.choice(self._ids) if self._ids else None
+
+    def take(self):
+        with self._lock:
+            if not self._ids:
+                return None
+            index = random.randrange(len(self._ids))
+            self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+            return self._ids.pop()
+
+    def __len__(self):
+        return len(self._ids)
+
+
+def op_create(apps, pool):
+    event = make_event(
+        "POST", "/items", body={"name": f"load-{random.randrange(1000)}", "value": 1}
+    )
+    response = apps["create"].lambda_handler(event, None)
+    if response["statusCode"] == 201:
+        pool.add(json.loads(response["body"])["id"])
+    return response
+
+
+def op_read(apps, pool):
+    item_id = pool.pick() or "load-missing"
+    event = make_event("GET", f"/items/{item_id}", path_parameters={"id": item_id})
+    return apps["read"].lambda_handler(event, None)
+
+
+def op_list(apps, pool):
+    return apps["read"].lambda_handler(
+        make_event("GET", "/items", query={"limit": "50"}), None
+    )
+
+
+def op_update(apps, pool):
+    item_id = pool.pick() or "load-missing"
+    event = make_event(
+        "PUT",
+        f"/items/{item_id}",
+        body={"name": "load-updated", "value": random.randrange(1000)},
+        path_parameters={"id": item_id},
+    )
+    return apps["update"].lambda_handler(event, None)
+
+
+def op_delete(apps, pool):
+    item_id = pool.take() or "load-missing"
+    event = make_event("DELETE", f"/items/{item_id}", path_parameters={"id": item_id})
+    return apps["delete"].lambda_handler(event, None)
+
+
+OPERATIONS = {
+    "create": op_create,
+    "read": op_read,
+    "list": op_list,
+    "update": op_update,
+    "delete": op_delete,
+}
+
+
+def worker(apps, pool, mix, deadline, remaining, samples):
+    """期限または総リクエスト数に達するまで操作を繰り返す"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.monotonic() < deadline:
+        if remaining is not None:
+            with remaining["lock"]:
+                if remaining["count"] <= 0:
+                    return
+                remaining["count"] -= 1
+        name = random.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = OPERATIONS[name](apps, pool)
+            status = response["statusCode"]
+            capacity = float(response.get("headers", {}).get("X-Consumed-Capacity", 0))
+        except Exception as e:  # ハーネス側の例外も失敗として記録
+            status, capacity = f"exception:{type(e).__name__}", 0.0
+        samples.append((name, (time.perf_counter() - start) * 1000, status, capacity))
+
+
+def summarize(samples, elapsed):
+    """操作ごとの集計結果を作成"""
+    results = {}
+    groups = {}
+    for name, latency, status, capacity in samples:
+        groups.setdefault(name, []).append((latency, status, capacity))
+    groups["total"] = [(latency, status, capacity) for _, latency, status, capacity in samples]
+
+    for name, rows in groups.items():
+        latencies = sorted(latency for latency, _, _ in rows)
+        statuses = {}
+        for _, status, _ in rows:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        errors = sum(
+            count
+            for status, count in statuses.items()
+            if not status.isdigit() or int(status) >= 500
+        )
+        results[name] = {
+            "requests": len(rows),
+            "errors": errors,
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            **{f"p{p}_ms": round(percentile(latencies, p), 3) for p in PERCENTILES},
+            "max_ms": round(latencies[-1], 3),
+            "consumed_capacity": round(sum(c for _, _, c in rows), 2),
+            "status_codes": statuses,
+        }
+    return results
+
+
+def print_results(results):
+    print(
+        f"{'操作':<8} {'件数':>8} {'エラー':>6} {'rps':>9} "
+        + " ".join(f"{f'p{p}(ms)':>9}" for p in PERCENTILES)
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<8} {r['requests']:>8} {r['errors']:>6} {r['throughput_rps']:>9.1f} "
+            + " ".join(f"{r[f'p{p}_ms']:>9.2f}" for p in PERCENTILES)
+        )
+
+
+def compare(results, baseline, max_regression):
+    """ベースラインとの差分を表示し、悪化した指標を返す"""
+    print("ベースラインとの比較")
+    regressions = []
+    for name, r in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        changes = []
+        for metric in ["throughput_rps"] + [f"p{p}_ms" for p in PERCENTILES]:
+            old, new = before.get(metric), r.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            changes.append(f"{metric} {old:.2f}->{new:.2f} ({change:+.1%})")
+            # スループットは低下、レイテンシは増加を悪化とみなす
+            worse = -change if metric == "throughput_rps" else change
+            if max_regression is not None and worse > max_regression:
+                regressions.append(f"{name}.{metric}: {old:.2f} -> {new:.2f}")
+        print(f"  {name:<8} " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lambdaハンドラーの負荷試験")
+    parser.add_argument("--concurrency", type=int, default=8, help="並列スレッド数")
+    parser.add_argument("--duration", type=float, default=30, help="計測時間（秒）")
+    parser.add_argument("--requests", type=int, help="総リクエスト数（指定時は時間より優先）")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="操作の比率")
+    parser.add_argument("--seed-items", type=int, default=200, help="事前に作成するアイテム数")
+    parser.add_argument("--warmup", type=int, default=20, help="計測前のウォームアップ回数")
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--baseline", help="比較対象の結果JSONファイル")
+    parser.add_argument(
+        "--max-regression", type=float, help="許容する悪化率（0.2 = 20%%）。超えると終了コード1"
+    )
+    parser.add_argument("--verbose", action="store_true", help="ハンドラーのログを表示")
+    args = parser.parse_args()
+
+    # 呼び出しごとのEMF出力を抑止
+    os.environ.setdefault("METRICS_ENABLED", "false")
+    setup_local_env()
+    apps = {name: load_handler(name) for name in ("create", "read", "update", "delete")}
+    pool = IdPool()
+
+    log = sys.stdout if args.verbose else io.StringIO()
+    with contextlib.redirect_stdout(log):
+        for _ in range(args.seed_items):
+            op_create(apps, pool)
+        for _ in range(args.warmup):
+            op_read(apps, pool)
+
+        samples = []
+        remaining = (
+            {"count": args.requests, "lock": threading.Lock()} if args.requests else None
+        )
+        deadline = time.monotonic() + (args.duration if not args.requests else 86400)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            for _ in range(args.concurrency):
+                executor.submit(worker, apps, pool, args.mix, deadline, remaining, samples)
+        elapsed = time.perf_counter() - start
+
+    print("DynamoDB Local 負荷試験")
+    print(
+        f"並列度 {args.concurrency}, 比率 {args.mix}, "
+        f"{len(samples)} リクエスト / {elapsed:.1f} 秒"
+    )
+    print("=" * 60)
+    results = summarize(samples, elapsed)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "python": platform.python_version(),
+                    "config": {
+                        "concurrency": args.concurrency,
+                        "duration": args.duration,
+                        "requests": args.requests,
+                        "mix": args.mix,
+                        "seed_items": args.seed_items,
+                        "env": {
+                            key: value
+                            for key, value in os.environ.items()
+                            if key.startswith(("DYNAMODB_", "ITEM_CACHE_", "BATCH_"))
+                        },
+                    },
+                    "elapsed_s": round(elapsed, 3),
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"結果を保存しました: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("❌ 性能の悪化を検出しました")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        if args.max_regression is not None:
+            print("✅ ベースラインからの悪化はありません")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用の並列セグメントスキャンCLI
+Segment/TotalSegments でテーブル全体を並列にスキャンし、スループットを計測します
+セグメントごとのカーソルをファイルに保存して中断したスキャンを再開できます
+"""
+import argparse
+import json
+import os
+import time
+
+from bench_common import print_result, setup_local_env
+
+setup_local_env()
+
+from scan import parallel_scan  # noqa: E402
+from utils import get_table  # noqa: E402
+
+
+def load_cursors(path):
+    """保存済みのセグメントカーソルを読み込む"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return {int(segment): key for segment, key in json.load(f).items()}
+
+
+def save_cursors(path, cursors):
+    """未完了セグメントのカーソルを保存（完了時はファイルを削除）"""
+    if not path:
+        return
+    if cursors:
+        with open(path, "w") as f:
+            json.dump(cursors, f)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def run_scan(table, total_segments, workers, max_pages, cursor_file, limit):
+    """指定セグメント数でスキャンし、(件数, 経過時間, 未完了カーソル) を返す"""
+    cursors = load_cursors(cursor_file)
+    scan_kwargs = {"Limit": limit} if limit else {}
+
+    start = time.perf_counter()
+    items, next_cursors = parallel_scan(
+        table,
+        total_segments,
+        workers=workers or total_segments,
+        cursors=cursors,
+        max_pages=max_pages,
+        **scan_kwargs,
+    )
+    elapsed = time.perf_counter() - start
+
+    save_cursors(cursor_file, next_cursors)
+    return len(items), elapsed, next_cursors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="並列セグメントスキャン")
+    parser.add_argument(
+        "--segments",
+        default="1,4,8,16",
+        help="TotalSegmentsの値（カンマ区切りで複数指定すると順に計測）",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="スレッド数（0はセグメント数と同じ）"
+    )
+    parser.add_argument(
+        "--max-pages", type=int, default=0, help="セグメントごとの最大ページ数（0は無制限）"
+    )
+    parser.add_argument("--limit", type=int, default=0, help="1ページあたりの件数")
+    parser.add_argument(
+        "--cursor-file", help="カーソルの保存先（存在すれば続きから再開）"
+    )
+    args = parser.parse_args()
+
+    table = get_table()
+    segment_counts = [int(s) for s in args.segments.split(",")]
+    if args.cursor_file and len(segment_counts) > 1:
+        parser.error("--cursor-file は単一の --segments と組み合わせてください")
+
+    print("DynamoDB Local 並列スキャン")
+    print("=" * 50)
+    for total_segments in segment_counts:
+        count, elapsed, cursors = run_scan(
+            table,
+            total_segments,
+            args.workers,
+            args.max_pages or None,
+            args.cursor_file,
+            args.limit,
+        )
+        print_result(f"segments={total_segments}", count, elapsed)
+        if cursors:
+            print(f"未完了セグメント: {sorted(cursors)}")
+
+
+if __name__ == "__main__":
+    main()
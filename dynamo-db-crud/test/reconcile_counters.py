@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Local用の件数カウンター再計算CLI
+並列スキャン(Select=COUNT)でアイテム数を数え直し、
+シャード化されたカウンターとの差分を表示・修正します
+
+カウンターの書き換えは1トランザクションで行いますが、スキャン中の書き込みは
+反映されないため、書き込みの少ない時間帯に実行してください
+"""
+import argparse
+import time
+
+from bench_common import get_local_table, setup_local_env
+
+setup_local_env()
+
+from counters import COUNTER_SHARDS, read_count, reset_counter  # noqa: E402
+from scan import parallel_count  # noqa: E402
+from utils import get_client, get_dynamodb  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="件数カウンターの再計算")
+    parser.add_argument("--segments", type=int, default=8, help="スキャンのセグメント数")
+    parser.add_argument("--workers", type=int, default=None, help="スレッド数")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=COUNTER_SHARDS,
+        help="書き換えるシャード数（シャード数を減らした場合は以前の値を指定）",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="差分の表示のみ")
+    args = parser.parse_args()
+
+    current, unprocessed = read_count(get_dynamodb(), args.shards)
+    if unprocessed:
+        print(f"読み取れなかったシャード: {unprocessed}")
+
+    start = time.perf_counter()
+    actual = parallel_count(
+        get_local_table(), args.segments, workers=args.workers or args.segments
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"カウンター: {current} 件")
+    print(f"スキャン:   {actual} 件 ({args.segments} セグメント, {elapsed:.2f} 秒)")
+    print(f"差分:       {actual - current:+d} 件")
+
+    if args.dry_run or (actual == current and not unprocessed):
+        return
+
+    reset_counter(get_client(), actual, args.shards)
+    print(f"カウンターを {actual} 件に更新しました（{args.shards} シャード）")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,58 @@
 """
 DynamoDB Local用のテーブル作成スクリプト
 """
-import boto3
+import os
+import sys
+
 from botocore.exceptions import ClientError
 
+# 共通レイヤーのクライアントファクトリを使用
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "layers", "common-layer", "python"
+    ),
+)
+
+from clients import create_dynamodb_client as _create_client  # noqa: E402
+
 # DynamoDB Localの設定
 DYNAMODB_LOCAL_ENDPOINT = "http://localhost:8000"
 TABLE_NAME = "local-items-dev"
+COUNTER_TABLE_NAME = "local-counters-dev"
 REGION = "us-east-1"
 
+# template.yamlのItemsTableと同じGSI定義
+GLOBAL_SECONDARY_INDEXES = [
+    {
+        "IndexName": "NameIndex",
+        "KeySchema": [
+            {"AttributeName": "name", "KeyType": "HASH"},
+            {"AttributeName": "created_at", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    },
+    {
+        "IndexName": "CreatedAtIndex",
+        "KeySchema": [
+            {"AttributeName": "created_month", "KeyType": "HASH"},
+            {"AttributeName": "created_at", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    },
+]
+
+ATTRIBUTE_DEFINITIONS = [
+    {"AttributeName": "id", "AttributeType": "S"},
+    {"AttributeName": "name", "AttributeType": "S"},
+    {"AttributeName": "created_at", "AttributeType": "S"},
+    {"AttributeName": "created_month", "AttributeType": "S"},
+]
+
 
 def create_dynamodb_client():
     """DynamoDB Localクライアントを作成"""
-    return boto3.client(
-        "dynamodb",
+    return _create_client(
         endpoint_url=DYNAMODB_LOCAL_ENDPOINT,
         region_name=REGION,
         aws_access_key_id="dummy",
@@ -29,9 +68,9 @@ def create_table():
     try:
         # 既存のテーブルをチェック
         try:
-            dynamodb.describe_table(TableName=TABLE_NAME)
+            table = dynamodb.describe_table(TableName=TABLE_NAME)["Table"]
             print(f"テーブル '{TABLE_NAME}' は既に存在します")
-            return True
+            return add_missing_indexes(dynamodb, table)
         except ClientError as e:
             if e.response["Error"]["Code"] != "ResourceNotFoundException":
                 raise
@@ -40,7 +79,8 @@ def create_table():
         table_definition = {
             "TableName": TABLE_NAME,
             "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
-            "AttributeDefinitions": [{"AttributeName": "id", "AttributeType": "S"}],
+            "AttributeDefinitions": ATTRIBUTE_DEFINITIONS,
+            "GlobalSecondaryIndexes": GLOBAL_SECONDARY_INDEXES,
             "BillingMode": "PAY_PER_REQUEST",
         }
 
@@ -59,6 +99,57 @@ def create_table():
         return False
 
 
+def create_counter_table():
+    """件数カウンター用のテーブルを作成"""
+    dynamodb = create_dynamodb_client()
+
+    try:
+        try:
+            dynamodb.describe_table(TableName=COUNTER_TABLE_NAME)
+            print(f"テーブル '{COUNTER_TABLE_NAME}' は既に存在します")
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ResourceNotFoundException":
+                raise
+
+        dynamodb.create_table(
+            TableName=COUNTER_TABLE_NAME,
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        dynamodb.get_waiter("table_exists").wait(TableName=COUNTER_TABLE_NAME)
+        print(f"テーブル '{COUNTER_TABLE_NAME}' を作成しました")
+        print("既存のアイテムがある場合は reconcile_counters.py で件数を再計算してください")
+        return True
+
+    except ClientError as e:
+        print(f"テーブル作成エラー: {e}")
+        return False
+
+
+def add_missing_indexes(dynamodb, table):
+    """既存テーブルに不足しているGSIを追加"""
+    existing = {
+        index["IndexName"] for index in table.get("GlobalSecondaryIndexes", [])
+    }
+    for index in GLOBAL_SECONDARY_INDEXES:
+        if index["IndexName"] in existing:
+            continue
+        key_attributes = {key["AttributeName"] for key in index["KeySchema"]}
+        dynamodb.update_table(
+            TableName=TABLE_NAME,
+            AttributeDefinitions=[
+                a for a in ATTRIBUTE_DEFINITIONS if a["AttributeName"] in key_attributes
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
+        )
+        print(f"GSI '{index['IndexName']}' を追加しました")
+        # GSIの作成は1つずつ行う
+        dynamodb.get_waiter("table_exists").wait(TableName=TABLE_NAME)
+    return True
+
+
 def list_tables():
     """テーブル一覧を表示"""
     dynamodb = create_dynamodb_client()
@@ -76,14 +167,14 @@ def list_tables():
 if __name__ == "__main__":
     print("DynamoDB Local テーブルセットアップ")
     print(f"エンドポイント: {DYNAMODB_LOCAL_ENDPOINT}")
-    print(f"テーブル名: {TABLE_NAME}")
+    print(f"テーブル名: {TABLE_NAME}, {COUNTER_TABLE_NAME}")
     print("-" * 50)
 
     # 現在のテーブル一覧を表示
     list_tables()
 
     # テーブル作成
-    if create_table():
+    if create_table() and create_counter_table():
         print("セットアップ完了!")
         list_tables()
     else:
@@ -0,0 +1,101 @@
+"""
+長い文字列属性の圧縮（保存時）と展開（読み込み時）
+"""
+import json
+import string
+
+import pytest
+from boto3.dynamodb.types import Binary
+
+from attributes import (
+    COMPRESSED_PREFIX,
+    decode_item,
+    decode_value,
+    encode_item,
+    encode_value,
+    may_be_compressed,
+    stored_size,
+)
+from read import app as read_app
+
+LONG_TEXT = "DynamoDB stores this description compressed. " * 100
+
+
+@pytest.mark.parametrize("text", [LONG_TEXT, "説明文です。" * 300])
+def test_long_string_round_trip(text):
+    stored = encode_value("description", text, min_bytes=1024)
+    assert isinstance(stored, bytes)
+    assert stored.startswith(COMPRESSED_PREFIX)
+    assert len(stored) < len(text.encode("utf-8"))
+    assert decode_value(stored) == text
+    # リソースAPIは Binary で返す
+    assert decode_value(Binary(stored)) == text
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("description", "short"),
+        ("description", 12345),
+        ("tags", [LONG_TEXT]),
+        # キー・インデックスの属性は圧縮しない
+        ("name", LONG_TEXT),
+        ("created_month", LONG_TEXT),
+    ],
+)
+def test_values_kept_as_is(key, value):
+    assert encode_value(key, value, min_bytes=1024) is value
+
+
+def test_incompressible_string_kept_as_is():
+    # 圧縮しても縮まない値（zlibのヘッダー分だけ大きくなる）
+    text = string.ascii_letters
+    assert encode_value("description", text, min_bytes=16) == text
+
+
+def test_compression_disabled():
+    assert encode_value("description", LONG_TEXT, min_bytes=0) is LONG_TEXT
+
+
+def test_other_binary_values_pass_through():
+    raw = Binary(b"\x00\x01 not compressed")
+    assert decode_value(raw) is raw
+    assert decode_value(b"plain") == b"plain"
+
+
+def test_item_round_trip():
+    item = {"id": "a", "name": LONG_TEXT, "description": LONG_TEXT, "count": 3}
+    stored = encode_item(item, min_bytes=1024)
+    assert stored["name"] == LONG_TEXT
+    assert isinstance(stored["description"], bytes)
+    assert stored_size(stored) < stored_size(item)
+    assert decode_item(stored) == item
+    assert decode_item(None) is None
+
+
+def test_may_be_compressed():
+    assert may_be_compressed("description")
+    assert not may_be_compressed("id")
+    assert not may_be_compressed("name")
+
+
+def test_get_item_returns_inflated_string(table_stub):
+    table_stub.add_response(
+        "get_item",
+        {
+            "Item": {
+                "id": {"S": "compressed-item"},
+                "description": {"B": encode_value("description", LONG_TEXT, 1024)},
+            }
+        },
+    )
+    response = read_app.lambda_handler(
+        {
+            "httpMethod": "GET",
+            "resource": "/items/{id}",
+            "pathParameters": {"id": "compressed-item"},
+            "queryStringParameters": {"consistent": "true"},
+        },
+        None,
+    )
+    assert json.loads(response["body"]) == {"id": "compressed-item", "description": LONG_TEXT}
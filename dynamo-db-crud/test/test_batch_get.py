@@ -0,0 +1,69 @@
+"""
+BatchGetItem の UnprocessedKeys の再送と、複数取得での順序の維持
+"""
+import json
+
+import utils
+from batch import batch_get_items
+from read import app as read_app
+
+
+def keys(ids):
+    return {"Keys": [{"id": item_id} for item_id in ids]}
+
+
+def test_get_retries_unprocessed_keys(table_stub):
+    table_stub.add_response(
+        "batch_get_item",
+        {
+            "Responses": {"test-items": [{"id": {"S": "a"}}]},
+            "UnprocessedKeys": {"test-items": {"Keys": [{"id": {"S": "b"}}]}},
+        },
+        {"RequestItems": {"test-items": keys(["a", "b", "c"])}},
+    )
+    table_stub.add_response(
+        "batch_get_item",
+        {"Responses": {"test-items": [{"id": {"S": "b"}}]}},
+        {"RequestItems": {"test-items": keys(["b"])}},
+    )
+    # 重複したidは1回だけ要求する
+    found, unprocessed = batch_get_items(
+        utils.get_table(), ["a", "b", "a", "c"], max_workers=1, sleep=lambda s: None
+    )
+    assert found == {"a": {"id": "a"}, "b": {"id": "b"}}
+    assert unprocessed == []
+
+
+def test_get_reports_keys_left_unprocessed(table_stub):
+    response = {
+        "Responses": {"test-items": []},
+        "UnprocessedKeys": {"test-items": {"Keys": [{"id": {"S": "a"}}]}},
+    }
+    table_stub.add_response("batch_get_item", response)
+    found, unprocessed = batch_get_items(
+        utils.get_table(), ["a"], max_retries=0, sleep=lambda s: None
+    )
+    assert (found, unprocessed) == ({}, ["a"])
+
+
+def test_multi_get_keeps_requested_order(table_stub):
+    # BatchGetItem の応答は順不同
+    table_stub.add_response(
+        "batch_get_item",
+        {
+            "Responses": {
+                "test-items": [{"id": {"S": "b"}}, {"id": {"S": "c"}}, {"id": {"S": "a"}}]
+            }
+        },
+    )
+    response = read_app.lambda_handler(
+        {
+            "httpMethod": "GET",
+            "resource": "/items",
+            "queryStringParameters": {"ids": "c,a,missing,b"},
+        },
+        None,
+    )
+    body = json.loads(response["body"])
+    assert [item["id"] for item in body["items"]] == ["c", "a", "b"]
+    assert body["missing"] == ["missing"]
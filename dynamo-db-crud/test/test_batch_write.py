@@ -0,0 +1,91 @@
+"""
+BatchWriteItem のチャンク分割と UnprocessedItems の再送、一括作成での順序の維持
+"""
+import json
+
+from botocore.stub import ANY
+
+import batch
+import utils
+from batch import batch_write_items
+from create import app as create_app
+
+
+def put(item_id):
+    return {"PutRequest": {"Item": {"id": item_id}}}
+
+
+def write_params(ids):
+    return {"RequestItems": {"test-items": [put(item_id) for item_id in ids]}}
+
+
+def unprocessed_items(ids):
+    # 応答は低レベルAPIの形式
+    requests = [{"PutRequest": {"Item": {"id": {"S": item_id}}}} for item_id in ids]
+    return {"UnprocessedItems": {"test-items": requests}}
+
+
+def test_write_splits_chunks_and_retries_unprocessed(table_stub):
+    ids = [f"item-{i}" for i in range(30)]
+    table_stub.add_response(
+        "batch_write_item", unprocessed_items(ids[3:5]), write_params(ids[:25])
+    )
+    # 未処理の2件だけを再送する
+    table_stub.add_response("batch_write_item", {}, write_params(ids[3:5]))
+    table_stub.add_response("batch_write_item", {}, write_params(ids[25:]))
+
+    delays = []
+    results = batch_write_items(
+        utils.get_table(), [{"id": i} for i in ids], sleep=delays.append, concurrency=1
+    )
+    assert results == {item_id: None for item_id in ids}
+    assert len(delays) == 1
+
+
+def test_write_gives_up_after_max_retries(table_stub):
+    table_stub.add_response("batch_write_item", unprocessed_items(["b"]))
+    table_stub.add_response("batch_write_item", unprocessed_items(["b"]))
+    results = batch_write_items(
+        utils.get_table(), [{"id": "a"}, {"id": "b"}], max_retries=1, sleep=lambda s: None
+    )
+    assert results == {"a": None, "b": "UnprocessedItems"}
+
+
+def test_write_error_fails_whole_chunk(table_stub):
+    table_stub.add_client_error("batch_write_item", service_error_code="ValidationException")
+    results = batch_write_items(utils.get_table(), [{"id": "a"}, {"id": "b"}])
+    assert results == {"a": "ValidationException", "b": "ValidationException"}
+
+
+def test_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(batch.random, "uniform", lambda a, b: b)
+    assert batch.backoff_delay(0, base=0.05, cap=2) == 0.05
+    assert batch.backoff_delay(10, base=0.05, cap=2) == 2
+
+
+def test_batch_create_reports_each_entry_in_order(table_stub, client_stub):
+    table_stub.add_response(
+        "batch_write_item", {}, {"RequestItems": {"test-items": [ANY, ANY, ANY]}}
+    )
+    client_stub.add_response("update_item", {})
+
+    response = create_app.create_items_batch(
+        {
+            "body": json.dumps(
+                [{"name": "A"}, {"name": ""}, {"name": "B"}, {"name": "C"}]
+            ),
+            "headers": {},
+        }
+    )
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 207
+    assert [r["index"] for r in body["results"]] == [0, 1, 2, 3]
+    # 検証エラーの1件以外は書き込まれた
+    assert [r["status"] for r in body["results"]] == [
+        "created",
+        "failed",
+        "created",
+        "created",
+    ]
+    assert body["results"][1]["error"] == "Field 'name' must not be empty"
+    assert (body["succeeded"], body["failed"]) == (3, 1)
@@ -0,0 +1,145 @@
+"""
+アイテムキャッシュ（TTL・LRUでの追い出し・否定キャッシュ）と
+GET /items/{id} でのキャッシュの使い方
+"""
+import json
+
+import pytest
+from botocore.stub import ANY
+
+import cache
+from read import app as read_app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_entry_expires_after_ttl(clock):
+    item_cache = cache.ItemCache(10, ttl=30, negative_ttl=5, clock=clock)
+    item_cache.put("a", {"id": "a", "updated_at": "t"})
+    clock.now = 29.9
+    assert item_cache.get("a") == (True, {"id": "a", "updated_at": "t"})
+    clock.now = 30
+    assert item_cache.get("a") == (False, None)
+    assert item_cache.stats() == {"size": 0, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_missing_item_uses_negative_ttl(clock):
+    item_cache = cache.ItemCache(10, ttl=30, negative_ttl=5, clock=clock)
+    item_cache.put("gone", None)
+    assert item_cache.get("gone") == (True, None)
+    clock.now = 5
+    assert item_cache.get("gone") == (False, None)
+
+
+def test_negative_cache_can_be_disabled(clock):
+    item_cache = cache.ItemCache(10, ttl=30, negative_ttl=0, clock=clock)
+    item_cache.put("gone", None)
+    assert item_cache.get("gone") == (False, None)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    item_cache = cache.ItemCache(2, ttl=30, negative_ttl=5, clock=clock)
+    item_cache.put("a", {"id": "a"})
+    item_cache.put("b", {"id": "b"})
+    # a を読むと b が最も古くなる
+    item_cache.get("a")
+    item_cache.put("c", {"id": "c"})
+    assert item_cache.get("b") == (False, None)
+    assert item_cache.get("a")[0] and item_cache.get("c")[0]
+    assert item_cache.stats()["evictions"] == 1
+
+
+def test_invalidate(clock):
+    item_cache = cache.ItemCache(10, ttl=30, negative_ttl=5, clock=clock)
+    item_cache.put("a", {"id": "a"})
+    item_cache.invalidate("a")
+    item_cache.invalidate("missing")
+    assert item_cache.get("a") == (False, None)
+
+
+@pytest.mark.parametrize("size, ttl", [(0, 30), (10, 0)])
+def test_disabled_cache(size, ttl):
+    item_cache = cache.ItemCache(size, ttl, negative_ttl=5)
+    assert not item_cache.enabled
+    item_cache.put("a", {"id": "a"})
+    assert item_cache.get("a") == (False, None)
+
+
+@pytest.fixture
+def item_cache(monkeypatch, clock):
+    fresh = cache.ItemCache(10, ttl=30, negative_ttl=5, clock=clock)
+    monkeypatch.setattr(read_app, "get_item_cache", lambda: fresh)
+    return fresh
+
+
+def stored():
+    # 応答は読み込み時に書き換えられるため毎回作る
+    return {"id": {"S": "a"}, "name": {"S": "Item"}, "price": {"N": "3"}}
+
+
+def get_event(**params):
+    return {
+        "httpMethod": "GET",
+        "resource": "/items/{id}",
+        "pathParameters": {"id": "a"},
+        "queryStringParameters": params or None,
+    }
+
+
+def test_get_item_is_cached(table_stub, item_cache):
+    table_stub.add_response("get_item", {"Item": stored()})
+    first = read_app.lambda_handler(get_event(), None)
+    # 2回目はDynamoDBを呼ばない（Stubberに応答が残っていれば失敗する）
+    second = read_app.lambda_handler(get_event(), None)
+    assert first["statusCode"] == second["statusCode"] == 200
+    assert json.loads(first["body"]) == json.loads(second["body"])
+
+
+def test_projected_miss_reads_only_requested_fields(table_stub, item_cache):
+    table_stub.add_response(
+        "get_item",
+        {"Item": {"id": {"S": "a"}, "name": {"S": "Item"}}},
+        {
+            "TableName": "test-items",
+            "Key": ANY,
+            "ConsistentRead": False,
+            "ProjectionExpression": "#f0, #f1",
+            "ExpressionAttributeNames": {"#f0": "id", "#f1": "name"},
+        },
+    )
+    response = read_app.lambda_handler(get_event(fields="name"), None)
+    assert json.loads(response["body"]) == {"id": "a", "name": "Item"}
+    # 射影した結果はキャッシュしない
+    assert item_cache.stats()["size"] == 0
+
+
+def test_projected_hit_is_served_from_cache(table_stub, item_cache):
+    table_stub.add_response("get_item", {"Item": stored()})
+    read_app.lambda_handler(get_event(), None)
+
+    response = read_app.lambda_handler(get_event(fields="price"), None)
+    assert json.loads(response["body"]) == {"id": "a", "price": 3}
+
+
+def test_consistent_read_bypasses_cache(table_stub, item_cache):
+    table_stub.add_response("get_item", {"Item": stored()})
+    read_app.lambda_handler(get_event(), None)
+
+    table_stub.add_response(
+        "get_item",
+        {"Item": stored()},
+        {"TableName": "test-items", "Key": ANY, "ConsistentRead": True},
+    )
+    response = read_app.lambda_handler(get_event(consistent="true"), None)
+    assert response["statusCode"] == 200
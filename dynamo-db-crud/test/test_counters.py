@@ -0,0 +1,124 @@
+"""
+シャード分割した件数カウンターの増減と再計算（reconcile）
+"""
+import json
+import random
+
+import pytest
+from botocore.stub import ANY
+
+import counters
+import utils
+from create import app as create_app
+from delete import app as delete_app
+
+
+def shard_update(shard, delta):
+    return {
+        "TableName": "test-counters",
+        "Key": {"id": {"S": f"items#{shard}"}},
+        "UpdateExpression": "ADD #count :delta",
+        "ExpressionAttributeNames": {"#count": "item_count"},
+        "ExpressionAttributeValues": {":delta": {"N": str(delta)}},
+    }
+
+
+@pytest.fixture
+def shard_two(monkeypatch):
+    """ランダムに選ばれるシャードを items#2 に固定"""
+    monkeypatch.setattr(random, "randrange", lambda n: 2)
+
+
+def test_counter_update_action():
+    assert counters.counter_update(-1, shard=3) == {"Update": shard_update(3, -1)}
+
+
+def test_counter_update_uses_every_shard():
+    keys = {
+        counters.counter_update(1)["Update"]["Key"]["id"]["S"] for _ in range(500)
+    }
+    assert keys == {f"items#{shard}" for shard in range(counters.COUNTER_SHARDS)}
+
+
+def test_create_increments_in_same_transaction(client_stub, shard_two):
+    client_stub.add_response(
+        "transact_write_items",
+        {},
+        {"TransactItems": [ANY, {"Update": shard_update(2, 1)}]},
+    )
+    response = create_app.create_item({"body": json.dumps({"name": "Item"})})
+    assert response["statusCode"] == 201
+
+
+def test_delete_decrements_in_same_transaction(client_stub, shard_two):
+    client_stub.add_response(
+        "transact_write_items",
+        {},
+        {"TransactItems": [ANY, {"Update": shard_update(2, -1)}]},
+    )
+    response = delete_app.delete_item({"headers": {}}, "item-1")
+    assert response["statusCode"] == 200
+
+
+def test_batch_delete_decrements_once(client_stub, shard_two):
+    for _ in range(2):
+        client_stub.add_response("delete_item", {})
+    client_stub.add_client_error(
+        "delete_item", service_error_code="ConditionalCheckFailedException"
+    )
+    # 削除できた2件分をまとめて減らす
+    client_stub.add_response("update_item", {}, shard_update(2, -2))
+    response = delete_app.delete_items_batch(
+        {"body": json.dumps(["a", "b", "missing"]), "headers": {}}
+    )
+    assert response["statusCode"] == 207
+    assert json.loads(response["body"])["succeeded"] == 2
+
+
+def test_add_to_counter(client_stub, shard_two):
+    client_stub.add_response("update_item", {}, shard_update(2, 25))
+    counters.add_to_counter(utils.get_client(), 25)
+
+
+def test_read_count_sums_shards(table_stub):
+    table_stub.add_response(
+        "batch_get_item",
+        {
+            "Responses": {
+                "test-counters": [
+                    {"id": {"S": "items#0"}, "item_count": {"N": "5"}},
+                    {"id": {"S": "items#2"}, "item_count": {"N": "-2"}},
+                ]
+            }
+        },
+    )
+    # 未作成のシャード（items#1）は0件として数える
+    assert counters.read_count(utils.get_dynamodb(), shards=3) == (3, [])
+
+
+def test_reset_counter_puts_total_on_first_shard(client_stub):
+    client_stub.add_response(
+        "transact_write_items",
+        {},
+        {
+            "TransactItems": [
+                {
+                    "Put": {
+                        "TableName": "test-counters",
+                        "Item": {
+                            "id": {"S": f"items#{shard}"},
+                            "item_count": {"N": str(42 if shard == 0 else 0)},
+                        },
+                    }
+                }
+                for shard in range(3)
+            ]
+        },
+    )
+    counters.reset_counter(utils.get_client(), 42, shards=3)
+
+
+@pytest.mark.parametrize("shards", [0, counters.MAX_COUNTER_SHARDS + 1])
+def test_reset_counter_rejects_shard_count(shards):
+    with pytest.raises(ValueError):
+        counters.reset_counter(utils.get_client(), 1, shards=shards)
@@ -0,0 +1,185 @@
+"""
+ページングカーソルの署名・検証、フィルターのプレースホルダーと
+カーソルでの次ページの取得
+"""
+import base64
+import json
+
+import pytest
+
+import cursor
+from read import app as read_app
+from utils import parse_filters
+
+KEY = {"id": "item-1", "created_month": "2024-01"}
+
+
+def decode_raw(token):
+    return bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+
+
+def encode_raw(raw):
+    return base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode("ascii")
+
+
+def test_round_trip():
+    token = cursor.encode_cursor(KEY, "where.color=red")
+    assert set(token) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+    assert cursor.decode_cursor(token, "where.color=red") == KEY
+
+
+@pytest.mark.parametrize("position", [0, 1, -1])
+def test_tampered_token_rejected(position):
+    # 0: バージョン, 1: MAC, -1: ペイロード
+    raw = decode_raw(cursor.encode_cursor(KEY))
+    raw[position] ^= 0x01
+    with pytest.raises(ValueError):
+        cursor.decode_cursor(encode_raw(raw))
+
+
+def test_other_context_rejected():
+    token = cursor.encode_cursor(KEY, "where.color=red")
+    with pytest.raises(ValueError):
+        cursor.decode_cursor(token, "where.color=blue")
+
+
+@pytest.mark.parametrize("token", ["", "!!!", "a"])
+def test_malformed_token_rejected(token):
+    with pytest.raises(ValueError):
+        cursor.decode_cursor(token)
+
+
+def test_other_secret_rejected(monkeypatch):
+    token = cursor.encode_cursor(KEY)
+    monkeypatch.setenv("CURSOR_SECRET", "another-cursor-secret")
+    with pytest.raises(ValueError):
+        cursor.decode_cursor(token)
+
+
+def test_missing_secret_fails_closed(monkeypatch):
+    monkeypatch.delenv("CURSOR_SECRET")
+    with pytest.raises(RuntimeError):
+        cursor.encode_cursor(KEY)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (KEY, True),
+        ({"id": "a", "n": 3}, True),
+        ({}, False),
+        ([1, 2], False),
+        ("id", False),
+        ({"id": {"S": "a"}}, False),
+        ({"id": True}, False),
+        (None, False),
+    ],
+)
+def test_is_key(value, expected):
+    assert cursor.is_key(value) is expected
+
+
+def test_parse_filters_placeholders():
+    kwargs, context, error = parse_filters(
+        {
+            "where.color": "red",
+            "prefix.name": "It",
+            "created_from": "2024-01-01",
+            "limit": "10",
+        }
+    )
+    assert error is None
+    # パラメーター名の順に番号を振る
+    assert kwargs == {
+        "FilterExpression": "#k0 >= :v0 AND begins_with(#k1, :v1) AND #k2 = :v2",
+        "ExpressionAttributeNames": {"#k0": "created_at", "#k1": "name", "#k2": "color"},
+        "ExpressionAttributeValues": {":v0": "2024-01-01", ":v1": "It", ":v2": "red"},
+    }
+    assert context == "created_from=2024-01-01&prefix.name=It&where.color=red"
+
+
+def test_parse_filters_without_filters():
+    assert parse_filters({"limit": "10"}) == ({}, "", None)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {f"where.a{i}": "x" for i in range(11)},
+        {"prefix.description": "Long"},
+        {"where.description": "x" * 1024},
+    ],
+)
+def test_parse_filters_rejected(params):
+    kwargs, context, error = parse_filters(params)
+    assert kwargs is None
+    assert error["statusCode"] == 400
+
+
+def list_event(**params):
+    return {"httpMethod": "GET", "resource": "/items", "queryStringParameters": params}
+
+
+def stored(item_id):
+    return {
+        "id": {"S": item_id},
+        "name": {"S": "Widget"},
+        "created_at": {"S": "2024-01-15T00:00:00"},
+    }
+
+
+def test_name_query_cursor_fetches_next_page(table_stub):
+    # 名前での検索は月を持たないカーソル（b, f が None）を返す
+    table_stub.add_response(
+        "query", {"Items": [stored("a")], "LastEvaluatedKey": stored("a")}
+    )
+    table_stub.add_response("query", {"Items": [stored("b")]})
+
+    first = read_app.lambda_handler(list_event(name="Widget", limit="1"), None)
+    assert first["statusCode"] == 200
+    token = json.loads(first["body"])["cursor"]
+
+    second = read_app.lambda_handler(
+        list_event(name="Widget", limit="1", cursor=token), None
+    )
+    assert second["statusCode"] == 200
+    body = json.loads(second["body"])
+    assert [item["id"] for item in body["items"]] == ["b"]
+    assert body["has_more"] is False
+
+
+@pytest.mark.parametrize(
+    "params, state",
+    [
+        # 名前での検索に月が入っている
+        ({"name": "Widget"}, {"b": "2024-01", "f": "2024-01", "k": None}),
+        # order=newest に月がない
+        ({"order": "newest"}, {"b": None, "f": None, "k": None}),
+        ({"order": "newest"}, {"b": "2024-01", "f": "2023-01", "k": [1]}),
+    ],
+)
+def test_query_cursor_with_wrong_state_rejected(params, state):
+    context = f"query:{params.get('name', '')}::"
+    token = cursor.encode_cursor(state, context)
+    response = read_app.lambda_handler(list_event(cursor=token, **params), None)
+    assert response["statusCode"] == 400
+
+
+def test_scan_page_keeps_deprecated_last_key(table_stub):
+    table_stub.add_response(
+        "scan", {"Items": [stored("a")], "LastEvaluatedKey": {"id": {"S": "a"}}}
+    )
+    table_stub.add_response("scan", {"Items": [stored("b")]})
+
+    first = read_app.lambda_handler(list_event(limit="1"), None)
+    body = json.loads(first["body"])
+    assert body["last_key"] == {"id": "a"}
+
+    # 旧形式の last_key でも次のページを取得できる
+    second = read_app.lambda_handler(
+        list_event(limit="1", last_key=json.dumps(body["last_key"])), None
+    )
+    assert second["statusCode"] == 200
+    assert [item["id"] for item in json.loads(second["body"])["items"]] == ["b"]
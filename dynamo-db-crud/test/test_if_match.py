@@ -0,0 +1,169 @@
+"""
+If-Match の解析と、バージョン不一致時の412（更新・削除）
+"""
+import json
+
+import pytest
+from botocore.stub import ANY
+
+import utils
+from delete import app as delete_app
+from update import app as update_app
+
+LEGACY_ITEM = {"id": "item-1", "name": "Old", "updated_at": "2024-01-01T00:00:00"}
+
+
+def if_match_event(value, body=None):
+    return {"headers": {"If-Match": value}, "body": json.dumps(body or {"name": "New"})}
+
+
+def stored_item(version):
+    return {
+        "id": {"S": "item-1"},
+        "name": {"S": "New"},
+        "updated_at": {"S": "2024-02-01T00:00:00"},
+        "version": {"N": str(version)},
+    }
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [('"3"', 3), ('W/"3"', 3), ("3", 3), (' "12" ', 12)],
+)
+def test_parse_if_match_versions(value, expected):
+    assert utils.parse_if_match(if_match_event(value)) == (expected, None)
+
+
+def test_parse_if_match_absent_and_case_insensitive():
+    assert utils.parse_if_match({"headers": {}}) == (None, None)
+    assert utils.parse_if_match(if_match_event("*")) == (None, None)
+    assert utils.parse_if_match(if_match_event(" * ")) == (None, None)
+    assert utils.parse_if_match({"headers": {"if-match": '"7"'}}) == (7, None)
+
+
+def test_parse_if_match_hash_etag():
+    etag = utils.item_etag(LEGACY_ITEM)
+    assert utils.parse_if_match(if_match_event(etag)) == (etag, None)
+    assert utils.parse_if_match(if_match_event("W/" + etag)) == (etag, None)
+
+
+@pytest.mark.parametrize("value", ["abc", '"1.5"', '"abcdef"', '"*"', "W/*"])
+def test_parse_if_match_rejects_other_values(value):
+    version, error = utils.parse_if_match(if_match_event(value))
+    assert version is None
+    assert error["statusCode"] == 400
+
+
+def test_update_with_matching_version(table_stub):
+    table_stub.add_response(
+        "update_item",
+        {"Attributes": stored_item(4)},
+        {
+            "TableName": "test-items",
+            "Key": ANY,
+            "ReturnValues": "ALL_NEW",
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+            "UpdateExpression": ANY,
+            "ConditionExpression": "attribute_exists(id) AND #version = :expected_version",
+            "ExpressionAttributeNames": ANY,
+            "ExpressionAttributeValues": ANY,
+        },
+    )
+    response = update_app.update_item(if_match_event('"3"'), "item-1")
+    assert response["statusCode"] == 200
+    assert response["headers"]["ETag"] == '"4"'
+
+
+def test_update_with_wildcard_skips_version_check(table_stub):
+    table_stub.add_response(
+        "update_item",
+        {"Attributes": stored_item(4)},
+        {
+            "TableName": "test-items",
+            "Key": ANY,
+            "ReturnValues": "ALL_NEW",
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+            "UpdateExpression": ANY,
+            "ConditionExpression": "attribute_exists(id)",
+            "ExpressionAttributeNames": ANY,
+            "ExpressionAttributeValues": ANY,
+        },
+    )
+    response = update_app.update_item(if_match_event("*"), "item-1")
+    assert response["statusCode"] == 200
+
+
+def test_update_version_mismatch_returns_412(table_stub):
+    table_stub.add_client_error(
+        "update_item",
+        service_error_code="ConditionalCheckFailedException",
+        http_status_code=400,
+        modeled_fields={"Item": stored_item(5)},
+    )
+    response = update_app.update_item(if_match_event('"3"'), "item-1")
+    assert response["statusCode"] == 412
+
+
+def test_update_missing_item_returns_404(table_stub):
+    table_stub.add_client_error(
+        "update_item",
+        service_error_code="ConditionalCheckFailedException",
+        http_status_code=400,
+    )
+    response = update_app.update_item(if_match_event('"3"'), "item-1")
+    assert response["statusCode"] == 404
+
+
+def test_update_with_legacy_etag_pins_updated_at(table_stub):
+    table_stub.add_response(
+        "get_item",
+        {"Item": {"id": {"S": "item-1"}, "updated_at": {"S": LEGACY_ITEM["updated_at"]}}},
+    )
+    table_stub.add_response(
+        "update_item",
+        {"Attributes": stored_item(1)},
+        {
+            "TableName": "test-items",
+            "Key": ANY,
+            "ReturnValues": "ALL_NEW",
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+            "UpdateExpression": ANY,
+            "ConditionExpression": (
+                "attribute_exists(id) AND attribute_not_exists(#version)"
+                " AND #updated_at = :expected_updated_at"
+            ),
+            "ExpressionAttributeNames": ANY,
+            "ExpressionAttributeValues": ANY,
+        },
+    )
+    response = update_app.update_item(
+        if_match_event(utils.item_etag(LEGACY_ITEM)), "item-1"
+    )
+    assert response["statusCode"] == 200
+
+
+def test_update_with_stale_legacy_etag_returns_412(table_stub):
+    table_stub.add_response(
+        "get_item",
+        {"Item": {"id": {"S": "item-1"}, "updated_at": {"S": "2024-03-01T00:00:00"}}},
+    )
+    response = update_app.update_item(
+        if_match_event(utils.item_etag(LEGACY_ITEM)), "item-1"
+    )
+    assert response["statusCode"] == 412
+
+
+def test_delete_version_mismatch_returns_412(client_stub):
+    client_stub.add_client_error(
+        "transact_write_items",
+        service_error_code="TransactionCanceledException",
+        http_status_code=400,
+        modeled_fields={
+            "CancellationReasons": [
+                {"Code": "ConditionalCheckFailed", "Item": stored_item(5)},
+                {"Code": "None"},
+            ]
+        },
+    )
+    response = delete_app.delete_item({"headers": {"If-Match": '"3"'}}, "item-1")
+    assert response["statusCode"] == 412
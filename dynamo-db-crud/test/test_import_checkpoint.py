@@ -0,0 +1,84 @@
+"""
+一括インポートのチェックポイント（順不同に完了するチャンクと失敗したチャンク）
+"""
+import json
+
+import import_items
+from bench_common import load_handler
+from import_items import Checkpoint
+from schema import get_item_schema
+
+
+def test_chunks_completed_out_of_order(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "c.json"))
+    checkpoint.complete(100, 200, 95, 0, 5)
+    checkpoint.complete(200, 300, 100, 0, 0)
+    # 先頭のチャンクが終わるまでは進めない
+    assert checkpoint.state["next_row"] == 0
+    assert checkpoint.state["written"] == 0
+
+    checkpoint.complete(0, 100, 100, 0, 0)
+    assert checkpoint.state["next_row"] == 300
+    assert checkpoint.state["written"] == 295
+    assert checkpoint.state["rejected"] == 5
+    assert checkpoint.pending == {}
+
+
+def test_gap_keeps_later_chunks_pending(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "c.json"))
+    checkpoint.complete(0, 100, 100, 0, 0)
+    checkpoint.complete(200, 300, 100, 0, 0)
+    assert checkpoint.state["next_row"] == 100
+    assert list(checkpoint.pending) == [200]
+    assert checkpoint.run == {"written": 200, "failed": 0, "rejected": 0}
+
+
+def test_failed_chunk_stops_next_row(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "c.json"))
+    checkpoint.complete(100, 200, 90, 10, 0)
+    checkpoint.complete(0, 100, 100, 0, 0)
+    checkpoint.complete(200, 300, 100, 0, 0)
+    # 失敗を含むチャンクから再実行する
+    assert checkpoint.state["next_row"] == 100
+    assert checkpoint.state["written"] == 100
+    assert checkpoint.run == {"written": 290, "failed": 10, "rejected": 0}
+
+    checkpoint.save(done=True)
+    with open(checkpoint.path) as f:
+        saved = json.load(f)
+    assert saved["next_row"] == 100
+    assert saved["failed"] == 10
+    assert saved["done"] is False
+
+
+def test_resume_and_restart(tmp_path):
+    path = str(tmp_path / "c.json")
+    checkpoint = Checkpoint(path)
+    checkpoint.complete(0, 100, 100, 0, 0)
+    checkpoint.save()
+
+    resumed = Checkpoint(path)
+    assert resumed.state["next_row"] == 100
+    resumed.complete(100, 200, 100, 0, 0)
+    assert resumed.state["written"] == 200
+    assert resumed.run["written"] == 100
+
+    assert Checkpoint(path, restart=True).state["next_row"] == 0
+
+
+def test_import_ids_depend_on_source_and_row(monkeypatch):
+    # load_handler は DynamoDB Local のエンドポイントを既定値にするため空にしておく
+    monkeypatch.setenv("DYNAMODB_ENDPOINT_URL", "")
+    create_app = load_handler("create")
+    schema = get_item_schema()
+
+    def item_id(source, row):
+        item, error = import_items.build_import_item(
+            create_app, schema, {"name": "Item"}, source, row
+        )
+        assert error is None
+        return item["id"]
+
+    assert item_id("/data/a/items.ndjson", 1) == item_id("/data/a/items.ndjson", 1)
+    assert item_id("/data/a/items.ndjson", 1) != item_id("/data/a/items.ndjson", 2)
+    assert item_id("/data/a/items.ndjson", 1) != item_id("/data/b/items.ndjson", 1)
@@ -15,13 +15,20 @@ os.environ["AWS_SECRET_ACCESS_KEY"] = "dummy"
 os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 os.environ["TABLE_NAME"] = "local-items-dev"
 
-# boto3をインポートしてDynamoDB Localクライアントを作成
-import boto3
 from botocore.exceptions import ClientError
 
+# 共通レイヤーのクライアントファクトリを使用
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "layers", "common-layer", "python"
+    ),
+)
+
+from clients import create_dynamodb_resource  # noqa: E402
+
 # DynamoDB Localリソースを作成
-dynamodb = boto3.resource(
-    "dynamodb",
+dynamodb = create_dynamodb_resource(
     endpoint_url="http://localhost:8000",
     region_name="us-east-1",
     aws_access_key_id="dummy",
@@ -0,0 +1,61 @@
+"""
+fields= による射影（ProjectionExpression の組み立てと GET /items/{id} での利用）
+"""
+import json
+
+from botocore.stub import ANY
+
+from read import app as read_app
+from utils import MAX_PROJECTION_FIELDS, parse_projection
+
+
+def test_parse_projection_placeholders():
+    kwargs, error = parse_projection({"fields": "name, description,name"})
+    assert error is None
+    # id は常に含め、重複は1つにまとめる
+    assert kwargs == {
+        "ProjectionExpression": "#f0, #f1, #f2",
+        "ExpressionAttributeNames": {"#f0": "id", "#f1": "name", "#f2": "description"},
+    }
+
+
+def test_parse_projection_without_fields():
+    assert parse_projection({}) == ({}, None)
+    assert parse_projection(None) == ({}, None)
+    assert parse_projection({"fields": " , "}) == (
+        {"ProjectionExpression": "#f0", "ExpressionAttributeNames": {"#f0": "id"}},
+        None,
+    )
+
+
+def test_parse_projection_limits():
+    fields = ",".join(f"f{i}" for i in range(MAX_PROJECTION_FIELDS))
+    kwargs, error = parse_projection({"fields": fields})
+    assert kwargs is None
+    assert error["statusCode"] == 400
+
+
+def test_multi_get_sends_projection(table_stub):
+    table_stub.add_response(
+        "batch_get_item",
+        {"Responses": {"test-items": [{"id": {"S": "a"}, "name": {"S": "Item"}}]}},
+        {
+            "RequestItems": {
+                "test-items": {
+                    "Keys": ANY,
+                    "ProjectionExpression": "#f0, #f1",
+                    "ExpressionAttributeNames": {"#f0": "id", "#f1": "name"},
+                }
+            }
+        },
+    )
+    response = read_app.lambda_handler(
+        {
+            "httpMethod": "GET",
+            "resource": "/items",
+            "queryStringParameters": {"ids": "a", "fields": "name"},
+        },
+        None,
+    )
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["items"] == [{"id": "a", "name": "Item"}]
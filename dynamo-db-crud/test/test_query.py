@@ -0,0 +1,148 @@
+"""
+インデックスでの検索（name / order=newest）のページングと月のパーティションの走査
+"""
+import json
+
+from botocore.stub import ANY
+
+import cursor
+from read import app as read_app
+
+
+def list_event(**params):
+    return {"httpMethod": "GET", "resource": "/items", "queryStringParameters": params}
+
+
+def stored(item_id, created_at="2024-03-15T00:00:00"):
+    return {"id": {"S": item_id}, "name": {"S": "Widget"}, "created_at": {"S": created_at}}
+
+
+def expect_query(index, pk, limit, start_key=None, **values):
+    params = {
+        "TableName": "test-items",
+        "IndexName": index,
+        "KeyConditionExpression": ANY,
+        "ExpressionAttributeNames": ANY,
+        "ExpressionAttributeValues": {":pk": pk, **values},
+        "ScanIndexForward": False,
+        "Limit": limit,
+    }
+    if start_key:
+        params["ExclusiveStartKey"] = start_key
+    return params
+
+
+RANGE = {"created_from": "2024-01-01", "created_to": "2024-03-31"}
+RANGE_VALUES = {":created_from": "2024-01-01", ":created_to": "2024-03-31"}
+
+
+def test_newest_walks_months_backwards(table_stub):
+    # 3月が空なら2月、2月で足りなければ1月を続けて読む
+    table_stub.add_response(
+        "query", {"Items": []}, expect_query("CreatedAtIndex", "2024-03", 3, **RANGE_VALUES)
+    )
+    table_stub.add_response(
+        "query",
+        {"Items": [stored("b", "2024-02-10T00:00:00")]},
+        expect_query("CreatedAtIndex", "2024-02", 3, **RANGE_VALUES),
+    )
+    table_stub.add_response(
+        "query",
+        {"Items": [stored("a", "2024-01-05T00:00:00")]},
+        expect_query("CreatedAtIndex", "2024-01", 2, **RANGE_VALUES),
+    )
+
+    response = read_app.lambda_handler(list_event(order="newest", limit="3", **RANGE), None)
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert [item["id"] for item in body["items"]] == ["b", "a"]
+    # created_from の月で終わる
+    assert body["has_more"] is False
+    assert "cursor" not in body
+
+
+def test_newest_cursor_resumes_in_same_month(table_stub):
+    resume = {"id": {"S": "b"}, "created_month": {"S": "2024-03"}, "created_at": {"S": "x"}}
+    table_stub.add_response(
+        "query",
+        {"Items": [stored("c"), stored("b")], "LastEvaluatedKey": resume},
+        expect_query("CreatedAtIndex", "2024-03", 2, **RANGE_VALUES),
+    )
+    first = read_app.lambda_handler(list_event(order="newest", limit="2", **RANGE), None)
+    body = json.loads(first["body"])
+    assert body["has_more"] is True
+    state = cursor.decode_cursor(body["cursor"], "query::2024-01-01:2024-03-31")
+    assert state == {
+        "b": "2024-03",
+        "f": "2024-01",
+        "k": {"id": "b", "created_month": "2024-03", "created_at": "x"},
+    }
+
+    table_stub.add_response(
+        "query",
+        {"Items": [stored("a")]},
+        expect_query(
+            "CreatedAtIndex", "2024-03", 2, start_key=state["k"], **RANGE_VALUES
+        ),
+    )
+    table_stub.add_response(
+        "query", {"Items": []}, expect_query("CreatedAtIndex", "2024-02", 1, **RANGE_VALUES)
+    )
+    table_stub.add_response(
+        "query", {"Items": []}, expect_query("CreatedAtIndex", "2024-01", 1, **RANGE_VALUES)
+    )
+    second = read_app.lambda_handler(
+        list_event(order="newest", limit="2", cursor=body["cursor"], **RANGE), None
+    )
+    body = json.loads(second["body"])
+    assert [item["id"] for item in body["items"]] == ["a"]
+    assert body["has_more"] is False
+
+
+def test_newest_full_page_at_month_end_continues_next_month(table_stub):
+    # ページが月の終わりで埋まった場合、カーソルは前の月の先頭を指す
+    table_stub.add_response(
+        "query",
+        {"Items": [stored("b"), stored("a")]},
+        expect_query("CreatedAtIndex", "2024-03", 2, **RANGE_VALUES),
+    )
+    response = read_app.lambda_handler(list_event(order="newest", limit="2", **RANGE), None)
+    body = json.loads(response["body"])
+    assert body["has_more"] is True
+    state = cursor.decode_cursor(body["cursor"], "query::2024-01-01:2024-03-31")
+    assert state == {"b": "2024-02", "f": "2024-01", "k": None}
+
+
+def test_name_query_pages(table_stub):
+    resume = {"id": {"S": "b"}, "name": {"S": "Widget"}, "created_at": {"S": "x"}}
+    table_stub.add_response(
+        "query",
+        {"Items": [stored("b")], "LastEvaluatedKey": resume},
+        expect_query("NameIndex", "Widget", 1),
+    )
+    first = read_app.lambda_handler(list_event(name="Widget", limit="1"), None)
+    token = json.loads(first["body"])["cursor"]
+
+    table_stub.add_response(
+        "query",
+        {"Items": [stored("a")]},
+        expect_query(
+            "NameIndex",
+            "Widget",
+            1,
+            start_key={"id": "b", "name": "Widget", "created_at": "x"},
+        ),
+    )
+    second = read_app.lambda_handler(list_event(name="Widget", limit="1", cursor=token), None)
+    body = json.loads(second["body"])
+    assert [item["id"] for item in body["items"]] == ["a"]
+    assert body["has_more"] is False
+
+
+def test_cursor_bound_to_query(table_stub):
+    token = cursor.encode_cursor({"b": None, "f": None, "k": None}, "query:Widget::")
+    response = read_app.lambda_handler(
+        list_event(name="Gadget", cursor=token), None
+    )
+    assert response["statusCode"] == 400
+
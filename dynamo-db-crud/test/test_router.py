@@ -0,0 +1,80 @@
+"""
+単一関数モード（FunctionMode=single）のルーターでの振り分けと 404 / 405
+"""
+import json
+import os
+
+import pytest
+
+import router
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "template.yaml")
+
+
+def event(method, resource, **extra):
+    return {"httpMethod": method, "resource": resource, "headers": {}, **extra}
+
+
+def test_dispatches_to_route_handler(table_stub):
+    table_stub.add_response(
+        "get_item", {"Item": {"id": {"S": "a"}, "name": {"S": "Item"}}}
+    )
+    response = router.lambda_handler(
+        event(
+            "GET",
+            "/items/{id}",
+            pathParameters={"id": "a"},
+            queryStringParameters={"consistent": "true"},
+        ),
+        None,
+    )
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"id": "a", "name": "Item"}
+
+
+def test_handlers_are_imported_once(monkeypatch):
+    monkeypatch.setattr(router, "_handlers", {})
+    handler = router.get_handler("read.app")
+    assert router.get_handler("read.app") is handler
+    assert list(router._handlers) == ["read.app"]
+
+
+def test_unknown_method_returns_405_with_allow():
+    response = router.lambda_handler(event("PATCH", "/items/{id}"), None)
+    assert response["statusCode"] == 405
+    assert response["headers"]["Allow"] == "DELETE, GET, PUT"
+
+
+def test_unknown_resource_returns_404():
+    response = router.lambda_handler(event("GET", "/other"), None)
+    assert response["statusCode"] == 404
+
+
+def test_routes_match_template():
+    yaml = pytest.importorskip("yaml")
+
+    class TemplateLoader(yaml.SafeLoader):
+        pass
+
+    # !Ref などの組み込み関数は値を問わない
+    TemplateLoader.add_multi_constructor("!", lambda loader, suffix, node: None)
+    with open(TEMPLATE) as f:
+        resources = yaml.load(f, Loader=TemplateLoader)["Resources"]
+
+    split_routes = {}
+    for resource in resources.values():
+        properties = resource.get("Properties") or {}
+        if resource["Type"] != "AWS::Serverless::Function" or not properties.get("Events"):
+            continue
+        routes = {
+            (e["Properties"]["Method"].upper(), e["Properties"]["Path"])
+            for e in properties["Events"].values()
+            if e["Type"] == "Api"
+        }
+        if properties["Handler"] == "router.lambda_handler":
+            assert routes == set(router.ROUTES)
+        else:
+            module = properties["CodeUri"].strip("/").split("/")[-1] + ".app"
+            split_routes.update(dict.fromkeys(routes, module))
+
+    assert split_routes == router.ROUTES
@@ -0,0 +1,92 @@
+"""
+リクエストボディのスキーマ検証（作成・部分更新）
+"""
+from decimal import Decimal
+
+import pytest
+
+from schema import MAX_ITEM_ATTRIBUTES, MAX_NESTING_DEPTH, get_item_schema, placeholders
+
+schema = get_item_schema()
+
+
+def nested(depth):
+    value = "leaf"
+    for _ in range(depth):
+        value = {"child": value}
+    return value
+
+
+def test_accepts_valid_body():
+    body = {
+        "name": "Item",
+        "description": "説明",
+        "price": Decimal("9.99"),
+        "quantity": 3,
+        "tags": ["a", "b"],
+        "attributes": {"color": "red"},
+        "in_stock": True,
+        "discontinued_at": None,
+        "nested": nested(MAX_NESTING_DEPTH - 1),
+    }
+    assert schema.validate(body) == (body, None)
+
+
+@pytest.mark.parametrize("name", ["x" * 2048, "あ" * 682, "😀" * 512])
+def test_accepts_name_up_to_key_limit(name):
+    assert schema.validate({"name": name}) == ({"name": name}, None)
+
+
+def test_drops_read_only_fields():
+    fields, error = schema.validate(
+        {"name": "Item", "id": "x", "version": 9, "created_at": "t", "updated_at": "t"}
+    )
+    assert error is None
+    assert fields == {"name": "Item"}
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        ([], "Request body must be a JSON object"),
+        ({}, "Field 'name' is required"),
+        ({"name": ""}, "Field 'name' must not be empty"),
+        ({"name": 1}, "Field 'name' must be a string"),
+        ({"name": "x" * 2049}, "Field 'name' cannot exceed 2048 bytes"),
+        # 683文字でも3バイト文字なら2049バイト
+        ({"name": "あ" * 683}, "Field 'name' cannot exceed 2048 bytes"),
+        ({"name": "Item", "description": 5}, "Field 'description' must be a string"),
+        ({"name": "Item", "bad name": 1}, "Invalid attribute name: 'bad name'"),
+        ({"name": "Item", "1st": 1}, "Invalid attribute name: '1st'"),
+        ({"name": "Item", "deep": nested(MAX_NESTING_DEPTH + 1)}, "Field 'deep' is nested too deeply"),
+    ],
+)
+def test_rejects_invalid_body(body, message):
+    assert schema.validate(body) == (None, message)
+
+
+def test_rejects_too_many_attributes():
+    body = {f"attr_{i}": i for i in range(MAX_ITEM_ATTRIBUTES)}
+    body["name"] = "Item"
+    fields, error = schema.validate(body)
+    assert fields is None
+    assert error == f"Items cannot have more than {MAX_ITEM_ATTRIBUTES} attributes"
+
+
+def test_partial_body_skips_required_fields():
+    assert schema.validate({"price": 3}, partial=True) == ({"price": 3}, None)
+    assert schema.validate({"price": 3}) == (None, "Field 'name' is required")
+
+
+def test_partial_body_still_checks_values():
+    assert schema.validate({"name": ""}, partial=True) == (
+        None,
+        "Field 'name' must not be empty",
+    )
+    assert schema.validate({"bad-name!": 1}, partial=True)[0] is None
+
+
+def test_placeholders():
+    assert placeholders(0) == ("#a0", ":v0", "#a0 = :v0")
+    index = MAX_ITEM_ATTRIBUTES + 5
+    assert placeholders(index) == (f"#a{index}", f":v{index}", f"#a{index} = :v{index}")
@@ -0,0 +1,141 @@
+"""
+トークンバケットでの流量制限と、429/503 に付ける Retry-After
+"""
+import random
+
+import pytest
+from botocore.exceptions import ClientError
+
+import throttle
+import utils
+from throttle import RateLimiter, ThrottleTracker, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda a, b: a)
+
+
+def test_bucket_allows_burst_then_waits(clock):
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    # 1トークンは 1/2 秒で補充される
+    assert bucket.acquire() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.acquire() == 0
+
+
+def test_bucket_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=10, burst=2, clock=clock)
+    clock.now = 60
+    assert [bucket.acquire() for _ in range(2)] == [0, 0]
+    assert bucket.acquire() > 0
+
+
+def test_key_over_limit_does_not_use_shared_bucket(clock):
+    limiter = RateLimiter(1, 2, key_rate=1, key_burst=1, clock=clock)
+    assert limiter.acquire("noisy") == 0
+    assert limiter.acquire("noisy") > 0
+    assert limiter.acquire("noisy") > 0
+    # 共有バケットには1トークン残っている
+    assert limiter.acquire("quiet") == 0
+    assert limiter.acquire("other") > 0
+
+
+def test_key_buckets_are_bounded(monkeypatch, clock):
+    monkeypatch.setattr(throttle, "MAX_API_KEY_BUCKETS", 2)
+    limiter = RateLimiter(0, 0, key_rate=1, key_burst=1, clock=clock)
+    for key in ("a", "b", "a", "c"):
+        limiter.acquire(key)
+    # 最も前に使われた b が追い出される
+    assert list(limiter.key_buckets) == ["a", "c"]
+
+
+def test_disabled_limiter_admits_everything(clock):
+    limiter = RateLimiter(0, 0, key_rate=0, key_burst=0, clock=clock)
+    assert all(limiter.acquire("key") == 0 for _ in range(1000))
+
+
+def test_tracker_forgets_old_throttles(clock):
+    tracker = ThrottleTracker(window=60, clock=clock)
+    tracker.record(3)
+    clock.now = 30
+    tracker.record()
+    assert tracker.recent() == 4
+    clock.now = 60
+    assert tracker.recent() == 1
+
+
+def test_retry_after_grows_with_throttles(monkeypatch, clock, no_jitter):
+    monkeypatch.setattr(throttle, "RETRY_AFTER_MAX_SECONDS", 5)
+    tracker = ThrottleTracker(window=60, clock=clock)
+    assert tracker.retry_after() == 1
+    tracker.record(7)
+    # 1 + log2(1 + 7) = 4
+    assert tracker.retry_after() == 4
+    tracker.record(100)
+    assert tracker.retry_after() == 5
+
+
+def test_retry_after_covers_bucket_wait(clock, no_jitter):
+    tracker = ThrottleTracker(window=60, clock=clock)
+    assert tracker.retry_after(wait=2.2) == 3
+
+
+def test_retry_after_jitter_stays_within_cap(clock, monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda a, b: b)
+    tracker = ThrottleTracker(window=60, clock=clock)
+    assert tracker.retry_after() == 2
+    assert tracker.retry_after(wait=1000) == throttle.RETRY_AFTER_MAX_SECONDS
+
+
+@pytest.fixture
+def limiter(monkeypatch, clock):
+    fresh = RateLimiter(1, 1, key_rate=0, key_burst=0, clock=clock)
+    monkeypatch.setattr(utils, "get_rate_limiter", lambda: fresh)
+    tracker = ThrottleTracker(clock=clock)
+    monkeypatch.setattr(utils, "get_throttle_tracker", lambda: tracker)
+    return fresh
+
+
+def test_check_rate_limit_sheds_with_retry_after(limiter, no_jitter):
+    assert utils.check_rate_limit({"headers": {}}) is None
+    response = utils.check_rate_limit({"headers": {}})
+    assert response["statusCode"] == 429
+    # 1件目の制限: 1 + log2(1 + 1) = 2
+    assert response["headers"]["Retry-After"] == "2"
+
+
+@pytest.mark.parametrize(
+    "code, status",
+    [
+        ("ProvisionedThroughputExceededException", 429),
+        ("ThrottlingException", 429),
+        ("ServiceUnavailable", 503),
+    ],
+)
+def test_retryable_errors_send_retry_after(limiter, no_jitter, code, status):
+    error = ClientError({"Error": {"Code": code, "Message": ""}}, "GetItem")
+    response = utils.handle_dynamodb_error(error)
+    assert response["statusCode"] == status
+    assert response["headers"]["Retry-After"] == "2"
+
+
+def test_other_errors_have_no_retry_after():
+    error = ClientError({"Error": {"Code": "ValidationException", "Message": ""}}, "GetItem")
+    response = utils.handle_dynamodb_error(error)
+    assert response["statusCode"] == 500
+    assert "Retry-After" not in response["headers"]
@@ -1,13 +1,22 @@
 import json
-import boto3
 import os
+import sys
+
+# 共通レイヤーのクライアントファクトリを使用
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "layers", "common-layer", "python"
+    ),
+)
+
+from clients import create_dynamodb_resource  # noqa: E402
 
 # DynamoDB Localの設定
 DYNAMODB_LOCAL_ENDPOINT = "http://localhost:8000"
 
 # DynamoDB Localリソースを初期化
-dynamodb = boto3.resource(
-    "dynamodb",
+dynamodb = create_dynamodb_resource(
     endpoint_url=DYNAMODB_LOCAL_ENDPOINT,
     region_name="us-east-1",
     aws_access_key_id="dummy",
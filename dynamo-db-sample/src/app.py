@@ -1,7 +1,24 @@
 import json
+import os
+
 import boto3
+from botocore.config import Config
+
+# 接続設定は dynamo-db-crud の共通レイヤー (clients.py) と同じ環境変数で調整する
+config = Config(
+    max_pool_connections=int(os.environ.get("DYNAMODB_MAX_POOL_CONNECTIONS", "16")),
+    retries={
+        "mode": os.environ.get("DYNAMODB_RETRY_MODE", "standard"),
+        "total_max_attempts": int(os.environ.get("DYNAMODB_MAX_ATTEMPTS", "5")),
+    },
+    connect_timeout=float(os.environ.get("DYNAMODB_CONNECT_TIMEOUT", "2")),
+    read_timeout=float(os.environ.get("DYNAMODB_READ_TIMEOUT", "5")),
+    tcp_keepalive=os.environ.get("DYNAMODB_TCP_KEEPALIVE", "true").lower() == "true",
+)
 
-client = boto3.client("dynamodb", endpoint_url="http://dynamodb:8000")
+client = boto3.client(
+    "dynamodb", endpoint_url="http://dynamodb:8000", config=config
+)
 
 
 def lambda_handler(event, context):